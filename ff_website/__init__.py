@@ -7,14 +7,16 @@ from flask_wtf.csrf import CSRFProtect
 
 from ff_website import credentials
 
-from . import db
+from . import benchmarks, db, export_static, warm_cache
 
 app = Flask(__name__, instance_relative_config=True)
 app.config.from_mapping(
     SECRET_KEY=credentials.xss_key,
     DATABASE=os.path.join(app.instance_path, "logs.sqlite"),
+    ARCHIVE_DATABASE=os.path.join(app.instance_path, "archive.sqlite"),
     SEND_FILE_MAX_AGE_DEFAULT=0,
-    PROPOGATE_EXCEPTIONS=True
+    PROPOGATE_EXCEPTIONS=True,
+    WARM_CACHE_ON_START=os.environ.get("WARM_CACHE_ON_START") == "1"
 )
 
 try:
@@ -23,6 +25,8 @@ except OSError:
     pass
 
 db.init_app(app)
+benchmarks.init_app(app)
+export_static.init_app(app)
 csrf = CSRFProtect(app)
 
 bcrypt = Bcrypt(app)
@@ -31,4 +35,7 @@ login_manager.init_app(app)
 login_manager.login_view = 'login'
 
 from ff_website import index
-from ff_website import apis
\ No newline at end of file
+from ff_website import apis
+
+# After the routes are registered, so the background warm can request them
+warm_cache.init_app(app)
@@ -1,6 +1,8 @@
-from ff_website.db import get_db, init_db, close_db
+from flask import has_app_context
+
 from ff_website import app
 from ff_website.constants import *
+from ff_website.members import get_member_directory
 
 """
 These are helper functions that are only used in a controlled context, such as uploading 
@@ -12,17 +14,8 @@ def get_member_id(first_name, last_name):
     """
     Returns the member_id of a league member given their first and last name
     """
-    with app.app_context():
-        init_db()
-        db = get_db()
-        member_id = db.execute(
-            f"""
-            SELECT {MEMBER_ID} FROM member
-            WHERE {FIRST_NAME}=? AND {LAST_NAME}=?
-            """,
-            (first_name, last_name)
-        ).fetchall()
+    if has_app_context():
+        return get_member_directory().get_id(first_name, last_name)
 
-        close_db()
-
-        return member_id[0][MEMBER_ID]
+    with app.app_context():
+        return get_member_directory().get_id(first_name, last_name)
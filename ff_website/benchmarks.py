@@ -0,0 +1,735 @@
+import random
+import sqlite3
+import time
+import tracemalloc
+
+import click
+import pandas as pd
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ff_website.constants import *
+from ff_website.db import get_db
+from ff_website.fragments import get_fragment_cache
+from ff_website.helper_functions import (Record, get_head_to_head, get_league_members,
+                                         get_overall_record, get_playoffs, get_roto,
+                                         get_standings, get_top_roto_scorers, get_top_three,
+                                         get_all_week_results, hall_of_fame_helper, TableBuilder)
+from ff_website.queries import LEAGUE_GAMES
+from ff_website.season_frame import SeasonFrame
+from ff_website.warm_cache import warm_pages
+
+"""
+`flask benchmark ...` commands. Each one times the current implementation of an
+analytics helper against the row-at-a-time version it replaced, on the real league
+history and on a synthetic league, and checks that both return the same result.
+"""
+
+
+SYNTHETIC_TEAMS = 32
+SYNTHETIC_SEASONS = 100
+SYNTHETIC_WEEKS = 14
+SYNTHETIC_PLAYOFF_TEAMS = 8
+
+
+def synthetic_league(num_teams=SYNTHETIC_TEAMS, num_seasons=SYNTHETIC_SEASONS,
+                     num_weeks=SYNTHETIC_WEEKS, seed=0):
+    """
+    Return LEAGUE_GAMES style rows for a made up league: a random pairing every
+    regular season week, then a single elimination bracket
+    """
+
+    rng = random.Random(seed)
+    names = [(f"Owner{i:02d}", f"Team{i:02d}") for i in range(num_teams)]
+    row_type = LEAGUE_GAMES.row_type
+    rows = []
+    game_id = 0
+
+    def add_game(season, week, team_A, team_B, playoffs):
+        nonlocal game_id
+        game_id += 1
+        team_A_score, team_B_score = round(rng.uniform(60, 180), 2), round(rng.uniform(60, 180), 2)
+        rows.append(row_type((
+            game_id, team_A + 1, team_B + 1, team_A_score, team_B_score,
+            season, week, 1, playoffs,
+            names[team_A][0], names[team_A][1], names[team_B][0], names[team_B][1]
+        )))
+        return team_A if team_A_score > team_B_score else team_B
+
+    for season in range(1, num_seasons + 1):
+        teams = list(range(num_teams))
+        for week in range(1, num_weeks + 1):
+            rng.shuffle(teams)
+            for i in range(0, num_teams - 1, 2):
+                add_game(season, week, teams[i], teams[i + 1], 0)
+
+        bracket = rng.sample(range(num_teams), min(SYNTHETIC_PLAYOFF_TEAMS, num_teams))
+        week = num_weeks
+        while len(bracket) > 1:
+            week += 1
+            bracket = [add_game(season, week, bracket[i], bracket[i + 1], 1)
+                       for i in range(0, len(bracket) - 1, 2)]
+    return rows
+
+
+def split_seasons(query):
+    seasons = {}
+    for row in query:
+        seasons.setdefault(row[SEASON], []).append(row)
+    return list(seasons.values())
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label, before, after):
+    click.echo(f"{label:<42} {before * 1000:10.2f}ms {after * 1000:10.2f}ms "
+               f"{before / after if after else float('inf'):8.1f}x")
+
+
+def reference_standings(query, include_playoffs=False):
+    """
+    get_standings before SeasonFrame: one scalar DataFrame write per team per game
+    """
+
+    names = set()
+    for row in query:
+        names.add(f"{row['team_A_first_name']} {row['team_A_last_name']}")
+        names.add(f"{row['team_B_first_name']} {row['team_B_last_name']}")
+    df = pd.DataFrame(columns=["Wins", "Losses", "PF", "PA"], index=sorted(names)).fillna(0.0)
+
+    if not include_playoffs:
+        query = [x for x in query if x[PLAYOFFS] == 0]
+
+    for row in query:
+        team_A_score = row["team_A_score"]
+        team_B_score = row["team_B_score"]
+        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
+        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
+        winning_team = team_A_name if team_A_score > team_B_score else team_B_name
+
+        df.at[team_A_name, "PF"] += team_A_score
+        df.at[team_A_name, "PA"] += team_B_score
+        df.at[team_B_name, "PF"] += team_B_score
+        df.at[team_B_name, "PA"] += team_A_score
+        if winning_team == team_A_name:
+            df.at[team_A_name, "Wins"] += 1
+            df.at[team_B_name, "Losses"] += 1
+        else:
+            df.at[team_B_name, "Wins"] += 1
+            df.at[team_A_name, "Losses"] += 1
+
+    df = df.sort_values(["Wins", "PF"], ascending=False)
+    df["Wins"] = df["Wins"].astype("int64")
+    df["Losses"] = df["Losses"].astype("int64")
+
+    ranks = {}
+    for i, index in enumerate(df.index, 1):
+        ranks[index] = i
+    return df, ranks
+
+
+def reference_roto(query):
+    """
+    get_roto before the score matrix: a sort per week, then a scalar write per team
+    """
+
+    names = sorted({f"{row['team_A_first_name']} {row['team_A_last_name']}" for row in query} |
+                   {f"{row['team_B_first_name']} {row['team_B_last_name']}" for row in query})
+    points_df = pd.DataFrame(index=names)
+    for row in query:
+        if row[PLAYOFFS] == 0:
+            key = f"Week {row[WEEK]}"
+            if key not in points_df.columns:
+                points_df[key] = 0.0
+            points_df.at[f"{row['team_A_first_name']} {row['team_A_last_name']}", key] = row[TEAM_A_SCORE]
+            points_df.at[f"{row['team_B_first_name']} {row['team_B_last_name']}", key] = row[TEAM_B_SCORE]
+
+    roto_df = pd.DataFrame(index=names, columns=points_df.columns.to_list())
+    roto_df["PF"] = 0.0
+    roto_df["Total"] = 0
+    for key in points_df.columns.to_list():
+        points_temp = points_df.sort_values([key], ascending=True)
+        for i in range(len(names)):
+            member = points_temp.index.to_list()[i]
+            roto_df[key][member] = i
+
+    roto_df["Total"] = roto_df.iloc[:, :].sum(axis=1)
+    roto_df["PF"] = reference_standings(query)[0]["PF"]
+    roto_df = roto_df.sort_values(["Total", "PF"], ascending=False)
+    roto_df["Total"] = roto_df["Total"].astype("int64")
+    return roto_df
+
+
+def reference_head_to_head(query):
+    """
+    get_head_to_head before the all-play matrix: members x members x weeks of
+    scalar lookups
+    """
+
+    names = sorted({f"{row['team_A_first_name']} {row['team_A_last_name']}" for row in query} |
+                   {f"{row['team_B_first_name']} {row['team_B_last_name']}" for row in query})
+    points = pd.DataFrame(index=names)
+    for row in query:
+        if row[PLAYOFFS] == 0:
+            key = f"Week {row[WEEK]}"
+            if key not in points.columns:
+                points[key] = 0.0
+            points.at[f"{row['team_A_first_name']} {row['team_A_last_name']}", key] = row[TEAM_A_SCORE]
+            points.at[f"{row['team_B_first_name']} {row['team_B_last_name']}", key] = row[TEAM_B_SCORE]
+
+    head2head = pd.DataFrame(columns=names, index=names)
+    for a in names:
+        for b in names:
+            if a == b:
+                head2head[b][a] = "--"
+            else:
+                wins = 0
+                losses = 0
+                for col in points.columns:
+                    if points[col][a] > points[col][b]:
+                        wins += 1
+                    else:
+                        losses += 1
+                head2head[b][a] = str(wins) + "-" + str(losses)
+    head2head.fillna("0-0", inplace=True)
+    return head2head
+
+
+def reference_hall_of_fame(query):
+    """
+    hall_of_fame_helper before LeagueRecords: a get_overall_record scan per member,
+    then get_standings twice, get_roto and get_playoffs for every season
+    """
+
+    league_members = get_league_members(query)
+    frame = SeasonFrame(query)
+    most_wins_overall, most_playoff_wins = [], []
+    wins_dict = {}
+    for member in league_members:
+        member_id = int(frame.member_ids[frame.codes[member]])
+        _, _, wins, _, po_wins, _ = get_overall_record(query, member_id)
+        most_wins_overall.append(Record(member, wins))
+        most_playoff_wins.append(Record(member, po_wins))
+        wins_dict[member] = wins
+
+    points_dict = {member: 0 for member in league_members}
+    streak_dict = {member: 0 for member in league_members}
+    appearance_dict = {member: 0 for member in league_members}
+    longest_win_streak = []
+    for row in query:
+        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
+        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
+        points_dict[team_A_name] += row[TEAM_A_SCORE]
+        points_dict[team_B_name] += row[TEAM_B_SCORE]
+        appearance_dict[team_A_name] += 1
+        appearance_dict[team_B_name] += 1
+
+        if row[TEAM_A_SCORE] > row[TEAM_B_SCORE]:
+            winning_team, losing_team = team_A_name, team_B_name
+        else:
+            winning_team, losing_team = team_B_name, team_A_name
+        longest_win_streak.append(Record(losing_team, streak_dict[losing_team]))
+        streak_dict[winning_team] += 1
+        streak_dict[losing_team] = 0
+
+    most_points_all_time = [Record(name, round(points, 2)) for name, points in points_dict.items()]
+    longest_win_streak += [Record(name, streak) for name, streak in streak_dict.items()]
+    most_appearances_overall = [Record(name, count) for name, count in appearance_dict.items()]
+    highest_win_percentage_overall = [
+        Record(name, f"{round(100 * wins_dict[name] / appearance_dict[name], 2)}%")
+        for name in league_members]
+
+    most_points_single_season_excl_playoffs = []
+    most_wins_single_season_excl_playoffs = []
+    most_wins_single_season_incl_playoffs = []
+    ppg_helper, all_time_roto_helper, roto_top_scorer_helper = {}, {}, {}
+    champions = {2015: "Garrett Folbe", 2016: "Jonah Lopas"}
+
+    for value in split_seasons(query):
+        key = value[0][SEASON]
+        standings_playoffs, _ = get_standings(value, include_playoffs=True)
+        standings_reg, _ = get_standings(value)
+        roto = get_roto(value)
+
+        playoffs = get_playoffs(value)
+        if playoffs:
+            champ_week = sorted(playoffs)[-1]
+            if len(playoffs[champ_week]) == 1:
+                champions[key] = playoffs[champ_week][0]["winning_team"]
+
+        for index, row in standings_playoffs.iterrows():
+            most_wins_single_season_incl_playoffs.append(Record(f"{index} ({key})", int(row["Wins"])))
+            if index not in ppg_helper:
+                ppg_helper[index] = {"Total": row["PF"], "Games": row["Wins"] + row["Losses"]}
+            else:
+                ppg_helper[index]["Total"] += row["PF"]
+                ppg_helper[index]["Games"] += row["Wins"] + row["Losses"]
+
+        for index, row in standings_reg.iterrows():
+            most_wins_single_season_excl_playoffs.append(Record(f"{index} ({key})", int(row["Wins"])))
+            most_points_single_season_excl_playoffs.append(
+                Record(f"{index} ({key})", round(row["PF"], 2)))
+
+        for index, row in roto.iterrows():
+            all_time_roto_helper[index] = all_time_roto_helper.get(index, 0) + row["Total"]
+
+        roto_top_scorer_helper = get_top_roto_scorers(roto_top_scorer_helper, roto)
+
+    most_roto_points_all_time = [Record(f"{key}", int(value)) for key, value in all_time_roto_helper.items()]
+    most_ppg_all_time = [Record(f"{key}", round(value["Total"] / value["Games"], 2))
+                         for key, value in ppg_helper.items()]
+    most_top_scoring_weeks = [Record(f"{key}", int(value)) for key, value in roto_top_scorer_helper.items()]
+
+    return get_top_three(most_points_all_time), \
+        get_top_three(most_points_single_season_excl_playoffs), \
+        get_top_three(most_ppg_all_time), \
+        get_top_three(most_appearances_overall), \
+        get_top_three(most_wins_overall), \
+        get_top_three(highest_win_percentage_overall), \
+        get_top_three(most_wins_single_season_excl_playoffs), \
+        get_top_three(most_wins_single_season_incl_playoffs), \
+        get_top_three(most_playoff_wins), \
+        get_top_three(longest_win_streak), \
+        get_top_three(most_roto_points_all_time), \
+        get_top_three(most_top_scoring_weeks), \
+        champions
+
+
+def reference_week_results(query):
+    """
+    get_all_week_results before cumulative standings: fresh standings from every
+    game up to each week
+    """
+
+    split_query = {}
+    for row in query:
+        if row[PLAYOFFS] == 0:
+            split_query.setdefault(row[WEEK], []).append(row)
+
+    all_weeks = {}
+    for week_number, results in split_query.items():
+        standings, _ = reference_standings([row for row in query if row[WEEK] <= week_number])
+        df = pd.DataFrame(columns=["Winning Team", "Losing Team", "Score"])
+        for row in results:
+            teams = []
+            for team in ("A", "B"):
+                name = f"{row[f'team_{team}_first_name']} {row[f'team_{team}_last_name']}"
+                record = f"({standings.at[name, 'Wins']}-{standings.at[name, 'Losses']})"
+                teams.append((f"{name} {record}", float(row[f"team_{team}_score"])))
+            (team_A, team_A_score), (team_B, team_B_score) = teams
+            if team_A_score > team_B_score:
+                df.loc[len(df.index)] = [team_A, team_B, f"{team_A_score}-{team_B_score}"]
+            else:
+                df.loc[len(df.index)] = [team_B, team_A, f"{team_B_score}-{team_A_score}"]
+        df.index += 1
+        all_weeks[week_number] = df.to_html(classes="table-sm table-striped")
+
+    return None if all_weeks == {} else all_weeks
+
+
+def reference_table(columns, rows, start=0):
+    """
+    How tables were built before TableBuilder: one df.loc append per row
+    """
+
+    df = pd.DataFrame(columns=columns)
+    for row in rows:
+        df.loc[len(df.index)] = row
+    df.index += start
+    return df
+
+
+def build_table(columns, rows, start=0):
+    table = TableBuilder(columns)
+    for row in rows:
+        table.append(row)
+    return table.frame(start)
+
+
+def schedule_rows(query):
+    """
+    The rows get_individual_schedule shows for the first team in the query
+    """
+
+    name = f"{query[0]['team_A_first_name']} {query[0]['team_A_last_name']}"
+    rows = []
+    for row in query:
+        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
+        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
+        if name not in (team_A_name, team_B_name):
+            continue
+        won = (row[TEAM_A_SCORE] > row[TEAM_B_SCORE]) == (team_A_name == name)
+        rows.append(["Playoffs" if row[PLAYOFFS] else "Regular Season",
+                     team_B_name if team_A_name == name else team_A_name,
+                     "Win" if won else "Loss",
+                     f"{row[TEAM_A_SCORE]}-{row[TEAM_B_SCORE]}",
+                     f"{len(rows)}-0"])
+    return rows
+
+
+def admin_rows(query):
+    """
+    The rows list_games shows on the admin games page
+    """
+
+    return [[row[GAME_ID], row[SEASON], row[WEEK], row[PLAYOFFS],
+             row[TEAM_A_ID], f"{row['team_A_first_name']} {row['team_A_last_name']}", row[TEAM_A_SCORE],
+             row[TEAM_B_ID], f"{row['team_B_first_name']} {row['team_B_last_name']}", row[TEAM_B_SCORE],
+             "Placeholder", "Placeholder"] for row in query]
+
+
+SCHEDULE_COLUMNS = ["Format", "Opponent", "Result", "Score", "Record"]
+ADMIN_COLUMNS = ["id", "Season", "Week", "Playoffs", "Team_A_id", "Team_A_name", "Team_A_score",
+                 "Team_B_id", "Team_B_name", "Team_B_score", "Edit", "Delete"]
+
+
+def compare_tables(label, columns, rows, repeat, start=0):
+    expected = reference_table(columns, rows, start)
+    actual = build_table(columns, rows, start)
+    if actual.to_html() != expected.to_html():
+        raise click.ClickException(f"{label}: tables differ")
+
+    before = best_time(lambda: reference_table(columns, rows, start), repeat)
+    after = best_time(lambda: build_table(columns, rows, start), repeat)
+    report(f"{label} ({len(rows)} rows)", before, after)
+
+
+def synthetic_database(rows):
+    """
+    An in-memory database holding the synthetic games, with the all_games view the
+    game queries read
+    """
+
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE member (member_id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT);
+        CREATE TABLE game (game_id INTEGER PRIMARY KEY, team_A_id INTEGER, team_B_id INTEGER,
+            team_A_score FLOAT, team_B_score FLOAT, season INTEGER, week INTEGER,
+            matchup_length INTEGER, playoffs INTEGER);
+        CREATE VIEW all_games AS SELECT * FROM game;
+        """
+    )
+    members = {(row.team_A_id, row.team_A_first_name, row.team_A_last_name) for row in rows}
+    members |= {(row.team_B_id, row.team_B_first_name, row.team_B_last_name) for row in rows}
+    conn.executemany("INSERT INTO member VALUES(?, ?, ?)", sorted(members))
+    conn.executemany("INSERT INTO game VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                     [tuple(row)[:9] for row in rows])
+    return conn
+
+
+def fetch_sqlite_rows(db):
+    cursor = db.cursor()
+    cursor.row_factory = sqlite3.Row
+    return cursor.execute(LEAGUE_GAMES.sql).fetchall()
+
+
+def read_sqlite_rows(rows):
+    total = 0.0
+    for row in rows:
+        if row[PLAYOFFS] == 0:
+            total += float(row[TEAM_A_SCORE]) + float(row[TEAM_B_SCORE])
+    return total
+
+
+def read_games(rows):
+    total = 0.0
+    for row in rows:
+        if row.playoffs == 0:
+            total += row.team_A_score + row.team_B_score
+    return total
+
+
+def retained_memory(fn):
+    tracemalloc.start()
+    try:
+        rows = fn()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return rows, size
+
+
+def compare_rows(label, db, repeat):
+    sqlite_rows, sqlite_size = retained_memory(lambda: fetch_sqlite_rows(db))
+    games, games_size = retained_memory(lambda: LEAGUE_GAMES.fetchall(db))
+    if [tuple(row) for row in sqlite_rows] != [tuple(game) for game in games]:
+        raise click.ClickException(f"{label}: rows differ")
+    if read_sqlite_rows(sqlite_rows) != read_games(games):
+        raise click.ClickException(f"{label}: totals differ")
+
+    click.echo(f"{label + f' ({len(games)} games), memory':<42} "
+               f"{sqlite_size / 1024:10.0f}KB {games_size / 1024:10.0f}KB "
+               f"{sqlite_size / games_size if games_size else float('inf'):8.1f}x")
+    report(f"{label}, load", best_time(lambda: fetch_sqlite_rows(db), repeat),
+           best_time(lambda: LEAGUE_GAMES.fetchall(db), repeat))
+    report(f"{label}, read every score", best_time(lambda: read_sqlite_rows(sqlite_rows), repeat),
+           best_time(lambda: read_games(games), repeat))
+
+
+def compare_fragments(client, page, repeat):
+    cache = get_fragment_cache()
+
+    def cold():
+        cache.clear()
+        return client.get(page).data
+
+    cold_html = cold()
+    warm_html = client.get(page).data
+    if cold_html != warm_html:
+        raise click.ClickException(f"{page}: cached page differs")
+
+    report(page[:42], best_time(cold, repeat), best_time(lambda: client.get(page), repeat))
+
+
+def compare_standings(label, seasons, repeat):
+    for season in seasons:
+        for include_playoffs in (False, True):
+            expected, expected_ranks = reference_standings(season, include_playoffs)
+            actual, actual_ranks = SeasonFrame(season).standings(include_playoffs)
+            pd.testing.assert_frame_equal(actual, expected)
+            if actual_ranks != expected_ranks:
+                raise click.ClickException(f"{label}: ranks differ")
+
+    before = best_time(lambda: [reference_standings(s) for s in seasons], repeat)
+    after = best_time(lambda: [SeasonFrame(s).standings() for s in seasons], repeat)
+    report(f"{label} ({len(seasons)} seasons)", before, after)
+
+    # Every later get_standings call on the same rows reuses the frame
+    frames = [SeasonFrame(s) for s in seasons]
+    cached = best_time(lambda: [f.standings() for f in frames], repeat)
+    report(f"{label}, frame already built", before, cached)
+
+
+def has_tied_week(query):
+    scores = set()
+    for row in query:
+        if row[PLAYOFFS] == 0:
+            for score in (row[TEAM_A_SCORE], row[TEAM_B_SCORE]):
+                if (row[WEEK], score) in scores:
+                    return True
+                scores.add((row[WEEK], score))
+    return False
+
+
+def compare_roto(label, seasons, repeat):
+    # Tied scores used to be ranked in whatever order the sort left them, they
+    # now share the lower rank, so only seasons without ties can match exactly
+    untied = [season for season in seasons if not has_tied_week(season)]
+    for season in untied:
+        # The old frame kept the weekly roto points in object columns
+        pd.testing.assert_frame_equal(get_roto(season), reference_roto(season), check_dtype=False)
+    if len(untied) < len(seasons):
+        click.echo(f"{label}: {len(seasons) - len(untied)} seasons with tied weekly scores not compared")
+
+    before = best_time(lambda: [reference_roto(s) for s in seasons], repeat)
+    after = best_time(lambda: [get_roto(list(s)) for s in seasons], repeat)
+    report(f"{label} ({len(seasons)} seasons)", before, after)
+
+
+def compare_head_to_head(label, seasons, repeat):
+    for season in seasons:
+        pd.testing.assert_frame_equal(get_head_to_head(season), reference_head_to_head(season))
+
+    before = best_time(lambda: [reference_head_to_head(s) for s in seasons], repeat)
+    after = best_time(lambda: [get_head_to_head(list(s)) for s in seasons], repeat)
+    report(f"{label} ({len(seasons)} seasons)", before, after)
+
+    # The old loop keyed weeks by number alone, so it had no all-time version
+    league = [row for season in seasons for row in season]
+    all_time = best_time(lambda: get_head_to_head(list(league)), repeat)
+    click.echo(f"{label + ', all time':<42} {'--':>12} {all_time * 1000:10.2f}ms")
+
+
+def compare_week_results(label, seasons, repeat):
+    for season in seasons:
+        if get_all_week_results(season) != reference_week_results(season):
+            raise click.ClickException(f"{label}: weekly results differ")
+
+        # Every point in time view matches standings rebuilt from the games so far
+        frame = SeasonFrame(season)
+        for week in sorted({row[WEEK] for row in season if row[PLAYOFFS] == 0}):
+            expected, expected_ranks = reference_standings(
+                [row for row in season if row[WEEK] <= week])
+            actual, actual_ranks = frame.standings_as_of(season[0][SEASON], week)
+            pd.testing.assert_frame_equal(actual, expected)
+            if actual_ranks != expected_ranks:
+                raise click.ClickException(f"{label}: ranks after week {week} differ")
+
+    before = best_time(lambda: [reference_week_results(s) for s in seasons], repeat)
+    after = best_time(lambda: [get_all_week_results(list(s)) for s in seasons], repeat)
+    report(f"{label} ({len(seasons)} seasons)", before, after)
+
+
+def compare_hall_of_fame(label, league, repeat):
+    if hall_of_fame_helper(league) != reference_hall_of_fame(league):
+        raise click.ClickException(f"{label}: Hall of Fame records differ")
+
+    before = best_time(lambda: reference_hall_of_fame(league), repeat)
+    after = best_time(lambda: hall_of_fame_helper(league), repeat)
+    report(f"{label} ({len(league)} games)", before, after)
+
+
+@click.group("benchmark", help="Time the analytics helpers against their previous implementations")
+def benchmark_group():
+    pass
+
+
+@benchmark_group.command("standings")
+@click.option("--repeat", default=3, help="Runs of each implementation, the best is reported")
+@click.option("--teams", default=SYNTHETIC_TEAMS, help="Teams in the synthetic league")
+@click.option("--seasons", default=SYNTHETIC_SEASONS, help="Seasons in the synthetic league")
+@with_appcontext
+def benchmark_standings_command(repeat, teams, seasons):
+    click.echo(f"{'':<42} {'before':>12} {'after':>12} {'speedup':>9}")
+
+    league = LEAGUE_GAMES.fetchall(get_db())
+    if league:
+        compare_standings("league history", split_seasons(league), repeat)
+    else:
+        click.echo("No games in the database, skipping the league history")
+
+    synthetic = split_seasons(synthetic_league(teams, seasons))
+    compare_standings(f"synthetic {teams} teams", synthetic, repeat)
+
+
+@benchmark_group.command("roto")
+@click.option("--repeat", default=3, help="Runs of each implementation, the best is reported")
+@click.option("--teams", default=SYNTHETIC_TEAMS, help="Teams in the synthetic league")
+@click.option("--seasons", default=SYNTHETIC_SEASONS, help="Seasons in the synthetic league")
+@with_appcontext
+def benchmark_roto_command(repeat, teams, seasons):
+    click.echo(f"{'':<42} {'before':>12} {'after':>12} {'speedup':>9}")
+
+    league = LEAGUE_GAMES.fetchall(get_db())
+    if league:
+        compare_roto("league history", split_seasons(league), repeat)
+    else:
+        click.echo("No games in the database, skipping the league history")
+
+    synthetic = split_seasons(synthetic_league(teams, seasons))
+    compare_roto(f"synthetic {teams} teams", synthetic, repeat)
+
+
+@benchmark_group.command("head-to-head")
+@click.option("--repeat", default=3, help="Runs of each implementation, the best is reported")
+@click.option("--teams", default=SYNTHETIC_TEAMS, help="Teams in the synthetic league")
+@click.option("--seasons", default=SYNTHETIC_SEASONS, help="Seasons in the synthetic league")
+@with_appcontext
+def benchmark_head_to_head_command(repeat, teams, seasons):
+    click.echo(f"{'':<42} {'before':>12} {'after':>12} {'speedup':>9}")
+
+    league = LEAGUE_GAMES.fetchall(get_db())
+    if league:
+        compare_head_to_head("league history", split_seasons(league), repeat)
+    else:
+        click.echo("No games in the database, skipping the league history")
+
+    synthetic = split_seasons(synthetic_league(teams, seasons))
+    compare_head_to_head(f"synthetic {teams} teams", synthetic, repeat)
+
+
+@benchmark_group.command("hall-of-fame")
+@click.option("--repeat", default=3, help="Runs of each implementation, the best is reported")
+@click.option("--teams", default=SYNTHETIC_TEAMS, help="Teams in the synthetic league")
+@click.option("--seasons", default=20, help="Seasons in the synthetic league")
+@with_appcontext
+def benchmark_hall_of_fame_command(repeat, teams, seasons):
+    click.echo(f"{'':<42} {'before':>12} {'after':>12} {'speedup':>9}")
+
+    league = LEAGUE_GAMES.fetchall(get_db())
+    if league:
+        compare_hall_of_fame("league history", league, repeat)
+    else:
+        click.echo("No games in the database, skipping the league history")
+
+    # The old version scans every game once per member, so keep this one smaller
+    compare_hall_of_fame(f"synthetic {teams} teams", synthetic_league(teams, seasons), repeat)
+
+
+@benchmark_group.command("week-results")
+@click.option("--repeat", default=3, help="Runs of each implementation, the best is reported")
+@click.option("--teams", default=SYNTHETIC_TEAMS, help="Teams in the synthetic league")
+@click.option("--seasons", default=10, help="Seasons in the synthetic league")
+@with_appcontext
+def benchmark_week_results_command(repeat, teams, seasons):
+    click.echo(f"{'':<42} {'before':>12} {'after':>12} {'speedup':>9}")
+
+    league = LEAGUE_GAMES.fetchall(get_db())
+    if league:
+        compare_week_results("league history", split_seasons(league), repeat)
+    else:
+        click.echo("No games in the database, skipping the league history")
+
+    synthetic = split_seasons(synthetic_league(teams, seasons))
+    compare_week_results(f"synthetic {teams} teams", synthetic, repeat)
+
+
+@benchmark_group.command("tables")
+@click.option("--repeat", default=3, help="Runs of each implementation, the best is reported")
+@click.option("--teams", default=SYNTHETIC_TEAMS, help="Teams in the synthetic league")
+@click.option("--seasons", default=SYNTHETIC_SEASONS, help="Seasons in the synthetic league")
+@with_appcontext
+def benchmark_tables_command(repeat, teams, seasons):
+    click.echo(f"{'':<42} {'before':>12} {'after':>12} {'speedup':>9}")
+
+    league = LEAGUE_GAMES.fetchall(get_db())
+    if league:
+        compare_tables("league member schedule", SCHEDULE_COLUMNS, schedule_rows(league), repeat, 1)
+        compare_tables("league admin games", ADMIN_COLUMNS, admin_rows(league), repeat)
+    else:
+        click.echo("No games in the database, skipping the league history")
+
+    # Growing tables show whether the cost per row stays flat
+    synthetic = synthetic_league(teams, seasons)
+    schedule = schedule_rows(synthetic)
+    for size in (100, 400, 1600):
+        if size <= len(schedule):
+            compare_tables("synthetic member schedule", SCHEDULE_COLUMNS, schedule[:size], repeat, 1)
+    for size in (1000, 4000, 16000):
+        if size <= len(synthetic):
+            compare_tables("synthetic admin games", ADMIN_COLUMNS, admin_rows(synthetic[:size]), repeat)
+
+
+@benchmark_group.command("rows")
+@click.option("--repeat", default=3, help="Runs of each implementation, the best is reported")
+@click.option("--teams", default=SYNTHETIC_TEAMS, help="Teams in the synthetic league")
+@click.option("--seasons", default=SYNTHETIC_SEASONS, help="Seasons in the synthetic league")
+@with_appcontext
+def benchmark_rows_command(repeat, teams, seasons):
+    click.echo(f"{'sqlite3.Row against Game records':<42} {'before':>12} {'after':>12} {'ratio':>9}")
+
+    db = get_db()
+    if LEAGUE_GAMES.fetchone(db):
+        compare_rows("league history", db, repeat)
+    else:
+        click.echo("No games in the database, skipping the league history")
+
+    synthetic = synthetic_database(synthetic_league(teams, seasons))
+    try:
+        compare_rows(f"synthetic {teams} teams", synthetic, repeat)
+    finally:
+        synthetic.close()
+
+
+@benchmark_group.command("fragments")
+@click.option("--repeat", default=3, help="Renders of each page, the best is reported")
+@with_appcontext
+def benchmark_fragments_command(repeat):
+    click.echo(f"{'Page, without and with the fragment cache':<42} {'before':>12} {'after':>12} {'speedup':>9}")
+
+    client = current_app.test_client()
+    for page in warm_pages(get_db()) + ["/current_season/analytics?all_play=all"]:
+        compare_fragments(client, page, repeat)
+    get_fragment_cache().clear()
+
+
+def init_app(app):
+    app.cli.add_command(benchmark_group)
@@ -65,6 +65,9 @@ NUM_PLAYOFF_TEAMS_PER_YEAR = {
     2024: 6
 }
 
+# Weekly scoring bands on the analytics page, scaled to the size of the league
+NUM_SCORING_TIERS = 4
+
 CURRENT_SEASON_CARDS = [
     {
         "name": "Season Info",
@@ -1,18 +1,255 @@
+import glob
+import gzip
+import hashlib
+import os
+import queue
+import shutil
 import sqlite3
+import threading
+import time
+from urllib.request import pathname2url
 import click
 from flask import current_app, g
 from flask.cli import with_appcontext
 import datetime
 import json
 
+from ff_website.constants import CURRENT_SEASON
+from ff_website.season_summaries import mark_unsummarized_seasons, refresh_member_season_summaries
+
+
+# Applied once when a pooled connection is created, never per request
+POOL_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000"
+]
+POOL_MAX_SIZE = 8
+POOL_TIMEOUT = 10.0
+# The named queries in queries.py stay prepared in each connection's statement cache
+POOL_STATEMENT_CACHE_SIZE = 256
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    A sqlite3 connection that can carry the pool's bookkeeping
+    """
+
+    archive_stamp = None
+
+
+def get_archive_stamp(path):
+    """
+    Identify the archive file on disk. freeze-season replaces the file rather than
+    writing to it, so a new stamp means connections attached to the old one are stale.
+    """
+
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def attach_archive(conn, path):
+    """
+    Attach the frozen seasons read-only and present live and archived games through
+    the all_games and all_team_games views. immutable=1 tells SQLite the file never
+    changes, so reads from it skip locking and change detection entirely.
+    Archived games come first in the views, so ties in index ordered top-N lists
+    resolve to the older game.
+    """
+
+    if get_archive_stamp(path) is None:
+        conn.execute("CREATE TEMP VIEW all_games AS SELECT * FROM main.game")
+        conn.execute("CREATE TEMP VIEW all_team_games AS SELECT * FROM main.team_game")
+        return
+
+    conn.execute(
+        "ATTACH DATABASE ? AS archive",
+        (f"file:{pathname2url(os.path.abspath(path))}?mode=ro&immutable=1",)
+    )
+    conn.execute(
+        """
+        CREATE TEMP VIEW all_games AS
+        SELECT * FROM archive.game
+        UNION ALL
+        SELECT * FROM main.game
+        """
+    )
+    conn.execute(
+        """
+        CREATE TEMP VIEW all_team_games AS
+        SELECT * FROM archive.team_game
+        UNION ALL
+        SELECT * FROM main.team_game
+        """
+    )
+
+
+class ConnectionPool(object):
+    """
+    Hands out pre-configured sqlite3 connections to one request context at a time.
+    Connections are returned to the pool on teardown instead of being closed, so a
+    worker only pays for sqlite3.connect (and the pragmas) once per connection.
+    """
+
+    def __init__(self, database, archive_database=None, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT):
+        self.database = database
+        self.archive_database = archive_database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pid = os.getpid()
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def _connect(self, archive_stamp):
+        conn = sqlite3.connect(
+            self.database,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            cached_statements=POOL_STATEMENT_CACHE_SIZE,
+            factory=PooledConnection,
+            uri=True
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in POOL_PRAGMAS:
+            conn.execute(pragma)
+        attach_archive(conn, self.archive_database)
+        conn.archive_stamp = archive_stamp
+        return conn
+
+    def _discard(self, conn):
+        conn.close()
+        with self._lock:
+            self._created -= 1
+
+    def _create(self, archive_stamp):
+        try:
+            return self._connect(archive_stamp)
+        except sqlite3.Error:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def acquire(self):
+        archive_stamp = get_archive_stamp(self.archive_database)
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if conn.archive_stamp == archive_stamp:
+                with self._lock:
+                    self.hits += 1
+                return conn
+            self._discard(conn)
+
+        with self._lock:
+            create = self._created < self.max_size
+            if create:
+                self._created += 1
+                self.misses += 1
+
+        if create:
+            return self._create(archive_stamp)
+
+        # Every connection is checked out, wait for one to come back
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out waiting for a connection to {self.database}")
+        finally:
+            with self._lock:
+                self.waits += 1
+                self.wait_time += time.perf_counter() - start
+
+        if conn.archive_stamp != archive_stamp:
+            conn.close()
+            with self._lock:
+                self.misses += 1
+            return self._create(archive_stamp)
+
+        with self._lock:
+            self.hits += 1
+        return conn
+
+    def release(self, conn):
+        # Never hand a half-finished transaction to the next request
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        self._idle.put(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "database": self.database,
+                "size": self._created,
+                "idle": self._idle.qsize(),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+                "waits": self.waits,
+                "wait_time": round(self.wait_time, 6)
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Return the connection pool for the configured database, creating it on first use.
+    Pools are per process, so a forked worker never reuses its parent's connections.
+    """
+
+    database = current_app.config["DATABASE"]
+    pool = _pools.get(database)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(database)
+            if pool is None or pool.pid != os.getpid():
+                pool = ConnectionPool(
+                    database,
+                    current_app.config.get("ARCHIVE_DATABASE"),
+                    current_app.config.get("DATABASE_POOL_SIZE", POOL_MAX_SIZE))
+                _pools[database] = pool
+    return pool
+
 
 def get_db():
     if 'db' not in g:
-        g.db = sqlite3.connect(
-            current_app.config["DATABASE"],
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        g.db.row_factory = sqlite3.Row
+        g.db = get_pool().acquire()
 
     return g.db
 
@@ -21,14 +258,121 @@ def close_db(e=None):
     db = g.pop('db', None)
 
     if db is not None:
-        db.close()
+        get_pool().release(db)
 
 
-def init_db():
+MIGRATIONS_DIR = "migrations"
+
+
+def get_migrations():
+    """
+    Return (version, name, path) for every numbered migration file, in order.
+    Migration files are named like 0001_initial_schema.sql
+    """
+
+    migrations_path = os.path.join(current_app.root_path, MIGRATIONS_DIR)
+    migrations = []
+    for file_name in sorted(os.listdir(migrations_path)):
+        base, extension = os.path.splitext(file_name)
+        if extension != ".sql":
+            continue
+        version, _, name = base.partition("_")
+        migrations.append((int(version), name, os.path.join(migrations_path, file_name)))
+
+    return migrations
+
+
+def split_statements(script):
+    """
+    Split a SQL script into complete statements so a migration can run statement by
+    statement inside a single transaction (executescript would commit as it goes)
+    """
+
+    statements = []
+    current = ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    if current.strip():
+        statements.append(current.strip())
+
+    return statements
+
+
+def apply_migrations():
+    """
+    Apply every migration newer than the current schema_version, each in its own
+    transaction. Returns the list of (version, name) pairs that were applied.
+    """
+
+    db = get_db()
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version
+        (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    db.commit()
+
+    applied = []
+    for version, name, path in get_migrations():
+        # Take the write lock before checking, so two workers booting at once
+        # cannot both apply the same migration
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            exists = db.execute(
+                """
+                SELECT version FROM schema_version
+                WHERE version=?
+                """, (version,)
+            ).fetchone()
+            if exists:
+                db.rollback()
+                continue
+
+            with open(path, encoding="utf8") as f:
+                for statement in split_statements(f.read()):
+                    db.execute(statement)
+
+            db.execute(
+                """
+                INSERT INTO schema_version
+                (version, name, applied_at)
+                VALUES(?, ?, ?)
+                """, (version, name, datetime.datetime.now().isoformat(timespec="seconds"))
+            )
+            db.commit()
+        except sqlite3.Error:
+            db.rollback()
+            raise
+
+        applied.append((version, name))
+
+    if applied:
+        mark_unsummarized_seasons(db)
+    refresh_member_season_summaries(db)
+
+    return applied
+
+
+def get_schema_version():
     db = get_db()
+    query = db.execute(
+        """
+        SELECT MAX(version) AS version FROM schema_version
+        """
+    ).fetchone()
+    return query["version"] or 0
 
-    with current_app.open_resource("schema.sql") as f:
-        db.executescript(f.read().decode("utf8"))
+
+def init_db():
+    apply_migrations()
 
 
 @click.command("init-db")
@@ -38,73 +382,585 @@ def init_db_command():
     click.echo("Initialized databases")
 
 
+@click.command("migrate")
+@with_appcontext
+def migrate_command():
+    applied = apply_migrations()
+    for version, name in applied:
+        click.echo(f"Applied migration {version:04d} ({name})")
+    if not applied:
+        click.echo("Database is up to date")
+    click.echo(f"Schema version: {get_schema_version()}")
+
+
+def find_table_scans(db, sql, params=()):
+    """
+    Return the EXPLAIN QUERY PLAN lines that read a table without any index
+    """
+
+    plan = db.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row["detail"] for row in plan
+            if row["detail"].startswith("SCAN ") and " USING " not in row["detail"]]
+
+
+@click.command("check-query-plans")
+@with_appcontext
+def check_query_plans_command():
+    from ff_website.queries import REGISTRY
+
+    # The same statements the routes run, so a route can't regress unnoticed
+    checks = {name: (query.sql, query.example_params) for name, query in REGISTRY.items()}
+
+    db = get_db()
+    failures = 0
+    for name, (sql, params) in checks.items():
+        scans = find_table_scans(db, sql, params)
+        if scans:
+            failures += 1
+            click.echo(f"FAIL {name}: {'; '.join(scans)}")
+        else:
+            click.echo(f"ok   {name}")
+
+    if failures:
+        raise click.ClickException(f"{failures} queries fell back to a table scan")
+
+
 def get_member_name(id):
     """
     Return the member_name given the ID of the member
     """
 
-    init_db()
-    db = get_db()
-    member = db.execute(
-        f"""
-        SELECT first_name, last_name from member
-        WHERE member_id=?
-        """, (id,)
-    ).fetchall()
+    from ff_website.members import get_member_directory
 
-    first_name = member[0]["first_name"]
-    last_name = member[0]["last_name"]
-    return f"{first_name} {last_name}"
+    return get_member_directory().get_name(id)
 
 
-@click.command("backup-db")
+def get_frozen_seasons(db):
+    """
+    Return the seasons that live in the read-only archive database
+    """
+
+    if "archive" not in {row["name"] for row in db.execute("PRAGMA database_list")}:
+        return set()
+    return {row[0] for row in db.execute("SELECT DISTINCT season FROM archive.game")}
+
+
+def next_game_id(db):
+    """
+    Frozen games keep their ids, so new games are numbered after every game in
+    either database rather than after the highest id left in main.game. Call it
+    after BEGIN IMMEDIATE, so no other writer can take the same id before the
+    insert commits.
+    """
+
+    return db.execute("SELECT coalesce(max(game_id), 0) + 1 FROM all_games").fetchone()[0]
+
+
+def freeze_season(db, season, archive_path):
+    """
+    Move every game of a completed season out of the live database and into the
+    read-only archive. The new archive is built next to the old one and swapped in
+    with os.replace, so readers see either the old file or the new one, never a
+    partial copy. Returns the number of games moved.
+    """
+
+    if season >= CURRENT_SEASON:
+        raise ValueError(f"{season} is not a completed season")
+    if season in get_frozen_seasons(db):
+        raise ValueError(f"{season} is already frozen")
+
+    num_games = db.execute(
+        "SELECT count(*) FROM main.game WHERE season=?", (season,)).fetchone()[0]
+    if not num_games:
+        raise ValueError(f"There are no games for {season}")
+
+    tmp_path = archive_path + ".tmp"
+    if os.path.exists(archive_path):
+        shutil.copyfile(archive_path, tmp_path)
+    elif os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    # The archive gets the same tables and indexes as main, but none of the triggers
+    archive = sqlite3.connect(tmp_path)
+    try:
+        if not archive.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='game'").fetchone():
+            for (sql,) in db.execute(
+                """
+                SELECT sql FROM main.sqlite_master
+                WHERE tbl_name IN ('game', 'team_game') AND type IN ('table', 'index') AND sql IS NOT NULL
+                ORDER BY type DESC
+                """
+            ):
+                archive.execute(sql)
+            archive.commit()
+    finally:
+        archive.close()
+
+    db.execute("ATTACH DATABASE ? AS freeze", (tmp_path,))
+    try:
+        db.execute("INSERT INTO freeze.game SELECT * FROM main.game WHERE season=?", (season,))
+        db.execute("INSERT INTO freeze.team_game SELECT * FROM main.team_game WHERE season=?", (season,))
+        db.commit()
+    finally:
+        db.execute("DETACH DATABASE freeze")
+
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        if db.execute(
+                "SELECT count(*) FROM main.game WHERE season=?", (season,)).fetchone()[0] != num_games:
+            raise ValueError(f"Games for {season} changed while freezing, try again")
+        stale = db.execute(
+            "SELECT 1 FROM member_season_summary_stale WHERE season=?", (season,)).fetchone()
+        # team_game_delete clears the season's team_game rows
+        db.execute("DELETE FROM main.game WHERE season=?", (season,))
+        # The summaries are the same from the archive. Rebuilding them before every
+        # connection has attached the new archive would find no games at all.
+        if not stale:
+            db.execute("DELETE FROM member_season_summary_stale WHERE season=?", (season,))
+        db.commit()
+    except (sqlite3.Error, ValueError):
+        db.rollback()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # The season is only in the new archive now. Swapping it in after the delete
+    # is committed means the two databases never both hold the season's games.
+    try:
+        os.replace(tmp_path, archive_path)
+    except OSError:
+        unfreeze_games(db, season, tmp_path)
+        raise
+
+    return num_games
+
+
+def unfreeze_games(db, season, tmp_path):
+    """
+    Put a season's games back in main from an archive that couldn't be swapped in
+    """
+
+    db.execute("ATTACH DATABASE ? AS freeze", (tmp_path,))
+    try:
+        # team_game_insert rebuilds the season's team_game rows
+        db.execute("INSERT INTO main.game SELECT * FROM freeze.game WHERE season=?", (season,))
+        db.commit()
+    finally:
+        db.execute("DETACH DATABASE freeze")
+    os.remove(tmp_path)
+
+
+@click.command("freeze-season")
+@click.argument("season", type=int)
 @with_appcontext
-def backup_db_command():
-    db = get_db()
-    member_query = db.execute(
+def freeze_season_command(season):
+    archive_path = current_app.config["ARCHIVE_DATABASE"]
+    try:
+        num_games = freeze_season(get_db(), season, archive_path)
+    except (sqlite3.Error, ValueError, OSError) as e:
+        raise click.ClickException(f"Could not freeze {season}: {e}")
+
+    click.echo(f"Moved {num_games} games from {season} to {archive_path}")
+
+
+BACKUP_DIR = os.path.join("data", "backups")
+BACKUP_MANIFEST = "manifest.json"
+BACKUP_TABLES = ["member", "game", "user", "announcement", "report"]
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+BACKUP_RETENTION = 7
+
+
+def get_backup_dir():
+    backup_dir = os.path.join(current_app.root_path, BACKUP_DIR)
+    os.makedirs(backup_dir, exist_ok=True)
+    return backup_dir
+
+
+def table_checksum(db, table):
+    """
+    Return a sha256 of every row in the table, used to skip unchanged tables
+    """
+
+    digest = hashlib.sha256()
+    for row in db.execute(f"SELECT * FROM {table} ORDER BY rowid"):
+        digest.update(repr(tuple(row)).encode("utf8"))
+    return digest.hexdigest()
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_db(db, path, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP):
+    """
+    Copy the live database to a gzip compressed file with the SQLite backup API.
+    The copy is made a few pages at a time, so the site keeps serving requests
+    (and taking writes) while the backup runs.
+    """
+
+    raw_path = path + ".tmp"
+    dest = sqlite3.connect(raw_path)
+    try:
+        db.backup(dest, pages=pages, sleep=sleep)
+    finally:
+        dest.close()
+
+    with open(raw_path, "rb") as src, gzip.GzipFile(path, "wb", mtime=0) as out:
+        shutil.copyfileobj(src, out)
+    os.remove(raw_path)
+
+
+def export_ndjson(rows, path):
+    """
+    Write one compact JSON object per line to a gzip compressed file
+    """
+
+    count = 0
+    with gzip.GzipFile(path, "wb", mtime=0) as out:
+        for row in rows:
+            out.write(json.dumps(row, separators=(",", ":")).encode("utf8") + b"\n")
+            count += 1
+    return count
+
+
+def iter_member_backup(db):
+    for i in db.execute(
         """
         SELECT * FROM member
+        ORDER BY member_id
         """
-    ).fetchall()
-    member_data = [{
-        "member_id": i["member_id"],
-        "first_name": i["first_name"],
-        "last_name": i["last_name"],
-        "year_joined": i["year_joined"],
-        "active": i["active"],
-        "img_filepath": i["img_filepath"]
-    } for i in member_query]
-
-    game_query = db.execute(
+    ):
+        yield {
+            "member_id": i["member_id"],
+            "first_name": i["first_name"],
+            "last_name": i["last_name"],
+            "year_joined": i["year_joined"],
+            "active": i["active"],
+            "img_filepath": i["img_filepath"]
+        }
+
+
+def iter_game_backup(db):
+    # Resolve both member names with a single join instead of a lookup per game
+    for i in db.execute(
         """
-        SELECT * FROM game
+        SELECT season, week, matchup_length, playoffs, team_A_score, team_B_score,
+        t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
+        FROM all_games
+        INNER JOIN member t2
+        ON t2.member_id = team_A_id
+        INNER JOIN member t3
+        ON t3.member_id = team_B_id
+        ORDER BY season ASC, week ASC, game_id ASC
         """
-    ).fetchall()
+    ):
+        yield {
+            "season": i["season"],
+            "week": i["week"],
+            "matchup_length": i["matchup_length"],
+            "playoffs": bool(i["playoffs"]),
+            "home_team": f"{i['team_A_first_name']} {i['team_A_last_name']}",
+            "home_score": i["team_A_score"],
+            "away_team": f"{i['team_B_first_name']} {i['team_B_last_name']}",
+            "away_score": i["team_B_score"]
+        }
+
+
+def prune_backups(backup_dir, pattern, keep):
+    """
+    Delete all but the newest `keep` files matching the pattern. Backup file names
+    start with a sortable timestamp, so name order is age order.
+    """
+
+    files = sorted(glob.glob(os.path.join(backup_dir, pattern)))
+    removed = files[:-keep] if keep > 0 else files
+    for file in removed:
+        os.remove(file)
+    return removed
+
+
+@click.command("backup-db")
+@click.option("--snapshot/--no-snapshot", default=True,
+              help="Also take a compressed copy of the whole database file")
+@click.option("--pages", default=BACKUP_PAGES_PER_STEP,
+              help="Pages copied per step of the online backup")
+@click.option("--keep", default=BACKUP_RETENTION, type=click.IntRange(min=1),
+              help="Number of backups of each kind to keep, at least the one just written")
+@click.option("--force", is_flag=True,
+              help="Write every backup even if the tables have not changed")
+@with_appcontext
+def backup_db_command(snapshot, pages, keep, force):
+    db = get_db()
+    backup_dir = get_backup_dir()
+    manifest_path = os.path.join(backup_dir, BACKUP_MANIFEST)
+
+    manifest = {"checksums": {}, "files": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    previous = manifest["checksums"]
+    checksums = {table: table_checksum(db, table) for table in BACKUP_TABLES}
+
+    # The archive never changes in place, it only moves when a season is frozen
+    archive_path = current_app.config.get("ARCHIVE_DATABASE")
+    if archive_path and os.path.exists(archive_path):
+        checksums["archive"] = file_checksum(archive_path)
+
+    changed = {name for name in checksums
+               if force or previous.get(name) != checksums[name]}
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d-%H%M%S")
+
+    if snapshot and "archive" in changed:
+        archive_backup_path = os.path.join(backup_dir, f"archive-{timestamp}.sqlite.gz")
+        with open(archive_path, "rb") as src, gzip.GzipFile(archive_backup_path, "wb", mtime=0) as out:
+            shutil.copyfileobj(src, out)
+        manifest["files"]["archive"] = os.path.basename(archive_backup_path)
+        click.echo(f"Archive copied to {archive_backup_path}")
+
+    if snapshot and changed & set(BACKUP_TABLES):
+        snapshot_path = os.path.join(backup_dir, f"logs-{timestamp}.sqlite.gz")
+        snapshot_db(db, snapshot_path, pages)
+        manifest["files"]["snapshot"] = os.path.basename(snapshot_path)
+        click.echo(f"Snapshot written to {snapshot_path}")
+    elif snapshot:
+        click.echo("Snapshot skipped, no tables changed")
+
+    exports = [
+        ("members", {"member"}, iter_member_backup),
+        ("games", {"member", "game", "archive"}, iter_game_backup)
+    ]
+    for name, tables, rows in exports:
+        if not tables & changed:
+            click.echo(f"{name} unchanged, skipped")
+            continue
+
+        path = os.path.join(backup_dir, f"{name}-{timestamp}.ndjson.gz")
+        count = export_ndjson(rows(db), path)
+        manifest["files"][name] = os.path.basename(path)
+        click.echo(f"Exported {count} {name} to {path}")
+
+    for pattern in ["logs-*.sqlite.gz", "archive-*.sqlite.gz", "members-*.ndjson.gz", "games-*.ndjson.gz"]:
+        for removed in prune_backups(backup_dir, pattern, keep):
+            click.echo(f"Removed old backup {removed}")
+
+    manifest["checksums"] = checksums
+    manifest["timestamp"] = timestamp
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=4)
+
 
-    game_data = [{
-        "season": i["season"],
-        "week": i["week"],
-        "matchup_length": i["matchup_length"],
-        "playoffs": bool(i["playoffs"]),
-        "home_team": get_member_name(i["team_A_id"]),
-        "home_score": i["team_A_score"],
-        "away_team": get_member_name(i["team_B_id"]),
-        "away_score": i["team_B_score"]
-    } for i in game_query]
+RESTORE_BATCH_SIZE = 5000
 
-    ct = datetime.datetime.now()
-    year = ct.year
-    month = ct.month
-    day = ct.day
 
-    members_filename = f"ff_website/data/backups/members-{year}-{month}-{day}.json"
-    games_filename = f"ff_website/data/backups/games-{year}-{month}-{day}.json"
+def iter_backup_records(path):
+    """
+    Stream the records of a backup file. Handles the compact NDJSON exports
+    (optionally gzipped) as well as the older pretty-printed JSON array files.
+    """
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf8") as f:
+        if ".ndjson" in os.path.basename(path):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            for record in json.load(f):
+                yield record
+
+
+def iter_batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def restore_db(db, members_file, games_files, batch_size=RESTORE_BATCH_SIZE, echo=None):
+    """
+    Replace every member and game with the contents of backup files, in one
+    transaction. Rows are bulk loaded into staging tables first, then swapped in,
+    so readers see either the old data or the new data and never a mix.
+    Games from frozen seasons are skipped, the archive database already has them.
+    Returns (number of members, number of games).
+    """
+
+    echo = echo or (lambda message: None)
+    frozen_seasons = get_frozen_seasons(db)
+
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        db.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS member_restore
+            (
+                member_id INTEGER PRIMARY KEY,
+                first_name TEXT NOT NULL,
+                last_name TEXT NOT NULL,
+                year_joined INTEGER NOT NULL,
+                active INTEGER NOT NULL,
+                img_filepath TEXT NOT NULL
+            )
+            """
+        )
+        db.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS game_restore
+            (
+                team_A_score FLOAT NOT NULL,
+                team_B_score FLOAT NOT NULL,
+                season INTEGER NOT NULL,
+                week INTEGER NOT NULL,
+                matchup_length INTEGER NOT NULL,
+                playoffs INTEGER NOT NULL,
+                team_A_id INTEGER NOT NULL,
+                team_B_id INTEGER NOT NULL
+            )
+            """
+        )
+        db.execute("DELETE FROM temp.member_restore")
+        db.execute("DELETE FROM temp.game_restore")
 
-    json.dump(member_data, open(members_filename, "w"), indent=4)
-    json.dump(game_data, open(games_filename, "w"), indent=4)
+        # Names in the games files are resolved from memory, not one query per game
+        member_ids = {}
+        # Members from backups without ids are numbered after every id in the file
+        unnumbered = []
+        max_member_id = 0
+
+        def stage_members(rows):
+            db.executemany(
+                """
+                INSERT INTO temp.member_restore
+                (member_id, first_name, last_name, year_joined, active, img_filepath)
+                VALUES(?, ?, ?, ?, ?, ?)
+                """, [(member_id, member["first_name"], member["last_name"], member["year_joined"],
+                       member["active"], member["img_filepath"]) for member_id, member in rows]
+            )
+            for member_id, member in rows:
+                member_ids[f"{member['first_name']} {member['last_name']}"] = member_id
+
+        for batch in iter_batches(iter_backup_records(members_file), batch_size):
+            rows = []
+            for member in batch:
+                if member.get("member_id") is None:
+                    unnumbered.append(member)
+                    continue
+                max_member_id = max(max_member_id, int(member["member_id"]))
+                rows.append((int(member["member_id"]), member))
+            stage_members(rows)
+        stage_members(list(enumerate(unnumbered, max_member_id + 1)))
+        echo(f"Staged {len(member_ids)} members from {members_file}")
+
+        num_games = 0
+        num_frozen = 0
+        for games_file in games_files:
+            for batch in iter_batches(iter_backup_records(games_file), batch_size):
+                rows = []
+                for game in batch:
+                    if int(game["season"]) in frozen_seasons:
+                        num_frozen += 1
+                        continue
+                    try:
+                        home_id = member_ids[game["home_team"]]
+                        away_id = member_ids[game["away_team"]]
+                    except KeyError as e:
+                        raise ValueError(
+                            f"{games_file} references unknown member {e.args[0]}")
+                    rows.append((game["home_score"], game["away_score"], int(game["season"]),
+                                 int(game["week"]), int(game["matchup_length"]),
+                                 int(game["playoffs"]), home_id, away_id))
+                db.executemany(
+                    """
+                    INSERT INTO temp.game_restore
+                    (team_A_score, team_B_score, season, week, matchup_length, playoffs, team_A_id, team_B_id)
+                    VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                    """, rows
+                )
+                num_games += len(rows)
+                echo(f"Staged {num_games} games")
+        if num_frozen:
+            echo(f"Skipped {num_frozen} games from frozen seasons")
+
+        db.execute("DELETE FROM game")
+        db.execute("DELETE FROM member")
+        db.execute(
+            """
+            INSERT INTO member
+            SELECT * FROM temp.member_restore
+            """
+        )
+        # Number the restored games after the archived ones so ids stay unique in all_games
+        db.execute(
+            """
+            INSERT INTO game
+            (game_id, team_A_score, team_B_score, season, week, matchup_length, playoffs, team_A_id, team_B_id)
+            SELECT rowid + ?, * FROM temp.game_restore
+            ORDER BY rowid
+            """, (next_game_id(db) - 1,)
+        )
+        db.execute("DROP TABLE temp.member_restore")
+        db.execute("DROP TABLE temp.game_restore")
+        db.commit()
+    except (sqlite3.Error, ValueError, KeyError):
+        db.rollback()
+        raise
+
+    refresh_member_season_summaries(db)
+    return len(member_ids), num_games
+
+
+@click.command("restore-db")
+@click.option("--members", "members_file", type=click.Path(exists=True, dir_okay=False),
+              help="Members backup, defaults to the newest one in data/backups")
+@click.option("--games", "games_files", multiple=True, type=click.Path(exists=True, dir_okay=False),
+              help="Games backup(s), may be given once per file. Defaults to the newest one in data/backups")
+@click.option("--batch-size", default=RESTORE_BATCH_SIZE,
+              help="Rows inserted per executemany call")
+@with_appcontext
+def restore_db_command(members_file, games_files, batch_size):
+    backup_dir = get_backup_dir()
+    manifest_path = os.path.join(backup_dir, BACKUP_MANIFEST)
+    if not members_file or not games_files:
+        if not os.path.exists(manifest_path):
+            raise click.ClickException(
+                "No backup manifest found, pass --members and --games")
+        with open(manifest_path) as f:
+            files = json.load(f)["files"]
+        members_file = members_file or os.path.join(backup_dir, files["members"])
+        games_files = games_files or [os.path.join(backup_dir, files["games"])]
+
+    start = time.perf_counter()
+    try:
+        num_members, num_games = restore_db(
+            get_db(), members_file, games_files, batch_size, click.echo)
+    except (sqlite3.Error, ValueError, KeyError) as e:
+        raise click.ClickException(f"Restore failed, nothing was changed: {e}")
+
+    click.echo(f"Restored {num_members} members and {num_games} games in "
+               f"{time.perf_counter() - start:.3f}s")
 
 
 def init_app(app):
     app.teardown_appcontext(close_db)
     app.cli.add_command(init_db_command)
+    app.cli.add_command(migrate_command)
+    app.cli.add_command(check_query_plans_command)
     app.cli.add_command(backup_db_command)
+    app.cli.add_command(restore_db_command)
+    app.cli.add_command(freeze_season_command)
+
+    # Bring the schema up to date once at boot so runtime lookups never touch DDL
+    with app.app_context():
+        apply_migrations()
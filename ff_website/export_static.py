@@ -0,0 +1,272 @@
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ff_website.constants import *
+from ff_website.db import get_db
+from ff_website.power_rankings import get_power_rankings_store
+
+"""
+`flask export-static <dir>` renders every public page to a tree of files that any
+static file server can host. A URL's query string becomes part of its path, so
+/archives/season_summary?year=2019 is written to archives/season_summary/year-2019/
+index.html, and every link to an exported page or static file is rewritten to
+match. Static files are copied under a content hash, so they can be cached forever.
+
+There is nothing to post a form to, so the selector forms are rewritten to go
+straight to the exported page they would have redirected to, and lose their CSRF
+tokens. /tools and the logins aren't exported.
+"""
+
+
+EXPORT_WORKERS = os.cpu_count() or 1
+EXPORT_CHUNK_SIZE = 8
+GAME_QUALITIES_RESULTS = [10, 25, 100]
+
+# Quoted strings in pages and scripts, and url(...) references in stylesheets
+QUOTED_URL = re.compile(r"""(["'])(/[^"'\s<>]*)\1""")
+CSS_URL = re.compile(r"""url\((["']?)([^"')]+)\1\)""")
+TEXT_ASSETS = (".css", ".js")
+
+# The query arguments each selector redirects to, in URL order, and the form
+# fields they come from
+SELECTORS = {
+    "/archives/season_summary": [("year", "year")],
+    "/archives/head_to_head": [("member_one_id", "leagueMemberOne"), ("member_two_id", "leagueMemberTwo")],
+    "/archives/game_qualities": [("filter_type", "filter"), ("num_results", "numberOfResults")],
+    "/current_season/analytics": [("all_play", "allPlay")],
+    "/current_season/power_rankings": [("week", "week")],
+}
+POST_FORM = re.compile(r"""<form\b[^>]*\bmethod="POST"[^>]*>""")
+CSRF_INPUT = re.compile(r"""<input\b[^>]*\bname="csrf_token"[^>]*>""")
+SELECTOR_SCRIPT = """<script>
+  document.querySelectorAll("form[data-export-selector]").forEach(function (form) {
+    form.addEventListener("submit", function (event) {
+      event.preventDefault();
+      var parts = JSON.parse(form.dataset.exportSelector).map(function (arg) {
+        var value = form.elements[arg[1]].value;
+        return value ? arg[0] + "-" + value : null;
+      });
+      if (parts.indexOf(null) === -1) {
+        window.location.href = form.getAttribute("action") + parts.join("_") + "/";
+      }
+    });
+  });
+</script>
+"""
+
+
+def export_urls(db):
+    """
+    Return every public URL, with one entry per value its query arguments can take
+    """
+
+    urls = ["/", "/members", "/archives/", "/archives/season_summary",
+            "/archives/inactive_members", "/archives/archived_reports",
+            "/archives/league_gatherings", "/archives/head_to_head", "/archives/game_qualities",
+            "/current_season", "/current_season/season_info", "/current_season/payouts",
+            "/current_season/analytics", "/current_season/report",
+            "/current_season/power_rankings", "/current_season/announcements", "/hall_of_fame",
+            "/apis/power_rankings_available"]
+    urls += [f"/apis/all_members?active={active}" for active in (0, 1, 2)]
+
+    seasons = [row[0] for row in db.execute("SELECT DISTINCT season FROM all_games ORDER BY season")]
+    urls += [f"/archives/season_summary?year={season}" for season in seasons]
+    urls += ["/current_season/analytics?all_play=all"]
+    urls += [f"/current_season/analytics?all_play={season}"
+             for season in seasons if season < CURRENT_SEASON]
+
+    member_ids = [row[0] for row in db.execute(
+        f"SELECT {MEMBER_ID} FROM member ORDER BY {MEMBER_ID}")]
+    urls += [f"/member/{member_id}" for member_id in member_ids]
+    # Either member can be picked first
+    urls += [f"/archives/head_to_head?member_one_id={one}&member_two_id={two}"
+             for one in member_ids for two in member_ids if one != two]
+
+    urls += [f"/archives/game_qualities?filter_type={filter_type}&num_results={num_results}"
+             for filter_type in range(1, 7) for num_results in GAME_QUALITIES_RESULTS]
+
+    urls += [f"/current_season/power_rankings?week={week}"
+             for week in get_power_rankings_store().season(CURRENT_SEASON).weeks]
+    return urls
+
+
+def export_path(url):
+    """
+    Return the file a URL is exported to, relative to the export directory
+    """
+
+    path, _, query = url.partition("?")
+    parts = [part for part in path.split("/") if part]
+    if query:
+        parts.append(query.replace("&", "_").replace("=", "-"))
+    if path.startswith("/apis/"):
+        return "/".join(parts) + ".json"
+    return "/".join(parts + ["index.html"])
+
+
+def export_link(url):
+    path = export_path(url)
+    if path.endswith("index.html"):
+        return "/" + path[:-len("index.html")]
+    return "/" + path
+
+
+def rewrite_selectors(text, url):
+    """
+    Point the selector form on an exported page at the pages it leads to, which
+    its script navigates to, and drop every CSRF token
+    """
+
+    text = CSRF_INPUT.sub("", text)
+    fields = SELECTORS.get(url.partition("?")[0])
+    if fields is None:
+        return text
+
+    tag = (f'<form novalidate="novalidate" method="GET" action="{export_link(url.partition("?")[0])}" '
+           f'data-export-selector="{html.escape(json.dumps(fields))}">')
+    text, count = POST_FORM.subn(tag, text)
+    if count:
+        text = text.replace("</body>", SELECTOR_SCRIPT + "</body>", 1)
+    return text
+
+
+def copy_static(static_folder, out_dir, links):
+    """
+    Copy every static file to a name that includes a hash of its contents, adding
+    "/static/<file>": "/static/<hashed file>" to links. Stylesheets and scripts are
+    copied last, after their references to pages and other files are rewritten.
+    """
+
+    files = []
+    for root, dirs, filenames in os.walk(static_folder):
+        for filename in filenames:
+            files.append(os.path.relpath(os.path.join(root, filename), static_folder).replace(os.sep, "/"))
+    files.sort(key=lambda name: (name.endswith(TEXT_ASSETS), name.endswith(".js"), name))
+
+    for name in files:
+        with open(os.path.join(static_folder, name), "rb") as f:
+            content = f.read()
+        if name.endswith(TEXT_ASSETS):
+            content = rewrite_links(content.decode(), links, "/static/" + name).encode()
+
+        stem, ext = posixpath.splitext(name)
+        hashed = f"{stem}.{hashlib.sha1(content).hexdigest()[:10]}{ext}"
+        target = os.path.join(out_dir, "static", hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(content)
+        links["/static/" + name] = "/static/" + hashed
+
+    # Browsers ask for /favicon.ico whatever the page links to
+    if "favicon.ico" in files:
+        shutil.copyfile(os.path.join(static_folder, "favicon.ico"), os.path.join(out_dir, "favicon.ico"))
+
+
+def rewrite_links(text, links, url=None):
+    """
+    Point every quoted URL in text that was exported at its exported copy. In a
+    stylesheet at url, relative url(...) references are rewritten as well.
+    """
+
+    def quoted(match):
+        target = links.get(html.unescape(match.group(2)))
+        if target is None:
+            return match.group(0)
+        return f"{match.group(1)}{target}{match.group(1)}"
+
+    text = QUOTED_URL.sub(quoted, text)
+
+    if url and url.endswith(".css"):
+        base = posixpath.dirname(url)
+
+        def relative(match):
+            reference = match.group(2)
+            if reference.startswith(("/", "data:", "http:", "https:")):
+                return match.group(0)
+            target = links.get(posixpath.normpath(posixpath.join(base, reference)))
+            if target is None:
+                return match.group(0)
+            return f"url({match.group(1)}{posixpath.relpath(target, base)}{match.group(1)})"
+
+        text = CSS_URL.sub(relative, text)
+    return text
+
+
+_export = {}
+
+
+def init_export_worker(out_dir, links):
+    _export["out_dir"] = out_dir
+    _export["links"] = links
+
+
+def export_pages(urls):
+    """
+    Render urls in a worker process and write them out. Returns the URLs that
+    didn't render, with their status codes.
+    """
+
+    from ff_website import app
+
+    client = app.test_client(use_cookies=False)
+    failed = []
+    for url in urls:
+        response = client.get(url)
+        if response.status_code != 200:
+            failed.append((url, response.status_code))
+            continue
+
+        target = os.path.join(_export["out_dir"], export_path(url))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "w") as f:
+            f.write(rewrite_selectors(
+                rewrite_links(response.get_data(as_text=True), _export["links"]), url))
+    return failed
+
+
+def export_static(out_dir, workers=EXPORT_WORKERS):
+    """
+    Export every public page and static file to out_dir. Returns the number of pages
+    written and the (url, status) of every page that failed.
+    """
+
+    urls = export_urls(get_db())
+    links = {url: export_link(url) for url in urls}
+    copy_static(current_app.static_folder, out_dir, links)
+
+    chunks = [urls[i:i + EXPORT_CHUNK_SIZE] for i in range(0, len(urls), EXPORT_CHUNK_SIZE)]
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_export_worker,
+                             initargs=(out_dir, links)) as executor:
+        for chunk_failed in executor.map(export_pages, chunks):
+            failed.extend(chunk_failed)
+    return len(urls) - len(failed), failed
+
+
+@click.command("export-static")
+@click.argument("out_dir", type=click.Path(file_okay=False))
+@click.option("--workers", default=EXPORT_WORKERS, help="Processes rendering pages")
+@with_appcontext
+def export_static_command(out_dir, workers):
+    os.makedirs(out_dir, exist_ok=True)
+    written, failed = export_static(os.path.abspath(out_dir), workers)
+    for url, status in failed:
+        click.echo(f"FAIL {url} ({status})")
+    click.echo(f"Exported {written} pages to {out_dir}")
+
+    if failed:
+        raise click.ClickException(f"{len(failed)} pages could not be exported")
+
+
+def init_app(app):
+    app.cli.add_command(export_static_command)
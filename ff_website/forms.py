@@ -52,6 +52,16 @@ class HeadToHead(FlaskForm):
     submit = SubmitField("Compare members")
 
 
+class AllPlaySelector(FlaskForm):
+
+    allPlay = SelectField('Season',
+                          choices=[("", "Please select a season..."), ("all", "All Time")] +
+                          [(str(x), str(x)) for x in range(2017, CURRENT_SEASON)],
+                          validators=[DataRequired("Please select a season")])
+
+    submit = SubmitField("View All-Play Records")
+
+
 class GameQualities(FlaskForm):
 
     filter = SelectField('Filter',
@@ -74,6 +84,8 @@ class GameQualities(FlaskForm):
 
 
 class SeasonSelector(FlaskForm):
+    class Meta:
+        csrf = False
 
     year = SelectField('Season',
                        choices=[("", "Please select a season..."),
@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+
+from ff_website.constants import *
+from ff_website.db import get_db
+from ff_website.members import get_generation
+
+"""
+A process-wide LRU cache of rendered page fragments: the HTML tables and other
+values a route builds from the games. Entries are keyed on the data generation,
+which the triggers on game and member bump on every write, so a cached fragment
+is never served after the data it was built from has changed.
+"""
+
+
+FRAGMENT_CACHE_SIZE = 256
+
+
+class FragmentCache(object):
+    def __init__(self, max_size=FRAGMENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_render(self, key, render, still_valid=None):
+        """
+        Return the value cached for key, calling render() to build it on a miss.
+        render runs outside the lock, so two requests can both build a fragment
+        the first time it is needed. If still_valid() is false once render
+        returns, the value is returned without being cached.
+        """
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = render()
+
+        with self._lock:
+            self.misses += 1
+            if still_valid and not still_valid():
+                return value
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_cache = FragmentCache()
+
+
+def get_fragment_cache():
+    return _cache
+
+
+def get_data_generation(db=None):
+    return get_generation(db or get_db(), "data")
+
+
+def cached_fragment(name, key, render):
+    """
+    Return render() for the named fragment of key (a season, a member_id, ...),
+    reusing the result until the next write to the games or members. A fragment
+    rendered while a write landed may mix data from before and after it, and
+    isn't cached.
+    """
+
+    generation = get_data_generation()
+    return _cache.get_or_render((name, key, generation), render,
+                                lambda: get_data_generation() == generation)
@@ -1,7 +1,8 @@
 from ff_website.constants import *
+from ff_website.season_frame import SeasonFrame, roto_ranks
+import numpy as np
 import pandas as pd
 import os
-import json
 from collections import OrderedDict
 import heapq
 
@@ -20,6 +21,42 @@ class Record(object):
         return self.value > other.value
 
 
+class TableBuilder(object):
+    """
+    Collects a table row by row into one list per column and builds the DataFrame
+    once. Appending with df.loc[len(df.index)] copies the whole frame on every row.
+    Columns get the same dtypes the df.loc appends used to infer.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.data = [[] for _ in self.columns]
+
+    def __len__(self):
+        return len(self.data[0]) if self.data else 0
+
+    def append(self, row):
+        # df.loc raised on a row of the wrong length, zip would pad or cut it silently
+        if len(row) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values, got {len(row)}")
+        for values, value in zip(self.data, row):
+            values.append(value)
+
+    def frame(self, start=0, index=None):
+        """
+        Return the DataFrame, with rows numbered from start or labelled by index
+        """
+
+        if not len(self):
+            return pd.DataFrame(columns=self.columns)
+        if index is None:
+            index = range(start, start + len(self))
+        return pd.DataFrame(dict(zip(self.columns, self.data)), index=index)
+
+    def to_html(self, start=0, **kwargs):
+        return self.frame(start).to_html(**kwargs)
+
+
 def jsonify_members(query):
     data = [
         {
@@ -82,113 +119,54 @@ def get_streak_head_to_head(df: pd.DataFrame):
 
 def get_playoffs(query):
     playoffs = {}
-    _, ranks = get_standings(query)
+    frame = SeasonFrame.of(query)
+    seeds = frame.seeds().tolist()
     for row in query:
-        if row[PLAYOFFS] == 1:
-            week = row[WEEK]
+        if row.playoffs == 1:
+            week = row.week
 
-            team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-            team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
+            team_A_code = frame.index[row.team_A_id]
+            team_B_code = frame.index[row.team_B_id]
 
-            team_A_score = row[TEAM_A_SCORE]
-            team_B_score = row[TEAM_B_SCORE]
+            team_A_score = row.team_A_score
+            team_B_score = row.team_B_score
 
             if team_A_score > team_B_score:
-                winning_team = team_A_name
-                winning_score = team_A_score
-                winning_seed = ranks[team_A_name]
-                losing_team = team_B_name
-                losing_score = team_B_score
-                losing_seed = ranks[team_B_name]
-
-            else:
-                winning_team = team_B_name
-                winning_score = team_B_score
-                winning_seed = ranks[team_B_name]
-
-                losing_team = team_A_name
-                losing_score = team_A_score
-                losing_seed = ranks[team_A_name]
-
-            if week not in playoffs:
-                playoffs[week] = [{
-                    "winning_team": winning_team,
-                    "winning_score": winning_score,
-                    "winning_seed": winning_seed,
-                    "losing_team": losing_team,
-                    "losing_score": losing_score,
-                    "losing_seed": losing_seed
-                }]
+                winning_code, winning_score = team_A_code, team_A_score
+                losing_code, losing_score = team_B_code, team_B_score
             else:
-                playoffs[week].append({
-                    "winning_team": winning_team,
-                    "winning_score": winning_score,
-                    "winning_seed": winning_seed,
-                    "losing_team": losing_team,
-                    "losing_score": losing_score,
-                    "losing_seed": losing_seed
-                })
+                winning_code, winning_score = team_B_code, team_B_score
+                losing_code, losing_score = team_A_code, team_A_score
+
+            playoffs.setdefault(week, []).append({
+                "winning_id": int(frame.member_ids[winning_code]),
+                "winning_team": frame.names[winning_code],
+                "winning_score": winning_score,
+                "winning_seed": seeds[winning_code],
+                "losing_id": int(frame.member_ids[losing_code]),
+                "losing_team": frame.names[losing_code],
+                "losing_score": losing_score,
+                "losing_seed": seeds[losing_code]
+            })
     return playoffs
 
 
 def get_league_members(query):
-    names = set()
-    for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-        names.add(team_A_name)
-        names.add(team_B_name)
-    names_list = list(names)
-    names_list.sort()
-    return names_list
+    return list(SeasonFrame.of(query).names)
 
 
 def get_standings(query, current_members=[], include_playoffs=False):
-    league_members = get_league_members(query)
-    if league_members == []:
-        league_members = current_members
+    if query:
+        return SeasonFrame.of(query).standings(include_playoffs)
 
     df = pd.DataFrame(
         columns=["Wins", "Losses", "PF", "PA"],
-        index=league_members
+        index=current_members
     ).fillna(0.0)
-
-    if not query:
-        df["Wins"] = 0
-        df["Losses"] = 0
-        df["PF"] = 0.0
-        df["PA"] = 0.0
-
-    else:
-        if not include_playoffs:
-            query = [x for x in query if x[PLAYOFFS] == 0]
-
-        for row in query:
-            team_A_score = row["team_A_score"]
-            team_B_score = row["team_B_score"]
-
-            team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-            team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-
-            winning_team = team_A_name if team_A_score > team_B_score else team_B_name
-
-            df.at[team_A_name, "PF"] += team_A_score
-            df.at[team_A_name, "PA"] += team_B_score
-
-            df.at[team_B_name, "PF"] += team_B_score
-            df.at[team_B_name, "PA"] += team_A_score
-
-            if winning_team == team_A_name:
-                df.at[team_A_name, "Wins"] += 1
-                df.at[team_B_name, "Losses"] += 1
-
-            else:
-                df.at[team_B_name, "Wins"] += 1
-                df.at[team_A_name, "Losses"] += 1
-
-        df = df.sort_values(["Wins", "PF"], ascending=False)
-        df["Wins"] = df["Wins"].astype("int64")
-        df["Losses"] = df["Losses"].astype("int64")
+    df["Wins"] = 0
+    df["Losses"] = 0
+    df["PF"] = 0.0
+    df["PA"] = 0.0
 
     ranks = {}
     i = 1
@@ -199,40 +177,31 @@ def get_standings(query, current_members=[], include_playoffs=False):
     return df, ranks
 
 
-def get_overall_record(query, name):
+def get_overall_record(query, member_id):
     wins, losses, po_wins, po_losses = 0, 0, 0, 0
 
     for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-
-        team_A_score = float(row["team_A_score"])
-        team_B_score = float(row["team_B_score"])
-
-        if team_A_name == name and team_A_score > team_B_score:
-            wins += 1
-            if row["playoffs"] == 1:
-                po_wins += 1
+        if member_id == row.team_A_id:
+            points_for, points_against = row.team_A_score, row.team_B_score
+        elif member_id == row.team_B_id:
+            points_for, points_against = row.team_B_score, row.team_A_score
+        else:
+            continue
 
-        elif team_B_name == name and team_B_score > team_A_score:
+        if points_for > points_against:
             wins += 1
-            if row["playoffs"] == 1:
+            if row.playoffs == 1:
                 po_wins += 1
 
-        elif team_A_name == name and team_A_score < team_B_score:
-            losses += 1
-            if row["playoffs"] == 1:
-                po_losses += 1
-
-        elif team_B_name == name and team_B_score < team_A_score:
+        elif points_for < points_against:
             losses += 1
-            if row["playoffs"] == 1:
+            if row.playoffs == 1:
                 po_losses += 1
 
     return f"{wins}-{losses}", f"{po_wins}-{po_losses}", wins, losses, po_wins, po_losses
 
 
-def get_additional_stats(query, name):
+def get_additional_stats(query, member_id):
     longest_win_streak, current_win_streak = 0, 0
     longest_losing_streak, current_losing_streak = 0, 0
     total_points = 0.0
@@ -242,55 +211,33 @@ def get_additional_stats(query, name):
         fewest_points = 0.0
 
     for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-
-        team_A_score = float(row["team_A_score"])
-        team_B_score = float(row["team_B_score"])
+        if member_id == row.team_A_id:
+            points_for, points_against = row.team_A_score, row.team_B_score
+        elif member_id == row.team_B_id:
+            points_for, points_against = row.team_B_score, row.team_A_score
+        else:
+            continue
 
-        if team_A_name == name and team_A_score > team_B_score:
-            total_points += team_A_score
-            current_win_streak += 1
-            if current_losing_streak > longest_losing_streak:
-                longest_losing_streak = current_losing_streak
-            current_losing_streak = 0
-            if team_A_score > most_points:
-                most_points = team_A_score
-            if team_A_score < fewest_points:
-                fewest_points = team_A_score
+        # A tied game neither extends nor ends a streak, and its points are not counted
+        if points_for == points_against:
+            continue
 
-        elif team_B_name == name and team_B_score > team_A_score:
-            total_points += team_B_score
+        total_points += points_for
+        if points_for > points_against:
             current_win_streak += 1
             if current_losing_streak > longest_losing_streak:
                 longest_losing_streak = current_losing_streak
             current_losing_streak = 0
-            if team_B_score > most_points:
-                most_points = team_B_score
-            if team_B_score < fewest_points:
-                fewest_points = team_B_score
-
-        elif team_A_name == name and team_A_score < team_B_score:
-            total_points += team_A_score
+        else:
             current_losing_streak += 1
             if current_win_streak > longest_win_streak:
                 longest_win_streak = current_win_streak
             current_win_streak = 0
-            if team_A_score > most_points:
-                most_points = team_A_score
-            if team_A_score < fewest_points:
-                fewest_points = team_A_score
 
-        elif team_B_name == name and team_B_score < team_A_score:
-            total_points += team_B_score
-            current_losing_streak += 1
-            if current_win_streak > longest_win_streak:
-                longest_win_streak = current_win_streak
-            current_win_streak = 0
-            if team_B_score > most_points:
-                most_points = team_B_score
-            if team_B_score < fewest_points:
-                fewest_points = team_B_score
+        if points_for > most_points:
+            most_points = points_for
+        if points_for < fewest_points:
+            fewest_points = points_for
 
     if current_win_streak > longest_win_streak:
         longest_win_streak = current_win_streak
@@ -303,8 +250,8 @@ def get_additional_stats(query, name):
 def get_playoff_appearances(query):
     playoffs = set()
     for row in query:
-        if row[PLAYOFFS] == 1:
-            playoffs.add(row[SEASON])
+        if row.playoffs == 1:
+            playoffs.add(row.season)
 
     l = list(sorted(playoffs))
     if len(l) == 0:
@@ -326,71 +273,61 @@ def highlight_winning_rows(s):
         return ['background-color: #ffcccc']*5
 
 
-def get_individual_schedule(query, name):
-    df = pd.DataFrame(
-        columns=["Format", "Opponent", "Result", "Score", "Record"])
+def get_individual_schedule(query, member_id, names):
+    table = TableBuilder(["Format", "Opponent", "Result", "Score", "Record"])
     score, result, format, opponent = None, None, None, None
     wins, losses = 0, 0
 
     for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-
-        team_A_score = float(row["team_A_score"])
-        team_B_score = float(row["team_B_score"])
+        team_A_score = row.team_A_score
+        team_B_score = row.team_B_score
 
         if team_A_score > team_B_score:
             score = f"{team_A_score}-{team_B_score}"
         else:
             score = f"{team_B_score}-{team_A_score}"
 
-        if team_A_name == name and team_A_score > team_B_score:
-            result = "Win"
-            wins += 1
+        if member_id == row.team_A_id:
+            points_for, points_against = team_A_score, team_B_score
+            opponent = names[row.team_B_id]
+        else:
+            points_for, points_against = team_B_score, team_A_score
+            opponent = names[row.team_A_id]
 
-        elif team_B_name == name and team_B_score > team_A_score:
+        # A tie keeps the previous game's result
+        if points_for > points_against:
             result = "Win"
             wins += 1
-
-        elif team_A_name == name and team_A_score < team_B_score:
-            result = "Loss"
-            losses += 1
-        elif team_B_name == name and team_B_score < team_A_score:
+        elif points_for < points_against:
             result = "Loss"
             losses += 1
 
-        if row[PLAYOFFS] == 1:
+        if row.playoffs == 1:
             format = "Playoffs"
         else:
             format = "Regular Season"
 
-        if team_A_name == name:
-            opponent = team_B_name
-        else:
-            opponent = team_A_name
-
         record = f"{wins}-{losses}"
 
-        df.loc[len(df.index)] = [format, opponent, result, score, record]
+        table.append([format, opponent, result, score, record])
 
-    df.index += 1
+    return table.frame(start=1)
 
-    return df
 
+def get_schedules(query, member_id, names):
+    """
+    A styled schedule table for every season of one member's games. names maps
+    each member_id to the name shown for it.
+    """
 
-def get_schedules(query, name):
     split_queries = {}
     for row in query:
-        year = row[SEASON]
-        if year not in split_queries:
-            split_queries[year] = [row]
-        else:
-            split_queries[year].append(row)
+        split_queries.setdefault(row.season, []).append(row)
 
     all_schedules = {}
 
     for key, value in split_queries.items():
-        df = get_individual_schedule(value, name)
+        df = get_individual_schedule(value, member_id, names)
         styled = df.style.apply(highlight_winning_rows, 1)
 
         all_schedules[key] = styled.to_html()
@@ -398,21 +335,12 @@ def get_schedules(query, name):
     return None if all_schedules == {} else all_schedules
 
 
-def get_rank_of_team(standings, name):
-    counter = 1
-    for index, _ in standings.iterrows():
-        if index == name:
-            return counter
-        counter += 1
-    return counter
-
-
 def ordinal(n):
     return "%d%s" % (n, "tsnrhtdd"[(n//10 % 10 != 1)*(n % 10 < 4)*n % 10::4])
 
 
-def get_playoff_finish(playoffs, standings, name):
-    rank = ordinal(get_rank_of_team(standings, name))
+def get_playoff_finish(playoffs, seed, member_id):
+    rank = ordinal(seed)
 
     num_rounds = len(playoffs)
 
@@ -427,24 +355,24 @@ def get_playoff_finish(playoffs, standings, name):
         round = 1
         for _, results in playoffs.items():
             for game in results:
-                if game["losing_team"] == name and round == 1 and num_rounds == 3:
+                if game["losing_id"] == member_id and round == 1 and num_rounds == 3:
                     finish = "Quarterfinals"
-                elif game["losing_team"] == name and round == 1 and num_rounds == 2:
+                elif game["losing_id"] == member_id and round == 1 and num_rounds == 2:
                     finish = "Semifinals"
 
-                elif game["losing_team"] == name and round == 2 and num_rounds == 3:
+                elif game["losing_id"] == member_id and round == 2 and num_rounds == 3:
                     finish = "Semifinals"
 
-                elif game["losing_team"] == name and round == 2 and num_rounds == 2:
+                elif game["losing_id"] == member_id and round == 2 and num_rounds == 2:
                     finish = "Runner up"
 
-                elif game["losing_team"] == name and round == 3 and num_rounds == 3:
+                elif game["losing_id"] == member_id and round == 3 and num_rounds == 3:
                     finish = "Runner up"
 
-                elif game["winning_team"] == name and round == 2 and num_rounds == 2:
+                elif game["winning_id"] == member_id and round == 2 and num_rounds == 2:
                     finish = "Champion"
 
-                elif game["winning_team"] == name and round == 3 and num_rounds == 3:
+                elif game["winning_id"] == member_id and round == 3 and num_rounds == 3:
                     finish = "Champion"
 
             round += 1
@@ -452,53 +380,6 @@ def get_playoff_finish(playoffs, standings, name):
     return rank, finish, playoffs_done
 
 
-def get_summaries(query, name):
-    split_queries = {}
-    for row in query:
-        year = row[SEASON]
-        if year not in split_queries:
-            split_queries[year] = [row]
-        else:
-            split_queries[year].append(row)
-
-    all_seasons = {}
-    all_playoffs = {}
-
-    for key, value in split_queries.items():
-        df, _ = get_standings(value)
-        playoffs = get_playoffs(value)
-        all_seasons[key] = df
-        all_playoffs[key] = playoffs
-
-    df = pd.DataFrame(columns=["Record", "TPF",
-                               "TPA", "Playoffs", "Overall Finish"])
-
-    final_record, tpf, tpa, playoffs, over_finish = None, None, None, None, None
-    for (year, standings), (_, playoffs) in zip(all_seasons.items(), all_playoffs.items()):
-        if name in standings.index.to_list():
-            wins = standings.at[name, "Wins"]
-            losses = standings.at[name, "Losses"]
-            final_record = f"{wins}-{losses}"
-            tpf = standings.at[name, "PF"]
-            tpa = standings.at[name, "PA"]
-            rank, finish, playoffs_done = get_playoff_finish(
-                playoffs, standings, name)
-            if year == CURRENT_SEASON and playoffs_done == False:
-                over_finish = "--"
-                playoffs = "--"
-            else:
-                if finish == "DNQ":
-                    playoffs = "No"
-                    over_finish = rank
-                else:
-                    playoffs = "Yes"
-                    over_finish = finish
-
-            df.loc[year] = [final_record, tpf, tpa, playoffs, over_finish]
-
-    return df
-
-
 def get_championships(summaries: pd.DataFrame, name):
     championships = []
     if name == "Garrett Folbe":
@@ -524,23 +405,25 @@ def get_championships(summaries: pd.DataFrame, name):
         return ret
 
 
-def get_week_results(query, running_games):
-    df = pd.DataFrame(columns=["Winning Team", "Losing Team", "Score"])
-    standings, _ = get_standings(running_games)
-    for row in query:
-        winning_team, losing_team, score = None, None, None
+def get_week_results(query, frame, season, week):
+    """
+    Results of one week's games, each team shown with its record after the week
+    """
+
+    wins, losses, _, _ = frame.totals_as_of(season, week)
+    wins, losses = wins.tolist(), losses.tolist()
 
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_A_score = float(row["team_A_score"])
-        team_A_wins = standings.at[team_A_name, "Wins"]
-        team_A_losses = standings.at[team_A_name, "Losses"]
-        team_A_record = f"({team_A_wins}-{team_A_losses})"
+    table = TableBuilder(["Winning Team", "Losing Team", "Score"])
+    for row in query:
+        team_A_code = frame.index[row.team_A_id]
+        team_A_name = frame.names[team_A_code]
+        team_A_score = row.team_A_score
+        team_A_record = f"({wins[team_A_code]}-{losses[team_A_code]})"
 
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-        team_B_score = float(row["team_B_score"])
-        team_B_wins = standings.at[team_B_name, "Wins"]
-        team_B_losses = standings.at[team_B_name, "Losses"]
-        team_B_record = f"({team_B_wins}-{team_B_losses})"
+        team_B_code = frame.index[row.team_B_id]
+        team_B_name = frame.names[team_B_code]
+        team_B_score = row.team_B_score
+        team_B_record = f"({wins[team_B_code]}-{losses[team_B_code]})"
 
         if team_A_score > team_B_score:
             winning_team = f"{team_A_name} {team_A_record}"
@@ -551,38 +434,27 @@ def get_week_results(query, running_games):
             losing_team = f"{team_A_name} {team_A_record}"
             score = f"{team_B_score}-{team_A_score}"
 
-        df.loc[len(df.index)] = [winning_team, losing_team, score]
-    df.index += 1
-    return df
+        table.append([winning_team, losing_team, score])
 
+    return table.frame(start=1)
 
-def get_running_games(query, week):
+
+def get_all_week_results(query):
     """
-    This function is used to gather all games played up to the given week
-    We can then use this subset of games to calculate the standings at
-    the time of the game, which is used when displaying regular season results
+    The results of every regular season week, as HTML tables keyed on week.
+    Records come from the cumulative standings, so this is one pass over the season
+    rather than a set of standings per week.
     """
-    subset = []
-    for row in query:
-        if row[WEEK] <= week:
-            subset.append(row)
-    return subset
-
 
-def get_all_week_results(query):
     split_query = {}
     for row in query:
-        if row[PLAYOFFS] == 0:
-            week = row[WEEK]
-            if week not in split_query:
-                split_query[week] = [row]
-            else:
-                split_query[week].append(row)
+        if row.playoffs == 0:
+            split_query.setdefault((row.season, row.week), []).append(row)
 
+    frame = SeasonFrame.of(query)
     all_weeks = {}
-    for week_number, results in split_query.items():
-        subset = get_running_games(query, week_number)
-        df = get_week_results(results, subset)
+    for (season, week_number), results in split_query.items():
+        df = get_week_results(results, frame, season, week_number)
         df_html = df.to_html(classes="table-sm table-striped")
         all_weeks[week_number] = df_html
 
@@ -590,8 +462,6 @@ def get_all_week_results(query):
 
 
 def get_playoff_results_for_season_summary(query, num_playoff_teams):
-    df = pd.DataFrame(columns=["Winning Team", "Losing Team", "Score"])
-
     playoffs_raw = get_playoffs(query)
     if not playoffs_raw:
         return None
@@ -617,75 +487,52 @@ def get_playoff_results_for_season_summary(query, num_playoff_teams):
 
     all_playoff_weeks = {}
     for week, results in playoffs_raw.items():
-        df = pd.DataFrame(columns=["Winning Team", "Losing Team", "Score"])
+        table = TableBuilder(["Winning Team", "Losing Team", "Score"])
         for game in results:
             winning_team = f"#{game['winning_seed']} {game['winning_team']}"
             losing_team = f"#{game['losing_seed']} {game['losing_team']}"
             score = f"{game['winning_score']}-{game['losing_score']}"
-            df.loc[len(df.index)] = [winning_team, losing_team, score]
+            table.append([winning_team, losing_team, score])
 
-        df.index += 1
-        all_playoff_weeks[playoff_round_names[week]] = df.to_html(
-            classes="table-sm table-striped")
+        all_playoff_weeks[playoff_round_names[week]] = table.to_html(
+            start=1, classes="table-sm table-striped")
 
     return all_playoff_weeks
 
 
 def gen_points_df(query, current_members=[]):
-    league_members = get_league_members(query)
-    if not league_members:
-        league_members = current_members
-
-    points_df = pd.DataFrame(index=league_members)
-    weeks = set()
-    for row in query:
-        if row[PLAYOFFS] == 0:
-            week = row[WEEK]
-            key = f"Week {week}"
-
-            if key not in weeks:
-                points_df[key] = 0.0
-                weeks.add(key)
-
-            team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-            team_A_score = row[TEAM_A_SCORE]
-            points_df.at[team_A_name, key] = team_A_score
+    if not query:
+        return pd.DataFrame(index=current_members)
 
-            team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-            team_B_score = row[TEAM_B_SCORE]
-            points_df.at[team_B_name, key] = team_B_score
-    return points_df
+    frame = SeasonFrame.of(query)
+    weeks, scores = frame.score_matrix()
+    return pd.DataFrame(scores.T, index=frame.names,
+                        columns=[f"Week {week}" for week in weeks.tolist()], copy=True)
 
 
 def get_roto(query, current_members=[]):
-    points_df = gen_points_df(query)
-    standings, _ = get_standings(query)
+    if not query:
+        roto_df = pd.DataFrame(index=current_members, columns=["Total", "PF"])
+        roto_df["PF"] = 0.0
+        roto_df["Total"] = 0
+        return roto_df
 
-    league_members = get_league_members(query)
-    if league_members == []:
-        league_members = current_members
-        columns = ["Total", "PF"]
-    else:
-        columns = points_df.columns.to_list()
+    frame = SeasonFrame.of(query)
+    weeks, roto = frame.roto_matrix()
 
-    roto_df = pd.DataFrame(index=league_members,
-                           columns=columns)
+    roto_df = pd.DataFrame(roto.T, index=frame.names,
+                           columns=[f"Week {week}" for week in weeks.tolist()], copy=True)
     roto_df["PF"] = 0.0
     roto_df["Total"] = 0
 
-    if not points_df.empty:
-        for key in (points_df.columns.to_list()):
-            points_temp = points_df.sort_values([key], ascending=True)
-            for i in range(len(league_members)):
-                member = points_temp.index.to_list()[i]
-                roto_df[key][member] = i
-
-        roto_df["Total"] = roto_df.iloc[:, :].sum(axis=1)
-        standings, _ = get_standings(query)
-        roto_df["PF"] = standings["PF"]
+    if len(weeks):
+        total = roto.sum(axis=0)
+        points_for = frame.totals(frame.games())[2]
+        order = np.lexsort((-points_for, -total))
 
-        roto_df = roto_df.sort_values(["Total", "PF"], ascending=False)
-        roto_df["Total"] = roto_df["Total"].astype("int64")
+        roto_df["PF"] = points_for
+        roto_df["Total"] = total
+        roto_df = roto_df.iloc[order]
 
     return roto_df
 
@@ -724,31 +571,25 @@ def get_projected_playoff_teams(standings: pd.DataFrame, ranks, roto: pd.DataFra
 def get_highest_score_from_week(scores):
     highest_score = 0
     member = ""
-    for name, score in scores.items():
+    for member_id, score in scores.items():
         if score > highest_score:
             highest_score = score
-            member = name
+            member = member_id
     return member, highest_score
 
 
 def get_week_winners(query, num_weeks):
     split_weeks = {}
     for row in query:
-        week = row[WEEK]
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-        if week not in split_weeks:
-            split_weeks[week] = {
-                team_A_name: row[TEAM_A_SCORE],
-                team_B_name: row[TEAM_B_SCORE]
-            }
-        else:
-            split_weeks[week][team_A_name] = row[TEAM_A_SCORE]
-            split_weeks[week][team_B_name] = row[TEAM_B_SCORE]
+        scores = split_weeks.setdefault(row.week, {})
+        scores[row.team_A_id] = row.team_A_score
+        scores[row.team_B_id] = row.team_B_score
 
+    frame = SeasonFrame.of(query)
     week_winners = []
     for week, value in split_weeks.items():
-        week_winners.append(get_highest_score_from_week(value))
+        member_id, score = get_highest_score_from_week(value)
+        week_winners.append((frame.name(member_id) if member_id != "" else "", score))
     while len(week_winners) < num_weeks:
         week_winners.append(("--", "--"))
 
@@ -756,49 +597,26 @@ def get_week_winners(query, num_weeks):
 
 
 def get_overall_highest(query):
-    high_score, member = 0, ""
+    high_score, member_id = 0, None
     for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_A_score = row[TEAM_A_SCORE]
-
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-        team_B_score = row[TEAM_B_SCORE]
+        if row.team_A_score > high_score:
+            high_score = row.team_A_score
+            member_id = row.team_A_id
 
-        if team_A_score > high_score:
-            high_score = team_A_score
-            member = team_A_name
-
-        if team_B_score > high_score:
-            high_score = team_B_score
-            member = team_B_name
-
-    return member, high_score
-
-
-def get_league_schedules(query):
-    schedules_dict = {}
-    for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
+        if row.team_B_score > high_score:
+            high_score = row.team_B_score
+            member_id = row.team_B_id
 
-        if team_A_name not in schedules_dict:
-            schedules_dict[team_A_name] = [team_B_name]
-        else:
-            schedules_dict[team_A_name].append(team_B_name)
+    if member_id is None:
+        return "", high_score
+    return SeasonFrame.of(query).name(member_id), high_score
 
-        if team_B_name not in schedules_dict:
-            schedules_dict[team_B_name] = [team_A_name]
-        else:
-            schedules_dict[team_B_name].append(team_A_name)
-    schedules_df = pd.DataFrame(schedules_dict)
-    schedules_df["weeks"] = [f"Week {i + 1}" for i in range(len(schedules_df))]
-    schedules_df = schedules_df.set_index(["weeks"])
-    return schedules_df
 
-        
-def get_roto_against(query, current_member_names):
-    roto_df = get_roto(query, current_member_names)
-    rows = get_league_members(query)
+def get_roto_against(query, current_member_names, roto=None, standings=None):
+    """
+    Strength of schedule: the roto points of each team's opponent every week.
+    Pass the season's roto and standings if they have already been computed.
+    """
 
     if not query:
         roto_against = pd.DataFrame(
@@ -807,134 +625,102 @@ def get_roto_against(query, current_member_names):
         roto_against["PA"] = 0.0
         return roto_against
 
-    else:
-        schedules = get_league_schedules(query)
+    frame = SeasonFrame.of(query)
+    weeks, _ = frame.score_matrix()
+    columns = [f"Week {week}" for week in weeks.tolist()]
 
-        # Drop the "Total" and "TPF" Columns
-        columns = list(roto_df.columns)[:-2]
-        rows = get_league_members(query)
+    if roto is None:
+        _, roto_points = frame.roto_matrix()
+    else:
+        roto_points = roto.loc[frame.names, columns].to_numpy(dtype=np.int64).T
 
-        roto_against = pd.DataFrame(columns=columns, index=rows)
+    if standings is None:
+        points_against = frame.totals(frame.games())[3]
+    else:
+        points_against = standings["PA"].reindex(frame.names).to_numpy()
 
-        for row in rows:
-            for i in range(len(columns)):
-                key = "Week " + str(i + 1)
-                opponent = schedules.loc[key, row]
-                roto_against.loc[row, key] = roto_df.loc[opponent, key]
+    # R[week, opp[week, team]], nothing for a week without a game
+    opponents = frame.opponent_matrix()
+    against = np.where(opponents >= 0,
+                       np.take_along_axis(roto_points, np.maximum(opponents, 0), axis=1), 0)
+    total = against.sum(axis=0)
+    order = np.lexsort((-points_against, -total))
 
-        roto_against["Total"] = roto_against.iloc[:, :].sum(axis=1)
-        roto_against["PA"] = get_standings(query)[0]["PA"]
-        roto_against = roto_against.sort_values(
-            ["Total", "PA"], ascending=False)
-        roto_against = roto_against.convert_dtypes({"Total": "int64"})
-        return roto_against
+    roto_against = pd.DataFrame(against.T[order], index=[frame.names[i] for i in order.tolist()],
+                                columns=columns)
+    roto_against["Total"] = total[order]
+    roto_against["PA"] = points_against[order]
+    return roto_against.convert_dtypes()
 
 
 def get_head_to_head(query, current_members=[]):
-    league_members = get_league_members(query)
     if not query:
-        league_members = current_members
-        head2head = pd.DataFrame(columns=league_members, index=league_members)
+        head2head = pd.DataFrame(columns=current_members, index=current_members)
+        head2head.fillna("0-0", inplace=True)
+        return head2head
 
-    else:
-        points = gen_points_df(query)
-
-        head2head = pd.DataFrame(columns=league_members, index=league_members)
-        for a in league_members:
-            for b in league_members:
-                if a == b:
-                    head2head[b][a] = "--"
-                else:
-                    wins = 0
-                    losses = 0
-                    for col in points.columns:
-                        if points[col][a] > points[col][b]:
-                            wins += 1
-                        else:
-                            losses += 1
-                    head2head[b][a] = str(wins) + "-" + str(losses)
-
-    head2head.fillna("0-0", inplace=True)
-    return head2head
+    frame = SeasonFrame.of(query)
+    wins, games = frame.all_play()
+    return format_head_to_head(frame.names, wins, games)
 
 
-def gen_wins_and_losses(query):
-    wins_losses_dict = {}
-    for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_A_score = row[TEAM_A_SCORE]
+def format_head_to_head(names, wins, games):
+    """
+    Render all-play win counts as "W-L" strings, the row team's record against the
+    column team
+    """
 
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-        team_B_score = row[TEAM_B_SCORE]
+    head2head = format_records(names, names, wins, games - wins)
+    for i, name in enumerate(names):
+        head2head.iat[i, i] = "--"
+    return head2head
 
-        team_A_result = "W" if team_A_score > team_B_score else "L"
-        team_B_result = "W" if team_B_score > team_A_score else "L"
 
-        if team_A_name not in wins_losses_dict:
-            wins_losses_dict[team_A_name] = [team_A_result]
-        else:
-            wins_losses_dict[team_A_name].append(team_A_result)
+def get_scoring_tier_labels(league_size, num_tiers=NUM_SCORING_TIERS):
+    """
+    Return the column names of the scoring bands, highest band first. A band holds
+    the places whose roto points r give (r * num_tiers) // league_size == band.
+    """
 
-        if team_B_name not in wins_losses_dict:
-            wins_losses_dict[team_B_name] = [team_B_result]
+    league_size = max(league_size, num_tiers)
+    places = [[] for _ in range(num_tiers)]
+    for roto_points in range(league_size):
+        places[(roto_points * num_tiers) // league_size].append(league_size - roto_points)
+
+    labels = []
+    for tier in reversed(range(num_tiers)):
+        best, worst = min(places[tier]), max(places[tier])
+        if tier == num_tiers - 1:
+            labels.append(f"Top {worst} Scorer")
+        elif tier == 0:
+            labels.append(f"Bottom {len(places[tier])} Scorer")
+        elif best == worst:
+            labels.append(f"Scored {ordinal(best)}")
         else:
-            wins_losses_dict[team_B_name].append(team_B_result)
-
-    wins_losses_df = pd.DataFrame(wins_losses_dict)
-    wins_losses_df["Week"] = [
-        f"Week {i + 1}" for i in range(len(wins_losses_df.index))]
-    wins_losses_df = wins_losses_df.set_index(["Week"])
-    return wins_losses_df
-
-
-def update_interval(member, roto_points, result, intervals):
-    column = "Top 3 Scorer"
-    if roto_points <= 2:
-        column = "Bottom 3 Scorer"
-    elif roto_points <= 5:
-        column = "Scored 7th-9th"
-    elif roto_points <= 8:
-        column = "Scored 4th-6th"
-
-    record = intervals.loc[member, column]
-    wins, losses = record.split("-")
-
-    if result == "W":
-        new_wins = str(int(wins) + 1)
-        new_losses = losses
-    else:
-        new_wins = wins
-        new_losses = str(int(losses) + 1)
-    intervals.loc[member, column] = f"{new_wins}-{new_losses}"
-    return intervals
+            labels.append(f"Scored {ordinal(best)}-{ordinal(worst)}")
+    return labels
 
 
-def get_intervals(query, current_members=[]):
-    league_members = get_league_members(query)
-    columns = ["Top 3 Scorer", "Scored 4th-6th",
-               "Scored 7th-9th", "Bottom 3 Scorer"]
-
+def get_intervals(query, current_members=[], num_tiers=NUM_SCORING_TIERS):
     if not query:
-        league_members = current_members
+        columns = get_scoring_tier_labels(len(current_members), num_tiers)
+        intervals = pd.DataFrame(columns=columns, index=current_members)
+        return intervals.fillna("0-0")
 
-    intervals = pd.DataFrame(columns=columns, index=league_members)
-    intervals = intervals.fillna("0-0")
+    frame = SeasonFrame.of(query)
+    wins, losses = frame.tier_records(num_tiers)
+    return format_records(frame.names, get_scoring_tier_labels(frame.league_size(), num_tiers),
+                          wins[:, ::-1], losses[:, ::-1])
 
-    if not query:
-        return intervals
 
-    else:
-        roto = get_roto(query)
-        wins_and_losses = gen_wins_and_losses(query)
-
-        for member in league_members:
-            for week in roto.columns[:-2]:
-                roto_points = roto.loc[member, week]
-                result = wins_and_losses.loc[week, member]
-                intervals = update_interval(
-                    member, roto_points, result, intervals)
+def format_records(index, columns, wins, losses):
+    """
+    Render matching win and loss count matrices as "W-L" strings
+    """
 
-        return intervals
+    cells = [[f"{w}-{l}" for w, l in zip(win_row, loss_row)]
+             for win_row, loss_row in zip(wins.tolist(), losses.tolist())]
+    return pd.DataFrame(cells, index=index, columns=columns)
 
 
 def parse_rankings_filename(filename):
@@ -947,29 +733,6 @@ def parse_rankings_filename(filename):
     return week
 
 
-def load_power_rankings(filename):
-    data = json.load(open(filename, "r"))
-    info = OrderedDict()
-    for index, member in enumerate(data["rankings"]):
-        info[member] = {
-            "rank": index + 1,
-            "change": 0
-        }
-    return info
-
-
-def get_power_rankings_infos(filenames, week):
-    for index, filename in enumerate(filenames):
-        if week == parse_rankings_filename(filename):
-            current_data = load_power_rankings(filename)
-            if index == 0:
-                previous_data = None
-            else:
-                previous_data = load_power_rankings(filenames[index - 1])
-
-    return current_data, previous_data
-
-
 def get_top_roto_scorers(tracker, roto_in: pd.DataFrame):
     columns = list(roto_in.columns)[:-2]
     for column in columns:
@@ -1014,182 +777,225 @@ def get_top_three(input):
     return record_holders
 
 
-def hall_of_fame_helper(query):
-    most_points_all_time = []
-    most_points_single_season_excl_playoffs = []
-    most_ppg_all_time = []
-    most_appearances_overall = []
-    highest_win_percentage_overall = []
-    most_wins_overall = []
-    most_wins_single_season_excl_playoffs = []
-    most_wins_single_season_incl_playoffs = []
-    most_playoff_wins = []
-    longest_win_streak = []
-    most_roto_points_all_time = []
-    most_top_scoring_weeks = []
-
-    league_members = get_league_members(query)
-    wins_dict = {member : 0 for member in league_members}
-
-    for member in league_members:
-        _, _, wins, _, po_wins, _ = get_overall_record(query, member)
-
-        most_wins_overall.append(Record(member, wins))
-        most_playoff_wins.append(Record(member, po_wins))
-        wins_dict[member] = wins
-
-    points_dict = {member : 0 for member in league_members}
-    streak_dict = {member : 0 for member in league_members}
-    appearance_dict = {member : 0 for member in league_members}
-    
-    winning_team, losing_team = '', ''
-    for row in query:
-        team_A_name = f"{row['team_A_first_name']} {row['team_A_last_name']}"
-        team_B_name = f"{row['team_B_first_name']} {row['team_B_last_name']}"
-
-        team_A_score = row[TEAM_A_SCORE]
-        team_B_score = row[TEAM_B_SCORE]
-        
-        points_dict[team_A_name] += team_A_score
-        points_dict[team_B_name] += team_B_score
-        
-        appearance_dict[team_A_name] += 1
-        appearance_dict[team_B_name] += 1
+class SeasonRecords(object):
+    """
+    Accumulators for one season of a LeagueRecords sweep
+    """
 
-        if team_A_score > team_B_score:
-            winning_team = team_A_name
-            losing_team = team_B_name
+    def __init__(self, season):
+        self.season = season
+        # member_id -> [wins, losses, PF] with and without the playoffs
+        self.totals = {}
+        self.regular = {}
+        # week -> {member_id: score}, in the order the weeks were played
+        self.weeks = {}
+        self.final_week = None
+        self.final_week_winners = []
+
+    def add(self, member_id, won, points, playoffs, week):
+        for totals, counts in ((self.totals, True), (self.regular, not playoffs)):
+            if member_id not in totals:
+                totals[member_id] = [0, 0, 0.0]
+            if counts:
+                totals[member_id][0 if won else 1] += 1
+                totals[member_id][2] += points
+
+        if not playoffs:
+            self.weeks.setdefault(week, {})[member_id] = points
+
+
+class LeagueRecords(object):
+    """
+    Every Hall of Fame category, computed in a single pass over a season sorted
+    stream of games. Feed it games with add_game (or pass them all to the
+    constructor), then read the results with hall_of_fame(). Everything is keyed
+    on member_id, names are only attached to the results.
+    """
 
+    def __init__(self, query=()):
+        self.names = {}
+
+        # All time, per member
+        self.points = {}
+        self.appearances = {}
+        self.wins = {}
+        self.playoff_wins = {}
+        self.streaks = {}
+
+        # (member_id, streak) for every losing team at the moment its streak ended
+        self.ended_streaks = []
+
+        # Built as each season closes, lists of ((member_id, season), value)
+        self.season = None
+        self.wins_single_season_incl_playoffs = []
+        self.wins_single_season_excl_playoffs = []
+        self.points_single_season_excl_playoffs = []
+        self.ppg = {}
+        self.roto_points = {}
+        self.top_scoring_weeks = {}
+        self.champions = {}
+
+        for row in query:
+            self.add_game(row)
+
+    def add_member(self, member_id, first_name, last_name):
+        self.names[member_id] = f"{first_name} {last_name}"
+        self.points[member_id] = 0.0
+        self.appearances[member_id] = 0
+        self.wins[member_id] = 0
+        self.playoff_wins[member_id] = 0
+        self.streaks[member_id] = 0
+
+    def add_game(self, row):
+        team_A_id = row.team_A_id
+        team_B_id = row.team_B_id
+        team_A_score = row.team_A_score
+        team_B_score = row.team_B_score
+        playoffs = row.playoffs == 1
+        week = row.week
+
+        if self.season is None or row.season != self.season.season:
+            self.close_season()
+            self.season = SeasonRecords(row.season)
+
+        if team_A_id not in self.names:
+            self.add_member(team_A_id, row.team_A_first_name, row.team_A_last_name)
+        if team_B_id not in self.names:
+            self.add_member(team_B_id, row.team_B_first_name, row.team_B_last_name)
+
+        self.points[team_A_id] += team_A_score
+        self.points[team_B_id] += team_B_score
+        self.appearances[team_A_id] += 1
+        self.appearances[team_B_id] += 1
+
+        # A tied game counts as a win for neither team in the overall record...
+        if team_A_score != team_B_score:
+            winner = team_A_id if team_A_score > team_B_score else team_B_id
+            self.wins[winner] += 1
+            if playoffs:
+                self.playoff_wins[winner] += 1
+
+        # ...but as a win for team B everywhere else, as get_standings does
+        if team_A_score > team_B_score:
+            winning_team, losing_team = team_A_id, team_B_id
         else:
-            winning_team = team_B_name
-            losing_team = team_A_name
-            
-        longest_win_streak.append(Record(losing_team, streak_dict[losing_team]))
-        streak_dict[winning_team] += 1        
-        streak_dict[losing_team] = 0
-
-    for name, points in points_dict.items():
-        most_points_all_time.append(Record(name, round(points, 2)))  
-    
-    for name, streak in streak_dict.items():
-        longest_win_streak.append(Record(name, streak))   
-        
-    for name, appearances in appearance_dict.items():
-        most_appearances_overall.append(Record(name, appearances))
-        
-    for name in league_members:
-        highest_win_percentage_overall.append(Record(
-            name,
-            f"{round(100 * wins_dict[name] / appearance_dict[name], 2)}%"
-        ))        
-        
-    
-    split_seasons_query = {}
-    for row in query:
-        year = row[SEASON]
-        if year not in split_seasons_query:
-            split_seasons_query[year] = [row]
-        else:
-            split_seasons_query[year].append(row)
+            winning_team, losing_team = team_B_id, team_A_id
 
-    ppg_helper = {}
-    all_time_roto_helper = {}
-    roto_top_scorer_helper = {}
-    champions = {2015: "Garrett Folbe",
-                 2016: "Jonah Lopas"}
+        self.ended_streaks.append((losing_team, self.streaks[losing_team]))
+        self.streaks[winning_team] += 1
+        self.streaks[losing_team] = 0
 
-    for key, value in split_seasons_query.items():
-        standings_playoffs, _ = get_standings(value, include_playoffs=True)
-        standings_reg, _ = get_standings(value)
-        roto = get_roto(value)
+        season = self.season
+        season.add(team_A_id, winning_team == team_A_id, team_A_score, playoffs, week)
+        season.add(team_B_id, winning_team == team_B_id, team_B_score, playoffs, week)
 
-        playoffs = get_playoffs(value)
         if playoffs:
-            playoff_weeks = list(playoffs.keys())
-            playoff_weeks.sort()
-            champ_week = playoff_weeks[-1]
-            if len(playoffs[champ_week]) == 1:
-                champions[key] = playoffs[champ_week][0]["winning_team"]
-
-        for index, row in standings_playoffs.iterrows():
-            most_wins_single_season_incl_playoffs.append(
-                Record(f"{index} ({key})", int(row["Wins"])))
-
-            if index not in ppg_helper:
-                ppg_helper[index] = {
-                    "Total": row["PF"],
-                    "Games": row["Wins"] + row["Losses"]
-                }
-            else:
-                ppg_helper[index]["Total"] += row["PF"]
-                ppg_helper[index]["Games"] += (row["Wins"] + row["Losses"])
-
-        for index, row in standings_reg.iterrows():
-            most_wins_single_season_excl_playoffs.append(
-                Record(f"{index} ({key})", int(row["Wins"])))
-            most_points_single_season_excl_playoffs.append(
-                Record(f"{index} ({key})", round(row["PF"], 2))
-            )
-
-        for index, row in roto.iterrows():
-            if index not in all_time_roto_helper:
-                all_time_roto_helper[index] = row["Total"]
-            else:
-                all_time_roto_helper[index] += row["Total"]
-
-        roto_top_scorer_helper = get_top_roto_scorers(
-            roto_top_scorer_helper, roto)
-
-    for key, value in all_time_roto_helper.items():
-        most_roto_points_all_time.append(Record(f"{key}", int(value)))
-
-    for key, value in ppg_helper.items():
-        most_ppg_all_time.append(Record(f"{key}", round(
-            value["Total"] / value["Games"], 2)))
-
-    for key, value in roto_top_scorer_helper.items():
-        most_top_scoring_weeks.append(Record(f"{key}", int(value)))
-
-    top_3_most_points_all_time = get_top_three(most_points_all_time)
-
-    top_3_most_points_single_season_excl_playoffs = get_top_three(
-        most_points_single_season_excl_playoffs)
-
-    top_3_most_ppg_all_time = get_top_three(most_ppg_all_time)
-    
-    top_3_most_appearances_overall = get_top_three(most_appearances_overall)
-
-    top_3_most_wins_overall = get_top_three(most_wins_overall)
-    
-    top_3_win_percentage_overall = get_top_three(highest_win_percentage_overall)
-
-    top_3_most_wins_single_season_excl_playoffs = get_top_three(
-        most_wins_single_season_excl_playoffs)
-
-    top_3_most_wins_single_season_incl_playoffs = get_top_three(
-        most_wins_single_season_incl_playoffs)
-
-    top_3_most_playoff_wins = get_top_three(most_playoff_wins)
-
-    top_3_longest_win_streak = get_top_three(longest_win_streak)
-
-    top_3_most_roto_points_all_time = get_top_three(most_roto_points_all_time)
+            if season.final_week is None or week > season.final_week:
+                season.final_week = week
+                season.final_week_winners = []
+            if week == season.final_week:
+                season.final_week_winners.append(winning_team)
+
+    def by_name(self, member_ids):
+        return sorted(member_ids, key=self.names.__getitem__)
+
+    def close_season(self):
+        season = self.season
+        if season is None:
+            return
+        self.season = None
+        year = season.season
+        members = self.by_name(season.totals)
+
+        # Standings order: wins, then points, then alphabetical
+        for member_id in sorted(members, key=lambda m: (-season.totals[m][0], -season.totals[m][2])):
+            wins, losses, points = season.totals[member_id]
+            self.wins_single_season_incl_playoffs.append(((member_id, year), wins))
+            if member_id not in self.ppg:
+                self.ppg[member_id] = [0.0, 0]
+            self.ppg[member_id][0] += points
+            self.ppg[member_id][1] += wins + losses
+
+        for member_id in sorted(members, key=lambda m: (-season.regular[m][0], -season.regular[m][2])):
+            wins, _, points = season.regular[member_id]
+            self.wins_single_season_excl_playoffs.append(((member_id, year), wins))
+            self.points_single_season_excl_playoffs.append(((member_id, year), round(points, 2)))
+
+        if season.weeks:
+            scores = np.array([[week.get(member_id, 0.0) for member_id in members]
+                               for week in season.weeks.values()])
+            roto = roto_ranks(scores)
+            totals = roto.sum(axis=0).tolist()
+            order = sorted(range(len(members)),
+                           key=lambda i: (-totals[i], -season.regular[members[i]][2]))
+
+            # Ties for the top score go to whoever is higher in the roto standings
+            for week in roto.tolist():
+                best = max(week)
+                winner = members[next(i for i in order if week[i] == best)]
+                self.top_scoring_weeks[winner] = self.top_scoring_weeks.get(winner, 0) + 1
+        else:
+            totals = [0] * len(members)
+            order = range(len(members))
+
+        for i in order:
+            self.roto_points[members[i]] = self.roto_points.get(members[i], 0) + totals[i]
+
+        if len(season.final_week_winners) == 1:
+            self.champions[year] = season.final_week_winners[0]
+
+    def hall_of_fame(self):
+        """
+        Return the top three of every category, in the order hall_of_fame expects
+        """
+
+        self.close_season()
+        names = self.names
+        league_members = self.by_name(self.names)
+
+        def records(values):
+            return [Record(names[member_id], value) for member_id, value in values]
+
+        def season_records(values):
+            return [Record(f"{names[member_id]} ({year})", value)
+                    for (member_id, year), value in values]
+
+        most_points_all_time = [Record(names[m], round(self.points[m], 2)) for m in league_members]
+        most_appearances_overall = [Record(names[m], self.appearances[m]) for m in league_members]
+        most_wins_overall = [Record(names[m], self.wins[m]) for m in league_members]
+        most_playoff_wins = [Record(names[m], self.playoff_wins[m]) for m in league_members]
+        highest_win_percentage_overall = [
+            Record(names[m], f"{round(100 * self.wins[m] / self.appearances[m], 2)}%")
+            for m in league_members]
+        longest_win_streak = records(self.ended_streaks) + \
+            [Record(names[m], self.streaks[m]) for m in league_members]
+        most_ppg_all_time = [Record(names[m], round(total / games, 2))
+                             for m, (total, games) in self.ppg.items()]
+        most_roto_points_all_time = [Record(names[m], int(total))
+                                     for m, total in self.roto_points.items()]
+        most_top_scoring_weeks = records(self.top_scoring_weeks.items())
+
+        champions = {2015: "Garrett Folbe",
+                     2016: "Jonah Lopas"}
+        champions.update((year, names[m]) for year, m in self.champions.items())
+
+        return get_top_three(most_points_all_time), \
+            get_top_three(season_records(self.points_single_season_excl_playoffs)), \
+            get_top_three(most_ppg_all_time), \
+            get_top_three(most_appearances_overall), \
+            get_top_three(most_wins_overall), \
+            get_top_three(highest_win_percentage_overall), \
+            get_top_three(season_records(self.wins_single_season_excl_playoffs)), \
+            get_top_three(season_records(self.wins_single_season_incl_playoffs)), \
+            get_top_three(most_playoff_wins), \
+            get_top_three(longest_win_streak), \
+            get_top_three(most_roto_points_all_time), \
+            get_top_three(most_top_scoring_weeks), \
+            champions
 
-    top_3_most_top_scoring_weeks = get_top_three(most_top_scoring_weeks)
 
-    return top_3_most_points_all_time, \
-        top_3_most_points_single_season_excl_playoffs, \
-        top_3_most_ppg_all_time, \
-        top_3_most_appearances_overall, \
-        top_3_most_wins_overall, \
-        top_3_win_percentage_overall, \
-        top_3_most_wins_single_season_excl_playoffs, \
-        top_3_most_wins_single_season_incl_playoffs, \
-        top_3_most_playoff_wins, \
-        top_3_longest_win_streak, \
-        top_3_most_roto_points_all_time, \
-        top_3_most_top_scoring_weeks, \
-        champions
+def hall_of_fame_helper(query):
+    return LeagueRecords(query).hall_of_fame()
 
 
 def parse_jarrett_report_filename(file_name):
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import threading
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+from ff_website.constants import *
+
+"""
+Conditional GET for the archive pages and the JSON APIs. Each decorated view has a
+validator that returns the version of everything the response is built from (the
+data and member generations, the templates, the viewer) without running the view.
+If the browser already holds that version it gets a 304 before any pandas work.
+"""
+
+
+# Every page shows the logged in user in the navbar, so pages are only ever cached
+# by the browser, and revalidated on every view so a login or logout shows at once.
+# Pages that haven't changed, frozen seasons above all, cost a 304.
+LIVE_CACHE_CONTROL = "private, no-cache"
+API_CACHE_CONTROL = "public, max-age=60"
+
+_template_version = None
+_template_version_lock = threading.Lock()
+
+
+def template_version():
+    """
+    Return a hash of every template, computed once per process since templates
+    only change with a deploy
+    """
+
+    global _template_version
+
+    if _template_version is None:
+        with _template_version_lock:
+            if _template_version is None:
+                digest = hashlib.sha1()
+                folder = os.path.join(current_app.root_path, current_app.template_folder)
+                for root, dirs, files in sorted(os.walk(folder)):
+                    dirs.sort()
+                    for filename in sorted(files):
+                        path = os.path.join(root, filename)
+                        digest.update(os.path.relpath(path, folder).encode())
+                        with open(path, "rb") as f:
+                            digest.update(f.read())
+                _template_version = digest.hexdigest()
+    return _template_version
+
+
+def page_version(*parts):
+    """
+    Return the version of an HTML page built from parts, for the logged in user
+    the navbar shows
+    """
+
+    return (template_version(), current_user.get_id()) + parts
+
+
+def make_etag(version):
+    return hashlib.sha1(repr((request.full_path, version)).encode()).hexdigest()
+
+
+def conditional(validator):
+    """
+    Answer a GET with 304 when If-None-Match holds the current ETag, otherwise run
+    the view and tag its response. validator takes the view's arguments and
+    returns (version, Cache-Control header).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            # Flashed messages are shown once, so those responses are never reused
+            if request.method not in ("GET", "HEAD") or "_flashes" in session:
+                return view(*args, **kwargs)
+
+            version, cache_control = validator(*args, **kwargs)
+            etag = make_etag(version)
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = cache_control
+            return response
+        return wrapped
+    return decorator
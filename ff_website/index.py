@@ -1,13 +1,13 @@
-import glob
 import json
 import os
 import requests
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
 import inflect
 import pandas as pd
-from flask import flash, jsonify, redirect, render_template, request, url_for, send_file
+from flask import abort, flash, jsonify, redirect, render_template, request, url_for, send_file
 from flask_login import (UserMixin, current_user, login_required, login_user,
                          logout_user)
 from PIL import Image
@@ -15,16 +15,30 @@ from pytz import timezone
 
 from werkzeug.utils import secure_filename
 
-from ff_website import app, bcrypt
-from ff_website.apis import get_member_id
+from ff_website import app, bcrypt, csrf
 from ff_website.constants import *
 from ff_website.credentials import accepted_admins, cookies
-from ff_website.db import close_db, get_db
-from ff_website.forms import (CreateGame, CreateMember, CreatePowerRankings,
-                              GameQualities, HeadToHead, JarrettReport,
-                              LoginForm, MakeAnnouncement, RegistrationForm,
-                              SeasonSelector, SelectPowerRankWeek, changePassword)
+from ff_website.db import (close_db, get_db, get_frozen_seasons, get_pool,
+                            next_game_id)
+from ff_website.forms import (AllPlaySelector, CreateGame, CreateMember,
+                              CreatePowerRankings, GameQualities, HeadToHead,
+                              JarrettReport, LoginForm, MakeAnnouncement,
+                              RegistrationForm, SeasonSelector,
+                              SelectPowerRankWeek, changePassword)
+from ff_website.fragments import (cached_fragment, get_data_generation,
+                                  get_fragment_cache)
 from ff_website.helper_functions import *
+from ff_website.http_cache import (API_CACHE_CONTROL, LIVE_CACHE_CONTROL, conditional,
+                                   page_version)
+from ff_website.members import get_generation, get_member_directory
+from ff_website.power_rankings import get_power_rankings_store
+from ff_website.queries import (ACTIVE_MEMBER_NAMES, ALL_MEMBERS, FEWEST_COMBINED_POINTS,
+                                FEWEST_INDIVIDUAL_POINTS, HEAD_TO_HEAD_GAMES, LARGEST_MARGIN,
+                                LEAGUE_GAMES, MEMBER_BY_NAME, MEMBER_GAMES, MEMBERS_BY_ACTIVE,
+                                MOST_COMBINED_POINTS, MOST_INDIVIDUAL_POINTS, REPORT_BY_WEEK,
+                                SEASON_GAMES, SEASON_GAMES_BY_FORMAT, SEASON_WEEK_PAIR_GAME,
+                                SMALLEST_MARGIN, USER_BY_LOGIN, query_stats)
+from ff_website.season_summaries import get_member_summaries, refresh_member_season_summaries
 
 
 class User(UserMixin):
@@ -98,12 +112,7 @@ def register():
         inputted_username = form.username.data
         inputted_email = form.email.data
 
-        query = db.execute(
-            f"""
-            SELECT * FROM user
-            WHERE {USERNAME}=? OR {EMAIL}=?
-            """, (inputted_username, inputted_email)
-        ).fetchone()
+        query = USER_BY_LOGIN.fetchone(db, inputted_username, inputted_email)
         if query:
             if query[USERNAME] == inputted_username:
                 form.username.errors.append("That username is already taken")
@@ -156,12 +165,7 @@ def login():
 
     db = get_db()
     if form.validate_on_submit():
-        query = db.execute(
-            f"""
-            SELECT * FROM user
-            WHERE {USERNAME}=? OR {EMAIL}=?
-            """, (form.username_or_email.data, form.username_or_email.data)
-        ).fetchone()
+        query = USER_BY_LOGIN.fetchone(db, form.username_or_email.data, form.username_or_email.data)
         if query:
             if bcrypt.check_password_hash(query[PASSWORD], form.password.data):
                 user = User(id=query[USER_ID], username=query[USERNAME],
@@ -337,7 +341,13 @@ def update_member(member_id):
                         activeMember=str(original_activity_status))
 
     if form.validate_on_submit():
-        if form.firstName.data == original_first_name and \
+        duplicate = MEMBER_BY_NAME.fetchone(db, form.firstName.data, form.lastName.data, member_id)
+        if duplicate:
+            form.firstName.errors.append(
+                "A member of this name already exists")
+            form.lastName.errors.append(
+                "A member of this name already exists")
+        elif form.firstName.data == original_first_name and \
                 form.lastName.data == original_last_name and \
                 form.initialYear.data == str(original_year_joined) and \
                 form.activeMember.data == str(original_activity_status) and \
@@ -453,7 +463,7 @@ def list_all_seasons():
     query = db.execute(
         f"""
         SELECT DISTINCT {SEASON}
-        FROM game
+        FROM all_games
         """
     )
     seasons = [x[SEASON] for x in query]
@@ -469,26 +479,12 @@ def list_games(season):
         return redirect(url_for('homepage'))
 
     db = get_db()
-    all_games = db.execute(
-        f"""
-        SELECT game_id, team_A_id, team_B_id, team_A_score, team_B_score, season, week, matchup_length, playoffs,
-        t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-        FROM game
-        INNER JOIN member t2
-        ON t2.member_id = team_A_id
-        INNER JOIN member t3
-        ON t3.member_id = team_B_id
-        WHERE {SEASON}=?
-        ORDER BY 
-        {SEASON} ASC,
-        {WEEK} ASC
-        """, (season,)
-    ).fetchall()
-    df = pd.DataFrame(columns=["id", "Season", "Week", "Playoffs",
-                               "Team_A_id", "Team_A_name", "Team_A_score", "Team_B_id", "Team_B_name", "Team_B_score", "Edit", "Delete"])
+    all_games = SEASON_GAMES.fetchall(db, season)
+    table = TableBuilder(["id", "Season", "Week", "Playoffs",
+                          "Team_A_id", "Team_A_name", "Team_A_score", "Team_B_id", "Team_B_name", "Team_B_score", "Edit", "Delete"])
 
-    for index, element in enumerate(all_games):
-        df.loc[index] = [
+    for element in all_games:
+        table.append([
             element[GAME_ID],
             element[SEASON],
             element[WEEK],
@@ -501,10 +497,28 @@ def list_games(season):
             element[TEAM_B_SCORE],
             "Placeholder",
             "Placeholder"
-        ]
+        ])
 
     close_db()
-    return render_template("games_admin.html", df=df, title=f"{season} Games")
+    return render_template("games_admin.html", df=table.frame(), title=f"{season} Games")
+
+
+def find_duplicate_game(db, season, week, team_A_id, team_B_id, game_id=None):
+    """
+    Return the game that already pairs these two members in a season and week,
+    whichever of them is team A, as the game_season_week_pair index does
+    """
+
+    team_A_id, team_B_id = int(team_A_id), int(team_B_id)
+    return SEASON_WEEK_PAIR_GAME.fetchone(
+        db, season, week, min(team_A_id, team_B_id), max(team_A_id, team_B_id), game_id)
+
+
+def add_duplicate_game_errors(form):
+    for field in (form.teamAName, form.teamBName, form.week, form.season):
+        field.errors.append(
+            "A game with these two opponents already exists at the given date"
+        )
 
 
 @app.route("/tools/update_game/<int:game_id>", methods=["GET", "POST"])
@@ -517,10 +531,15 @@ def update_game(game_id):
     db = get_db()
     info = db.execute(
         """
-        SELECT * from game WHERE
+        SELECT * from all_games WHERE
         game_id=?
         """, (game_id,)
     ).fetchone()
+    frozen_seasons = get_frozen_seasons(db)
+    if info[SEASON] in frozen_seasons:
+        flash(f'{info[SEASON]} is archived and can no longer be edited.', 'warning')
+        close_db()
+        return redirect(url_for('tools'))
     season = info[SEASON]
     week = info[WEEK]
     team_A_id = info[TEAM_A_ID]
@@ -560,18 +579,31 @@ def update_game(game_id):
             new_playoffs = form.playoffs.data
             new_matchup_length = form.matchupLength.data
 
-            db.execute(
-                f"""
-                UPDATE game
-                SET {WEEK}=?, {SEASON}=?, {TEAM_A_ID}=?, {TEAM_A_SCORE}=?, {TEAM_B_ID}=?, {TEAM_B_SCORE}=?, {PLAYOFFS}=?, {MATCHUP_LENGTH}=?
-                WHERE {GAME_ID}=?
-                """, (new_week, new_season, new_team_A_name, new_team_A_score, new_team_B_name, new_team_B_score, new_playoffs, new_matchup_length, game_id)
-            )
-            db.commit()
-            close_db()
-            flash('Game updated!', 'success')
-            close_db()
-            return redirect(url_for('tools'))
+            if int(new_season) in frozen_seasons:
+                flash(f'{new_season} is archived, games cannot be moved into it.', 'warning')
+                close_db()
+                return redirect(url_for('tools'))
+
+            if find_duplicate_game(db, new_season, new_week, new_team_A_name, new_team_B_name, game_id):
+                add_duplicate_game_errors(form)
+            else:
+                try:
+                    db.execute(
+                        f"""
+                        UPDATE game
+                        SET {WEEK}=?, {SEASON}=?, {TEAM_A_ID}=?, {TEAM_A_SCORE}=?, {TEAM_B_ID}=?, {TEAM_B_SCORE}=?, {PLAYOFFS}=?, {MATCHUP_LENGTH}=?
+                        WHERE {GAME_ID}=?
+                        """, (new_week, new_season, new_team_A_name, new_team_A_score, new_team_B_name, new_team_B_score, new_playoffs, new_matchup_length, game_id)
+                    )
+                    db.commit()
+                except sqlite3.IntegrityError:
+                    db.rollback()
+                    add_duplicate_game_errors(form)
+                else:
+                    refresh_member_season_summaries(db)
+                    close_db()
+                    flash('Game updated!', 'success')
+                    return redirect(url_for('tools'))
 
     return render_template("update_game.html", form=form, title="Update Game")
 
@@ -584,14 +616,24 @@ def delete_game(game_id):
         return redirect(url_for('homepage'))
 
     db = get_db()
-    db.execute(
+    deleted = db.execute(
         """
         DELETE FROM game
         WHERE game_id=?
         """, (game_id,)
-    )
+    ).rowcount
     db.commit()
+    refresh_member_season_summaries(db)
+    # Nothing deleted is either an archived game or no game at all
+    archived = not deleted and db.execute(
+        f"SELECT 1 FROM all_games WHERE {GAME_ID}=?", (game_id,)).fetchone()
     close_db()
+    if archived:
+        flash('Archived games can not be deleted.', 'warning')
+        return redirect(url_for('tools'))
+    if not deleted:
+        flash('Game not found.', 'warning')
+        return redirect(url_for('tools'))
     flash('Game deleted!', 'danger')
     return redirect(url_for('tools'))
 
@@ -606,13 +648,7 @@ def create_member():
     db = get_db()
     form = CreateMember()
     if form.validate_on_submit():
-        query = db.execute(
-            f"""
-            SELECT {MEMBER_ID} FROM member
-            WHERE {FIRST_NAME}=? AND {LAST_NAME}=?
-            """,
-            (form.data["firstName"], form.data["lastName"])
-        ).fetchone()
+        query = MEMBER_BY_NAME.fetchone(db, form.data["firstName"], form.data["lastName"], None)
         if query:
             form.firstName.errors.append(
                 "A member of this name already exists")
@@ -661,43 +697,38 @@ def create_game():
 
     form = CreateGame()
     if form.validate_on_submit():
-        query = db.execute(
-            f"""
-            SELECT {TEAM_A_ID}, {TEAM_B_ID}, {WEEK}, {SEASON} FROM game
-            WHERE {TEAM_A_ID}=? AND {TEAM_B_ID}=? AND {WEEK}=? AND {SEASON}=?
-            """,
-            (form.data["teamAName"], form.data["teamBName"],
-             form.data["week"], form.data["season"])
-        ).fetchone()
-        if query:
-            form.teamAName.errors.append(
-                "A game with these two opponents already exists at the given date"
-            )
-            form.teamBName.errors.append(
-                "A game with these two opponents already exists at the given date"
-            )
-            form.week.errors.append(
-                "A game with these two opponents already exists at the given date"
-            )
+        if find_duplicate_game(db, form.data["season"], form.data["week"],
+                               form.data["teamAName"], form.data["teamBName"]):
+            add_duplicate_game_errors(form)
+        elif int(form.data["season"]) in get_frozen_seasons(db):
             form.season.errors.append(
-                "A game with these two opponents already exists at the given date"
+                "This season is archived and can no longer be changed"
             )
         else:
-            db.execute(
-                f"""
-                INSERT INTO game
-                ({TEAM_A_SCORE}, {TEAM_B_SCORE}, {SEASON}, {WEEK},
-                {MATCHUP_LENGTH}, {PLAYOFFS}, {TEAM_A_ID}, {TEAM_B_ID})
-                VALUES(?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (form.data["teamAScore"], form.data["teamBScore"], form.data["season"],
-                 form.data["week"], form.data["matchupLength"], form.data["playoffs"],
-                 form.data["teamAName"], form.data["teamBName"])
-            )
-            db.commit()
-            close_db()
-            flash('Game created!', 'success')
-            return redirect(url_for('create_game'))
+            try:
+                db.execute("BEGIN IMMEDIATE")
+                db.execute(
+                    f"""
+                    INSERT INTO game
+                    ({GAME_ID}, {TEAM_A_SCORE}, {TEAM_B_SCORE}, {SEASON}, {WEEK},
+                    {MATCHUP_LENGTH}, {PLAYOFFS}, {TEAM_A_ID}, {TEAM_B_ID})
+                    VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (next_game_id(db), form.data["teamAScore"], form.data["teamBScore"], form.data["season"],
+                     form.data["week"], form.data["matchupLength"], form.data["playoffs"],
+                     form.data["teamAName"], form.data["teamBName"])
+                )
+                db.commit()
+            except sqlite3.IntegrityError:
+                # Another admin saved the same game since the check above. The id
+                # can't collide, it was taken under the write lock.
+                db.rollback()
+                add_duplicate_game_errors(form)
+            else:
+                refresh_member_season_summaries(db)
+                close_db()
+                flash('Game created!', 'success')
+                return redirect(url_for('create_game'))
 
     close_db()
     return render_template("create_game.html", form=form, title="Create a Game")
@@ -763,14 +794,11 @@ def create_power_rankings():
 
     form = CreatePowerRankings(year=CURRENT_SEASON)
     if form.validate_on_submit():
-        base_path = os.path.join(
-            app.root_path, "data", "power_rankings", str(CURRENT_SEASON))
-        files = glob.glob(base_path + "/*")
-        for file in files:
-            if str(parse_rankings_filename(file)) == str(form.week.data):
-                form.week.errors.append(
-                    "A power rankings for that week already exists for the current season. Please delete it before proceeding")
-                return render_template("create_power_rankings.html", form=form)
+        store = get_power_rankings_store()
+        if int(form.week.data) in store.season(CURRENT_SEASON):
+            form.week.errors.append(
+                "A power rankings for that week already exists for the current season. Please delete it before proceeding")
+            return render_template("create_power_rankings.html", form=form)
 
         team_one = form.team_one.data
         team_two = form.team_two.data
@@ -795,16 +823,7 @@ def create_power_rankings():
             week = form.week.data
             file_name = f"{CURRENT_SEASON}_power_rankings_week_{week}.json"
 
-            query = db.execute(
-                f"""
-                SELECT {MEMBER_ID}, {FIRST_NAME}, {LAST_NAME}
-                FROM member
-                """
-            ).fetchall()
-            names_dict = {}
-            for row in query:
-                name = row[FIRST_NAME] + " " + row[LAST_NAME]
-                names_dict[row[MEMBER_ID]] = name
+            names_dict = get_member_directory().names()
 
             object = {
                 "year": CURRENT_SEASON,
@@ -812,33 +831,18 @@ def create_power_rankings():
                 "rankings": [names_dict[int(i)] for i in submitted]
             }
 
-            file_path = os.path.join(
-                app.root_path, "data", "power_rankings", str(CURRENT_SEASON))
+            file_path = store.season_dir(CURRENT_SEASON)
             os.makedirs(file_path, exist_ok=True)
             json.dump(object, open(os.path.join(file_path, file_name), "w"))
+            store.invalidate(CURRENT_SEASON)
             flash('Power Rankings Created!', 'success')
             close_db()
             return redirect(url_for('tools'))
 
         else:
-            # This fixes the bug where a single member was missed from power rankings
-            if len(missing) == 1:
-                elem = list(missing)[0]
-                query = db.execute(
-                    f"""
-                    SELECT {FIRST_NAME}, {LAST_NAME} FROM member
-                    WHERE {MEMBER_ID}=?
-                    """, (elem,)
-                ).fetchall()
-            else:
-                query = db.execute(
-                    f"""
-                    SELECT {FIRST_NAME}, {LAST_NAME} FROM member
-                    WHERE {MEMBER_ID} IN {tuple(missing)}
-                    """
-                ).fetchall()
-            names = [name[FIRST_NAME] + " " + name[LAST_NAME]
-                     for name in query]
+            members = get_member_directory()
+            names = [members.get_name(member_id)
+                     for member_id in sorted(missing, key=int)]
             names_str = ""
             for i, name in enumerate(names):
                 names_str += name
@@ -858,18 +862,15 @@ def list_all_power_rankings():
     if current_user.admin_privileges != 1:
         return redirect(url_for('homepage'))
 
-    base_path = os.path.join(
-        app.root_path, "data", "power_rankings", str(CURRENT_SEASON))
-    power_rankings_path = str(base_path) + "/*"
-    reports = glob.glob(power_rankings_path)
+    rankings = get_power_rankings_store().season(CURRENT_SEASON)
 
     files = [
         {
-            "filename": os.path.basename(report),
-            "week": parse_rankings_filename(report),
+            "filename": rankings.filenames[week],
+            "week": str(week),
             "season": CURRENT_SEASON
         }
-        for report in reports
+        for week in rankings.weeks
     ]
 
     return render_template("power_rankings_admin.html", files=files, title="Power Rankings Admin")
@@ -889,14 +890,17 @@ def delete_power_ranking():
     except AttributeError:
         print("Something went wrong getting args!")
 
+    if not season or not season.isdigit() or not week or not week.isdigit():
+        abort(400)
+
+    store = get_power_rankings_store()
     filename = f"{season}_power_rankings_week_{week}.json"
-    base_path = os.path.join(
-        app.root_path, "data", "power_rankings", str(season), filename
-    )
+    base_path = os.path.join(store.season_dir(season), filename)
 
     if os.path.exists(base_path):
 
         os.remove(base_path)
+        store.invalidate(int(season))
         flash("Power rankings deleted!", "danger")
     else:
         flash("Power rankings could not be deleted", "warning")
@@ -918,13 +922,7 @@ def create_jarrett_report():
         os.makedirs(base_path, exist_ok=True)
         
         db = get_db()
-        query = db.execute(
-            f"""
-            SELECT report_id
-            FROM report
-            WHERE {SEASON}=? AND {WEEK}=?
-            """, (form.season.data, form.week.data)
-        ).fetchone()
+        query = REPORT_BY_WEEK.fetchone(db, form.season.data, form.week.data)
         
         if query:
             form.season.errors.append(
@@ -1076,7 +1074,12 @@ def revoke_announcement_status(user_id):
     return redirect(url_for('list_all_users'))
 
 
+def member_page_version(member_id):
+    return page_version(member_id, get_data_generation()), LIVE_CACHE_CONTROL
+
+
 @app.route("/member/<int:member_id>", methods=["GET", "POST"])
+@conditional(member_page_version)
 def get_member_info(member_id):
 
     class Card:
@@ -1084,8 +1087,6 @@ def get_member_info(member_id):
             self.text = text
             self.value = value
 
-    cards = []
-
     db = get_db()
 
     member_info = db.execute(
@@ -1103,75 +1104,59 @@ def get_member_info(member_id):
 
     rookie = year_joined == CURRENT_SEASON
 
-    all_games_for_member = db.execute(
-        f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name, t3.year_joined
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            WHERE team_A_id=? OR team_B_id=?
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-
-        """, (member_id, member_id)
-    ).fetchall()
+    def render():
+        all_games_for_member = MEMBER_GAMES.fetchall(db, member_id, member_id)
 
-    all_games = db.execute(
-        f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name, t3.year_joined
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-        """
-    ).fetchall()
+        if rookie:
+            last_year = CURRENT_SEASON
+        else:
+            last_year = all_games_for_member[-1][SEASON]
 
-    if rookie:
-        last_year = CURRENT_SEASON
-    else:
-        last_year = all_games_for_member[-1][SEASON]
+        record, po_record, _, _, _, _ = get_overall_record(
+            all_games_for_member, member_id)
+        playoff_appearances = get_playoff_appearances(all_games_for_member)
+
+        total_points, longest_win_streak, longest_losing_streak, most_points, fewest_points = get_additional_stats(
+            all_games_for_member, member_id)
 
-    record, po_record, _, _, _, _ = get_overall_record(
-        all_games_for_member, name)
-    playoff_appearances = get_playoff_appearances(all_games_for_member)
+        if not all_games_for_member:
+            total_points_str = "0.0"
+        else:
+            total_points_str = "{:.2f}".format(total_points)
 
-    total_points, longest_win_streak, longest_losing_streak, most_points, fewest_points = get_additional_stats(
-        all_games_for_member, name)
+        if not all_games_for_member:
+            avg_points_str = "0.0"
+        else:
+            avg_points_str = "{:.2f}".format(
+                total_points/len(all_games_for_member))
 
-    if not all_games_for_member:
-        total_points_str = "0.0"
-    else:
-        total_points_str = "{:.2f}".format(total_points)
+        cards = []
+        cards.append(Card("Total Games", len(all_games_for_member)))
+        cards.append(Card("Overall Record", record))
+        cards.append(Card("Playoff Record", po_record))
+        cards.append(Card("Total Points", total_points_str))
+        cards.append(Card("Points per game", avg_points_str))
+        cards.append(Card("Most Points", most_points))
+        cards.append(Card("Fewest Points", fewest_points))
+        cards.append(Card("Longest Win Streak", longest_win_streak))
+        cards.append(Card("Longest Losing Streak", longest_losing_streak))
 
-    if not all_games_for_member:
-        avg_points_str = "0.0"
-    else:
-        avg_points_str = "{:.2f}".format(
-            total_points/len(all_games_for_member))
+        summaries = get_member_summaries(db, member_id)
 
-    cards.append(Card("Total Games", len(all_games_for_member)))
-    cards.append(Card("Overall Record", record))
-    cards.append(Card("Playoff Record", po_record))
-    cards.append(Card("Total Points", total_points_str))
-    cards.append(Card("Points per game", avg_points_str))
-    cards.append(Card("Most Points", most_points))
-    cards.append(Card("Fewest Points", fewest_points))
-    cards.append(Card("Longest Win Streak", longest_win_streak))
-    cards.append(Card("Longest Losing Streak", longest_losing_streak))
+        championships = get_championships(summaries, name)
+        seasons = get_schedules(all_games_for_member, member_id, get_member_directory().names())
 
-    summaries = get_summaries(all_games, name)
+        summaries_html = summaries.to_html(
+            classes="table table-striped") if not summaries.empty else None
 
-    championships = get_championships(summaries, name)
-    seasons = get_schedules(all_games_for_member, name)
+        return dict(last_year=last_year,
+                    playoff_appearances=playoff_appearances,
+                    championships=championships,
+                    cards=cards,
+                    summaries=summaries_html,
+                    seasons=seasons)
 
-    summaries_html = summaries.to_html(
-        classes="table table-striped") if not summaries.empty else None
+    fragment = cached_fragment("member", member_id, render)
 
     close_db()
     return render_template("member.html",
@@ -1179,13 +1164,8 @@ def get_member_info(member_id):
                            img_filepath=img_filepath,
                            year_joined=year_joined,
                            status=active,
-                           last_year=last_year,
-                           playoff_appearances=playoff_appearances,
-                           championships=championships,
-                           cards=cards,
-                           summaries=summaries_html,
-                           seasons=seasons,
-                           title=name)
+                           title=name,
+                           **fragment)
 
 
 @app.route("/archives/", methods=["GET", "POST"])
@@ -1218,26 +1198,11 @@ def h2h():
     db = get_db()
     # If we got the members successfully, find the history of their games
     if member_one_id and member_two_id:
-        df = pd.DataFrame(columns=[
+        table = TableBuilder([
             "Season", "Week", "Matchup Format", "Winning Team", "Losing Team", "Score"])
 
-        query = db.execute(
-            f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t2.img_filepath as team_A_img_filepath, t2.member_id as member_A_id,
-            t3.first_name as team_B_first_name, t3.last_name as team_B_last_name, t3.img_filepath as team_B_img_filepath, t3.member_id as member_B_id
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            WHERE team_A_id = ? AND team_B_id = ? OR team_A_id = ? AND team_B_id = ?
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-            """, (member_one_id, member_two_id,
-                  member_two_id, member_one_id)
-        ).fetchall()
+        query = HEAD_TO_HEAD_GAMES.fetchall(db, member_one_id, member_two_id,
+                                            member_two_id, member_one_id)
         for row in query:
             if str(row["member_A_id"]) == str(member_one_id):
                 member_one_img = row["team_A_img_filepath"]
@@ -1273,9 +1238,10 @@ def h2h():
 
             asterisk = "*" if matchup_length == 2 else ""
             matchup_format = "Playoffs" if playoffs else "Regular Season"
-            df.loc[len(df.index)] = [season, week,
-                                     matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}"]
+            table.append([season, week,
+                          matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}"])
 
+        df = table.frame()
         num_matchups = len(df.index)
         if num_matchups > 0:
             try:
@@ -1353,23 +1319,15 @@ def game_qualities():
     except AttributeError as e:
         print("Something went wrong getting paramters", e)
 
+    num_results = int(num_results) if num_results and num_results.isdigit() else 10
+
     db = get_db()
 
     # Fewest points scored combined
     if filter_type == "1":
-        total_scores_list = []
-        query = db.execute(
-            f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs, team_A_score+team_B_score as total_score,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            ORDER BY total_score ASC LIMIT {num_results}
-            """
-        ).fetchall()
+        table = TableBuilder([
+            "Season", "Week", "Matchup Format", "Winning Team", "Losing Team", "Score", "Total Points"])
+        query = FEWEST_COMBINED_POINTS.fetchall(db, num_results)
         for row in query:
             team_A_score = row["team_A_score"]
             team_B_score = row["team_B_score"]
@@ -1390,30 +1348,16 @@ def game_qualities():
 
             asterisk = "*" if matchup_length == 2 else ""
             matchup_format = "Playoffs" if playoffs else "Regular Season"
-            df.loc[len(df.index)] = [season, week,
-                                     matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}"]
-
-            total_scores_list.append(row["total_score"])
-        df["Total Points"] = total_scores_list
+            table.append([season, week,
+                          matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}",
+                          row["total_score"]])
+        df = table.frame()
 
     # Fewest points scored individual
     if filter_type == "2":
-        df = pd.DataFrame(columns=[
+        table = TableBuilder([
             "Season", "Week", "Matchup Format", "League Member", "Points"])
-        query = db.execute(
-            f"""
-            WITH t as(
-                SELECT game_id, team_A_score as points, season, week, matchup_length, playoffs, team_A_id as team_id from game
-                UNION ALL
-                SELECT game_id, team_B_score as points, season, week, matchup_length, playoffs, team_B_id as team_id from game
-                ORDER BY team_A_score DESC
-            )
-            SELECT points, season, week, matchup_length, playoffs, team_id, first_name, last_name
-            FROM t
-            INNER JOIN member on member_id = team_id
-            ORDER BY points ASC LIMIT {num_results}
-            """
-        ).fetchall()
+        query = FEWEST_INDIVIDUAL_POINTS.fetchall(db, num_results)
         for row in query:
             points = row["points"]
             season = row["season"]
@@ -1425,24 +1369,15 @@ def game_qualities():
 
             asterisk = "*" if matchup_length == 2 else ""
             matchup_format = "Playoffs" if playoffs else "Regular Season"
-            df.loc[len(df.index)] = [season, week,
-                                     matchup_format, team_name, points]
+            table.append([season, week,
+                          matchup_format, team_name, points])
+        df = table.frame()
 
     # Most points scored combined
     if filter_type == "3":
-        total_scores_list = []
-        query = db.execute(
-            f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs, team_A_score+team_B_score as total_score,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            ORDER BY total_score DESC LIMIT {num_results}
-            """
-        ).fetchall()
+        table = TableBuilder([
+            "Season", "Week", "Matchup Format", "Winning Team", "Losing Team", "Score", "Total Points"])
+        query = MOST_COMBINED_POINTS.fetchall(db, num_results)
         for row in query:
             team_A_score = row["team_A_score"]
             team_B_score = row["team_B_score"]
@@ -1463,30 +1398,16 @@ def game_qualities():
 
             asterisk = "*" if matchup_length == 2 else ""
             matchup_format = "Playoffs" if playoffs else "Regular Season"
-            df.loc[len(df.index)] = [season, week,
-                                     matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}"]
-
-            total_scores_list.append(row["total_score"])
-        df["Total Points"] = total_scores_list
+            table.append([season, week,
+                          matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}",
+                          row["total_score"]])
+        df = table.frame()
 
     # Fewest points scored combined
     if filter_type == "4":
-        df = pd.DataFrame(columns=[
+        table = TableBuilder([
             "Season", "Week", "Matchup Format", "League Member", "Points"])
-        query = db.execute(
-            f"""
-            WITH t as(
-                SELECT game_id, team_A_score as points, season, week, matchup_length, playoffs, team_A_id as team_id from game
-                UNION ALL
-                SELECT game_id, team_B_score as points, season, week, matchup_length, playoffs, team_B_id as team_id from game
-                ORDER BY team_A_score DESC
-            )
-            SELECT points, season, week, matchup_length, playoffs, team_id, first_name, last_name
-            FROM t
-            INNER JOIN member on member_id = team_id
-            ORDER BY points DESC LIMIT {num_results}
-            """
-        ).fetchall()
+        query = MOST_INDIVIDUAL_POINTS.fetchall(db, num_results)
         for row in query:
             points = row["points"]
             season = row["season"]
@@ -1498,24 +1419,15 @@ def game_qualities():
 
             asterisk = "*" if matchup_length == 2 else ""
             matchup_format = "Playoffs" if playoffs else "Regular Season"
-            df.loc[len(df.index)] = [season, week,
-                                     matchup_format, team_name, points]
+            table.append([season, week,
+                          matchup_format, team_name, points])
+        df = table.frame()
 
     # Largest margin of victory
     if filter_type == "5":
-        deficits_list = []
-        query = db.execute(
-            f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs, abs(team_A_score-team_B_score) as margin,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            ORDER BY margin DESC LIMIT {num_results}
-            """
-        ).fetchall()
+        table = TableBuilder([
+            "Season", "Week", "Matchup Format", "Winning Team", "Losing Team", "Score", "Margin"])
+        query = LARGEST_MARGIN.fetchall(db, num_results)
         for row in query:
             team_A_score = row["team_A_score"]
             team_B_score = row["team_B_score"]
@@ -1536,27 +1448,16 @@ def game_qualities():
 
             asterisk = "*" if matchup_length == 2 else ""
             matchup_format = "Playoffs" if playoffs else "Regular Season"
-            df.loc[len(df.index)] = [season, week,
-                                     matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}"]
-
-            deficits_list.append(row["margin"])
-        df["Margin"] = deficits_list
+            table.append([season, week,
+                          matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}",
+                          row["margin"]])
+        df = table.frame()
 
     # Smallest margin of victory
     if filter_type == "6":
-        deficits_list = []
-        query = db.execute(
-            f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs, abs(team_A_score-team_B_score) as margin,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            ORDER BY margin ASC LIMIT {num_results}
-            """
-        ).fetchall()
+        table = TableBuilder([
+            "Season", "Week", "Matchup Format", "Winning Team", "Losing Team", "Score", "Margin"])
+        query = SMALLEST_MARGIN.fetchall(db, num_results)
         for row in query:
             team_A_score = row["team_A_score"]
             team_B_score = row["team_B_score"]
@@ -1577,11 +1478,10 @@ def game_qualities():
 
             asterisk = "*" if matchup_length == 2 else ""
             matchup_format = "Playoffs" if playoffs else "Regular Season"
-            df.loc[len(df.index)] = [season, week,
-                                     matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}"]
-
-            deficits_list.append(row["margin"])
-        df["Margin"] = deficits_list
+            table.append([season, week,
+                          matchup_format, winning_team, losing_team, f"{winning_score}-{losing_score}{asterisk}",
+                          row["margin"]])
+        df = table.frame()
 
     df.index += 1
 
@@ -1596,48 +1496,60 @@ def game_qualities():
                            title="Game Qualities")
 
 
+def season_summary_version():
+    year = request.args.get("year")
+    if not year:
+        return page_version(), LIVE_CACHE_CONTROL
+
+    # A frozen season's games never change, only the member names shown with them
+    db = get_db()
+    if year.isdigit() and int(year) in get_frozen_seasons(db):
+        return page_version(year, get_generation(db, "member")), LIVE_CACHE_CONTROL
+    return page_version(year, get_data_generation(db)), LIVE_CACHE_CONTROL
+
+
+# The season selector only redirects to a GET, so it has no CSRF token to expire
+# in a cached page
 @app.route("/archives/season_summary", methods=["GET", "POST"])
+@csrf.exempt
+@conditional(season_summary_version)
 def season_summary():
 
     form = SeasonSelector()
     args = request.args
     year, standings, all_weeks, roto, playoffs, read_seasonal_league_settings = None, None, None, None, None, None
 
-    standings = pd.DataFrame()
-    roto = pd.DataFrame()
+    standings = pd.DataFrame().to_html(classes="table table-striped")
+    roto = pd.DataFrame().to_html(classes="table table-striped")
 
     try:
         year = args.get("year")
     except AttributeError as e:
         print("Something went wrong getting parameters", e)
 
+    if year and (not year.isdigit() or int(year) not in NUM_PLAYOFF_TEAMS_PER_YEAR):
+        abort(404)
+
     db = get_db()
 
     if year:
-        query = db.execute(
-            f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            WHERE season=?
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-            """, (year,)
-        ).fetchall()
-
-        standings, _ = get_standings(query)
-        playoffs = get_playoff_results_for_season_summary(
-            query, NUM_PLAYOFF_TEAMS_PER_YEAR[int(year)])
-        all_weeks = get_all_week_results(query)
-        roto = get_roto(query)
+        def render():
+            query = SEASON_GAMES.fetchall(db, year)
+
+            standings, _ = get_standings(query)
+            roto = get_roto(query)
+            return dict(
+                standings=standings.to_html(classes="table table-striped"),
+                roto=roto.to_html(classes="table table-striped"),
+                playoffs=get_playoff_results_for_season_summary(
+                    query, NUM_PLAYOFF_TEAMS_PER_YEAR[int(year)]),
+                all_weeks=get_all_week_results(query))
 
-        read_seasonal_league_settings = json.load(open(os.path.join(
-            app.root_path, "data", "season_settings_archives", f"{year}_season_settings.json")))
+        fragment = cached_fragment("season_summary", year, render)
+        standings, roto = fragment["standings"], fragment["roto"]
+        playoffs, all_weeks = fragment["playoffs"], fragment["all_weeks"]
+
+        read_seasonal_league_settings = get_power_rankings_store().season_settings(int(year))
 
     if form.validate_on_submit():
         close_db()
@@ -1649,10 +1561,9 @@ def season_summary():
                            year=year,
                            season_settings=read_seasonal_league_settings,
                            all_weeks=all_weeks,
-                           roto=roto.to_html(classes="table table-striped"),
+                           roto=roto,
                            playoffs=playoffs,
-                           standings=standings.to_html(
-                               classes="table table-striped"),
+                           standings=standings,
                            title="Season Summary")
 
 
@@ -1828,87 +1739,52 @@ def current_season():
 @app.route("/current_season/season_info", methods=["GET", "POST"])
 def current_season_info():
     db = get_db()
-    query = db.execute(
-        f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            WHERE season=?
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-            """, (CURRENT_SEASON,)
-    ).fetchall()
 
-    current_members_query = db.execute(
-        f"""
-        SELECT {FIRST_NAME}, {LAST_NAME}
-        FROM member
-        WHERE {ACTIVE}=?
-        ORDER BY
-        {LAST_NAME} ASC
-        """, (1,)
-    ).fetchall()
+    def render():
+        query = SEASON_GAMES.fetchall(db, CURRENT_SEASON)
+
+        current_members_query = ACTIVE_MEMBER_NAMES.fetchall(db, 1)
+
+        current_member_names = [
+            f"{row['first_name']} {row['last_name']}" for row in current_members_query]
 
-    current_member_names = [
-        f"{row['first_name']} {row['last_name']}" for row in current_members_query]
+        standings, ranks = get_standings(query, current_member_names)
+        all_weeks = get_all_week_results(query)
+        playoffs = get_playoff_results_for_season_summary(
+            query, NUM_PLAYOFF_TEAMS_PER_YEAR[int(CURRENT_SEASON)])
 
-    standings, ranks = get_standings(query, current_member_names)
-    standings_html = standings.to_html(classes="table table-striped")
-    all_weeks = get_all_week_results(query)
-    playoffs = get_playoff_results_for_season_summary(
-        query, NUM_PLAYOFF_TEAMS_PER_YEAR[int(CURRENT_SEASON)])
+        roto = get_roto(query, current_member_names)
+
+        matchups = get_projected_playoff_teams(standings, ranks, roto, 6, 2)
 
-    roto = get_roto(query, current_member_names)
-    roto_html = roto.to_html(classes="table table-striped")
+        if not query:
+            matchups = [""] * NUM_PLAYOFF_TEAMS_PER_YEAR[int(CURRENT_SEASON)]
 
-    matchups = get_projected_playoff_teams(standings, ranks, roto, 6, 2)
+            matchups[0] = "Head to Head 1st Place"
+            matchups[1] = "Head to Head 2nd Place"
+            matchups[2] = "Head to Head 3rd Place"
+            matchups[3] = "Head to Head 4th Place"
+            matchups[4] = "Roto Wildcard #1"
+            matchups[5] = "Roto Wildcard #2"
 
-    if not query:
-        matchups = [""] * NUM_PLAYOFF_TEAMS_PER_YEAR[int(CURRENT_SEASON)]
+        return dict(standings=standings.to_html(classes="table table-striped"),
+                    roto=roto.to_html(classes="table table-striped"),
+                    matchups=matchups,
+                    all_weeks=all_weeks,
+                    playoffs=playoffs)
 
-        matchups[0] = "Head to Head 1st Place"
-        matchups[1] = "Head to Head 2nd Place"
-        matchups[2] = "Head to Head 3rd Place"
-        matchups[3] = "Head to Head 4th Place"
-        matchups[4] = "Roto Wildcard #1"
-        matchups[5] = "Roto Wildcard #2"
+    fragment = cached_fragment("current_season_info", CURRENT_SEASON, render)
 
     close_db()
     return render_template("current_season_info.html",
                            year=CURRENT_SEASON,
                            cards=CURRENT_SEASON_CARDS,
-                           standings=standings_html,
-                           roto=roto_html,
-                           matchups=matchups,
-                           all_weeks=all_weeks,
-                           playoffs=playoffs,
-                           title="Current Season Info")
+                           title="Current Season Info",
+                           **fragment)
 
 
 @app.route("/current_season/payouts", methods=["GET", "POST"])
 def current_season_payouts():
-    db = get_db()
-    db.execute(
-        f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            WHERE season=?
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-            """, (CURRENT_SEASON,)
-    ).fetchall()
-
     dollars = {
         "League Winner": 1200,
         "League Runner Up": 200,
@@ -1944,21 +1820,7 @@ def current_season_payouts():
     payouts["Payout"] = list(dollars.values())
 
     db = get_db()
-    query = db.execute(
-        f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            WHERE season=?
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-            """, (CURRENT_SEASON,)
-    ).fetchall()
+    query = SEASON_GAMES.fetchall(db, CURRENT_SEASON)
 
     roto = get_roto(query)
     playoffs = get_playoffs(query)
@@ -2024,15 +1886,7 @@ def current_season_payouts():
 
     # This implies the offseason
     if not league_members:
-        current_members_query = db.execute(
-            f"""
-            SELECT {FIRST_NAME}, {LAST_NAME}
-            FROM member
-            WHERE {ACTIVE}=?
-            ORDER BY
-            {LAST_NAME} ASC
-            """, (1,)
-        ).fetchall()
+        current_members_query = ACTIVE_MEMBER_NAMES.fetchall(db, 1)
 
         league_members = [
             f"{row['first_name']} {row['last_name']}" for row in current_members_query]
@@ -2059,51 +1913,57 @@ def current_season_payouts():
 
 @app.route("/current_season/analytics", methods=["GET", "POST"])
 def current_season_analytics():
+    form = AllPlaySelector()
+    all_play = request.args.get("all_play")
+    # Only real seasons get a fragment, not every integer in the query string
+    if all_play and all_play.isdigit() and int(all_play) not in NUM_PLAYOFF_TEAMS_PER_YEAR:
+        abort(404)
+
     db = get_db()
-    query = db.execute(
-        f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            WHERE season=? AND playoffs=?
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-            """, (CURRENT_SEASON, 0)
-    ).fetchall()
 
-    current_members_query = db.execute(
-        f"""
-        SELECT {FIRST_NAME}, {LAST_NAME}
-        FROM member
-        WHERE {ACTIVE}=?
-        ORDER BY
-        {LAST_NAME} ASC
-        """, (1,)
-    ).fetchall()
+    def render():
+        query = SEASON_GAMES_BY_FORMAT.fetchall(db, CURRENT_SEASON, 0)
 
-    current_member_names = [
-        f"{row['first_name']} {row['last_name']}" for row in current_members_query]
-    
-    roto_against = get_roto_against(query, current_member_names)
-    head_to_head = get_head_to_head(query, current_member_names)
-    intervals = get_intervals(query, current_member_names)
+        current_members_query = ACTIVE_MEMBER_NAMES.fetchall(db, 1)
+
+        current_member_names = [
+            f"{row['first_name']} {row['last_name']}" for row in current_members_query]
+
+        # Roto and standings are computed once and shared by the tables below
+        roto = get_roto(query, current_member_names)
+        standings, _ = get_standings(query, current_member_names)
+        roto_against = get_roto_against(query, current_member_names, roto, standings)
+        head_to_head = get_head_to_head(query, current_member_names)
+        intervals = get_intervals(query, current_member_names)
+
+        return dict(roto_against=roto_against.to_html(classes="table table-striped"),
+                    head_to_head=head_to_head.to_html(classes="table table-striped"),
+                    intervals=intervals.to_html(classes="table table-striped"))
+
+    fragment = cached_fragment("current_season_analytics", CURRENT_SEASON, render)
+
+    # All-play records for an archived season, or across every season
+    all_play_head_to_head = None
+    if all_play == "all":
+        all_play_head_to_head = cached_fragment("all_play", all_play, lambda: get_head_to_head(
+            LEAGUE_GAMES.fetchall(db)).to_html(classes="table table-striped"))
+    elif all_play and all_play.isdigit():
+        all_play_head_to_head = cached_fragment("all_play", int(all_play), lambda: get_head_to_head(
+            SEASON_GAMES.fetchall(db, int(all_play))).to_html(classes="table table-striped"))
+
+    if form.validate_on_submit():
+        close_db()
+        return redirect(url_for("current_season_analytics", all_play=form.data["allPlay"]))
 
     close_db()
     return render_template("current_season_analytics.html",
+                           form=form,
                            year=CURRENT_SEASON,
                            cards=CURRENT_SEASON_CARDS,
-                           roto_against=roto_against.to_html(
-                               classes="table table-striped"),
-                           head_to_head=head_to_head.to_html(
-                               classes="table table-striped"),
-                           intervals=intervals.to_html(
-                               classes="table table-striped"),
-                           title="Current Season Analytics")
+                           all_play=all_play,
+                           all_play_head_to_head=all_play_head_to_head,
+                           title="Current Season Analytics",
+                           **fragment)
 
 
 @app.route("/current_season/report", methods=["GET", "POST"])
@@ -2145,12 +2005,9 @@ def current_season_report():
 @app.route("/current_season/power_rankings", methods=["GET", "POST"])
 def current_season_power_rankings():
     form = SelectPowerRankWeek()
-    base_path = os.path.join(
-        app.root_path, "data", "power_rankings", str(CURRENT_SEASON))
-    power_rankings_path = str(base_path) + "/*"
-    reports = glob.glob(power_rankings_path)
+    rankings = get_power_rankings_store().season(CURRENT_SEASON)
 
-    if not reports:
+    if not rankings:
         return render_template("current_season_power_rankings.html",
                                week=None,
                                current_info=None,
@@ -2158,11 +2015,6 @@ def current_season_power_rankings():
                                cards=CURRENT_SEASON_CARDS
                                )
 
-    helper = [(parse_rankings_filename(i), i) for i in reports]
-    helper.sort(key=lambda x: int(x[0]))
-
-    reports = [i[1] for i in helper]
-
     args = request.args
     try:
         week_of_current_report = args.get("week")
@@ -2170,68 +2022,23 @@ def current_season_power_rankings():
         print("Something went wrong getting parameters!", e)
 
     if week_of_current_report == None:
-        current_report_file = reports[-1]
-        week_of_current_report = parse_rankings_filename(current_report_file)
+        week_of_current_report = str(rankings.latest_week())
 
-    current_info, previous_info = get_power_rankings_infos(
-        reports, week_of_current_report)
+    if not week_of_current_report.isdigit() or int(week_of_current_report) not in rankings:
+        abort(404)
 
-    if previous_info:
-        for member in current_info.keys():
-            current_info[member]["change"] = previous_info[member]["rank"] - \
-                current_info[member]["rank"]
+    current_info = rankings.info(int(week_of_current_report))
 
     if form.validate_on_submit():
         return redirect(url_for('current_season_power_rankings', week=form.week.data))
 
-    base_path = os.path.join(
-        app.root_path, "data", "power_rankings", str(CURRENT_SEASON))
-    power_rankings_path = str(base_path) + "/*"
-    reports = glob.glob(power_rankings_path)
-
-    reports.sort(key=lambda x: int(parse_rankings_filename(x)))
-
-    graph_data = {}
-
-    for report in reports:
-        week = int(parse_rankings_filename(report))
-        data = json.load(open(report, "r"))
-        rankings = data["rankings"]
-        for index, member in enumerate(rankings):
-            if member not in graph_data:
-                graph_data[member] = [(week, index + 1)]
-            else:
-                graph_data[member].append((week, index + 1))
-
-    colors = ["lightCoral", "crimson", "hotPink", "orange", "gold", "indigo",
-              "slateBlue", "greenYellow", "darkGreen", "dodgerBlue", "silver", "black"]
-
-    all_data = []
-    color_index = 0
-
-    for member_name, data in graph_data.items():
-
-        all_data.append(
-            {
-                "title": '"' + member_name + '"',
-                "key": "".join(member_name.split()),
-                "xvalues": [x[0] for x in data],
-                "yvalues": [y[1] for y in data],
-                "color": '"' + colors[color_index] + '"'
-            }
-        )
-
-        color_index += 1
-
-    all_data.sort(key=lambda x: x["title"].split(" ")[1][0])
-
     return render_template("current_season_power_rankings.html",
                            week=week_of_current_report,
                            current_info=current_info,
                            form=form,
                            cards=CURRENT_SEASON_CARDS,
                            title="Power Rankings",
-                           all_data=all_data
+                           all_data=rankings.chart
                            )
 
 
@@ -2354,24 +2161,15 @@ def update_announcement(announcement_id):
     return render_template("update_announcement.html", form=form, title="Update Announcement")
 
 
+def hall_of_fame_version():
+    return page_version(get_data_generation()), LIVE_CACHE_CONTROL
+
+
 @app.route("/hall_of_fame",  methods=["GET", "POST"])
+@conditional(hall_of_fame_version)
 def hall_of_fame():
 
     db = get_db()
-    query = db.execute(
-        f"""
-            SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
-            t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
-            FROM game
-            INNER JOIN member t2
-            ON t2.member_id = team_A_id
-            INNER JOIN member t3
-            ON t3.member_id = team_B_id
-            ORDER BY 
-            {SEASON} ASC,
-            {WEEK} ASC
-            """
-    ).fetchall()
     top_3_most_points_all_time, \
         top_3_most_points_single_season_excl_playoffs, \
         top_3_most_ppg_all_time, \
@@ -2384,18 +2182,13 @@ def hall_of_fame():
         top_3_longest_win_streak, \
         top_3_most_roto_points_all_time, \
         top_3_most_top_scoring_weeks, \
-        champions = hall_of_fame_helper(query)
+        champions = cached_fragment("hall_of_fame", None,
+                                    lambda: hall_of_fame_helper(LEAGUE_GAMES.fetchall(db)))
 
+    members = get_member_directory()
     champion_cards = []
     for year, champion in champions.items():
-        first_name, last_name = champion.split(" ")
-        query = db.execute(
-            f"""
-            SELECT {IMG_FILEPATH} from member
-            WHERE {FIRST_NAME}=? AND {LAST_NAME}=?
-            """, (first_name, last_name)
-        ).fetchone()
-        img_src = query[IMG_FILEPATH]
+        img_src = members.get_by_name(champion).img_filepath
 
         champion_cards.append({
             "name": champion,
@@ -2422,51 +2215,35 @@ def hall_of_fame():
                            )
 
 
+def power_rankings_available_version():
+    return get_power_rankings_store().season(CURRENT_SEASON).version, API_CACHE_CONTROL
+
+
 @app.route("/apis/power_rankings_available", methods=["GET", "POST"])
+@conditional(power_rankings_available_version)
 def get_power_rankings_available():
-    base_path = os.path.join(
-        app.root_path, "data", "power_rankings", str(CURRENT_SEASON))
-    power_rankings_path = str(base_path) + "/*"
-    reports = glob.glob(power_rankings_path)
     data = {}
-    for report in reports:
-        week = parse_rankings_filename(report)
+    for week in get_power_rankings_store().season(CURRENT_SEASON).weeks:
         data[str(week)] = f"Week {week}"
 
     return jsonify(data)
 
 
+def all_members_version():
+    return get_generation(get_db(), "member"), API_CACHE_CONTROL
+
+
 @app.route("/apis/all_members", methods=["GET", "POST"])
+@conditional(all_members_version)
 def get_all_members():
     args = request.args
     active_arg = int(args.get("active"))
     db = get_db()
 
-    if active_arg == 0:
-        query = db.execute(
-            f"""
-            SELECT * FROM member
-            WHERE {ACTIVE}=?
-            ORDER BY {LAST_NAME} asc
-            """, (0,)
-        )
-
-    elif active_arg == 1:
-        query = db.execute(
-            f"""
-            SELECT * FROM member
-            WHERE {ACTIVE}=?
-            ORDER BY {LAST_NAME} asc
-            """, (1,)
-        )
-
+    if active_arg in (0, 1):
+        query = MEMBERS_BY_ACTIVE.fetchall(db, active_arg)
     else:
-        query = db.execute(
-            f"""
-            SELECT * FROM member
-            ORDER BY {LAST_NAME} asc
-            """
-        )
+        query = ALL_MEMBERS.fetchall(db)
 
     response = jsonify_members(query)
 
@@ -2474,6 +2251,33 @@ def get_all_members():
     return jsonify(response)
 
 
+@app.route("/apis/db_pool_stats", methods=["GET"])
+@login_required
+def get_db_pool_stats():
+    if not current_user.admin_privileges:
+        return redirect(url_for('homepage'))
+
+    return jsonify(get_pool().stats())
+
+
+@app.route("/apis/query_stats", methods=["GET"])
+@login_required
+def get_query_stats():
+    if not current_user.admin_privileges:
+        return redirect(url_for('homepage'))
+
+    return jsonify(query_stats())
+
+
+@app.route("/apis/fragment_cache_stats", methods=["GET"])
+@login_required
+def get_fragment_cache_stats():
+    if not current_user.admin_privileges:
+        return redirect(url_for('homepage'))
+
+    return jsonify(get_fragment_cache().stats())
+
+
 @login_required
 @app.route("/apis/fetch_games", methods=["GET", "POST"])
 def fetch_games():
@@ -2516,21 +2320,20 @@ def fetch_games():
     updates = []
     new_additions = []
 
+    # Frozen seasons are read-only, only report the differences
+    if year and year.isdigit() and int(year) in get_frozen_seasons(get_db()):
+        write = False
+
     if data:
         for game in data:
-            first_name_home, last_name_home = game[HOME_TEAM].split(" ")
-            member_id_home = get_member_id(first_name_home, last_name_home)
-
-            first_name_away, last_name_away = game[AWAY_TEAM].split(" ")
-            member_id_away = get_member_id(first_name_away, last_name_away)
+            # Names can have spaces in them, so look up the whole name
+            members = get_member_directory()
+            member_id_home = members.get_by_name(game[HOME_TEAM]).member_id
+            member_id_away = members.get_by_name(game[AWAY_TEAM]).member_id
             db = get_db()
-            query = db.execute(
-                f"""
-                SELECT * FROM game
-                WHERE season=? AND week=?
-                AND (team_A_id = ? AND team_B_id = ? OR team_A_id = ? AND team_B_id = ?)                
-                """, (year, game[WEEK], member_id_home, member_id_away, member_id_away, member_id_home)
-            ).fetchone()
+            query = SEASON_WEEK_PAIR_GAME.fetchone(
+                db, year, game[WEEK], min(member_id_home, member_id_away),
+                max(member_id_home, member_id_away), None)
             if query:
                 if query[TEAM_A_SCORE] == game["home_score"] and query[TEAM_B_SCORE] == game["away_score"]:
                     continue
@@ -2553,14 +2356,15 @@ def fetch_games():
                     updates.append(game)
             else:
                 if write:
+                    db.execute("BEGIN IMMEDIATE")
                     db.execute(
                         f"""
                         INSERT INTO game(
-                            {TEAM_A_SCORE}, {TEAM_B_SCORE}, {SEASON}, {WEEK},
+                            {GAME_ID}, {TEAM_A_SCORE}, {TEAM_B_SCORE}, {SEASON}, {WEEK},
                             {MATCHUP_LENGTH}, {PLAYOFFS}, {TEAM_A_ID}, {TEAM_B_ID}
-                        ) VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                        ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
                         """,
-                        (game[HOME_SCORE], game[AWAY_SCORE],
+                        (next_game_id(db), game[HOME_SCORE], game[AWAY_SCORE],
                             game[SEASON], game[WEEK], game[MATCHUP_LENGTH],
                             game[PLAYOFFS], member_id_home, member_id_away)
                     )
@@ -2572,36 +2376,40 @@ def fetch_games():
 
             close_db()
 
+        if write and (updates or new_additions):
+            refresh_member_season_summaries(get_db())
+            close_db()
+
     columns = ["Season", "Week", "Team A Name",
                "Team A Score", "Team B Name", "Team B Score"]
-    updated_df = pd.DataFrame(columns=columns)
+    updated = TableBuilder(columns)
     updated_html = None
 
-    additions_df = pd.DataFrame(columns=columns)
+    additions = TableBuilder(columns)
     additions_html = None
 
     if data:
         for row in updates:
-            updated_df.loc[len(updated_df.index)] = [
+            updated.append([
                 row[SEASON],
                 row[WEEK],
                 row["home_team"],
                 row["home_score"],
                 row["away_team"],
                 row["away_score"]
-            ]
-        updated_html = updated_df.to_html(classes="table table-striped")
+            ])
+        updated_html = updated.to_html(classes="table table-striped")
 
         for row in new_additions:
-            additions_df.loc[len(additions_df)] = [
+            additions.append([
                 row[SEASON],
                 row[WEEK],
                 row["home_team"],
                 row["home_score"],
                 row["away_team"],
                 row["away_score"]
-            ]
-        additions_html = additions_df.to_html(classes="table table-striped")
+            ])
+        additions_html = additions.to_html(classes="table table-striped")
 
     close_db()
     return render_template("fetch_games_results.html",
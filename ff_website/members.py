@@ -0,0 +1,95 @@
+import threading
+from collections import namedtuple
+
+from flask import g
+
+from ff_website.constants import *
+from ff_website.db import get_db
+
+"""
+An in-memory directory of league members, loaded once per process. Every cached copy
+is tagged with the member generation counter, which the triggers on the member table
+bump on any insert, update or delete, so a change made by any worker is picked up on
+the next request.
+"""
+
+
+Member = namedtuple("Member", [MEMBER_ID, FIRST_NAME, LAST_NAME, "name", YEAR_JOINED,
+                               ACTIVE, IMG_FILEPATH])
+
+
+class MemberDirectory(object):
+    def __init__(self, generation, rows):
+        self.generation = generation
+        self.by_id = {}
+        self.by_name = {}
+
+        for row in rows:
+            member = Member(row[MEMBER_ID], row[FIRST_NAME], row[LAST_NAME],
+                            f"{row[FIRST_NAME]} {row[LAST_NAME]}", row[YEAR_JOINED],
+                            row[ACTIVE], row[IMG_FILEPATH])
+            self.by_id[member.member_id] = member
+            self.by_name[member.name] = member
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, member_id):
+        return member_id in self.by_id
+
+    def get(self, member_id):
+        return self.by_id[int(member_id)]
+
+    def get_by_name(self, name):
+        return self.by_name[name]
+
+    def get_id(self, first_name, last_name):
+        return self.by_name[f"{first_name} {last_name}"].member_id
+
+    def get_name(self, member_id):
+        return self.by_id[int(member_id)].name
+
+    def get_avatar(self, member_id):
+        return self.by_id[int(member_id)].img_filepath
+
+    def names(self):
+        """
+        Return {member_id: "First Last"} for every member
+        """
+
+        return {member_id: member.name for member_id, member in self.by_id.items()}
+
+
+_directory = None
+_directory_lock = threading.Lock()
+
+
+def get_generation(db, name):
+    row = db.execute("SELECT value FROM generation WHERE name=?", (name,)).fetchone()
+    return row[0] if row else 0
+
+
+def get_member_directory():
+    """
+    Return the process-wide MemberDirectory, reloading it if the member table has
+    changed since it was built. The generation is only checked once per request.
+    """
+
+    global _directory
+
+    if "member_directory" in g:
+        return g.member_directory
+
+    db = get_db()
+    generation = get_generation(db, "member")
+    directory = _directory
+    if directory is None or directory.generation != generation:
+        with _directory_lock:
+            directory = _directory
+            if directory is None or directory.generation != generation:
+                directory = MemberDirectory(
+                    generation, db.execute("SELECT * FROM member").fetchall())
+                _directory = directory
+
+    g.member_directory = directory
+    return directory
@@ -52,4 +52,4 @@ CREATE TABLE IF NOT EXISTS report
     week INTEGER NOT NULL,
     title TEXT NOT NULL,
     static_url TEXT NOT NULL
-)
\ No newline at end of file
+);
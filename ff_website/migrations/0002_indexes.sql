@@ -0,0 +1,39 @@
+-- Analytics routes read a season's games in week order, the covering columns
+-- let the season/week reads skip the table entirely. game_id directly after week
+-- keeps games within a week in the order they were entered.
+CREATE INDEX IF NOT EXISTS game_season_week
+ON game (season, week, game_id, playoffs, team_A_id, team_B_id, team_A_score, team_B_score, matchup_length);
+
+-- One game per season/week for a pair of members, whichever side is home
+CREATE UNIQUE INDEX IF NOT EXISTS game_season_week_pair
+ON game (season, week, min(team_A_id, team_B_id), max(team_A_id, team_B_id));
+
+-- Member pages and head to head look games up by either side of the matchup
+CREATE INDEX IF NOT EXISTS game_team_A
+ON game (team_A_id, team_B_id, season, week);
+
+CREATE INDEX IF NOT EXISTS game_team_B
+ON game (team_B_id, team_A_id, season, week);
+
+-- Game qualities orders the whole league by combined score and margin
+CREATE INDEX IF NOT EXISTS game_total_score
+ON game (team_A_score + team_B_score);
+
+CREATE INDEX IF NOT EXISTS game_margin
+ON game (abs(team_A_score - team_B_score));
+
+-- Not unique, two members can share a name
+CREATE INDEX IF NOT EXISTS member_name
+ON member (first_name, last_name);
+
+CREATE INDEX IF NOT EXISTS member_active
+ON member (active, last_name);
+
+CREATE UNIQUE INDEX IF NOT EXISTS user_username
+ON user (username);
+
+CREATE UNIQUE INDEX IF NOT EXISTS user_email
+ON user (email);
+
+CREATE INDEX IF NOT EXISTS report_season_week
+ON report (season, week);
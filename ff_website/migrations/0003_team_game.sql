@@ -0,0 +1,79 @@
+-- One row per team per game, kept in sync with game by the triggers below.
+-- Lets per-member and per-score lookups use a single index range instead of
+-- a UNION ALL or an OR over team_A_id/team_B_id.
+CREATE TABLE IF NOT EXISTS team_game
+(
+    game_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    opponent_id INTEGER NOT NULL,
+    points_for FLOAT NOT NULL,
+    points_against FLOAT NOT NULL,
+    result TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    matchup_length INTEGER NOT NULL,
+    playoffs INTEGER NOT NULL,
+    PRIMARY KEY (game_id, member_id),
+    FOREIGN KEY (game_id) REFERENCES game (game_id) ON UPDATE CASCADE ON DELETE CASCADE,
+    FOREIGN KEY (member_id) REFERENCES member (member_id) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS team_game_member
+ON team_game (member_id, season, week, points_for, points_against, result, playoffs);
+
+CREATE INDEX IF NOT EXISTS team_game_points
+ON team_game (points_for, season, week, member_id, matchup_length, playoffs);
+
+CREATE INDEX IF NOT EXISTS team_game_season
+ON team_game (season, week, member_id);
+
+INSERT INTO team_game
+(game_id, member_id, opponent_id, points_for, points_against, result, season, week, matchup_length, playoffs)
+SELECT game_id, member_id, opponent_id, points_for, points_against,
+CASE WHEN points_for > points_against THEN 'W' WHEN points_for < points_against THEN 'L' ELSE 'T' END,
+season, week, matchup_length, playoffs
+FROM (
+    SELECT game_id, team_A_id AS member_id, team_B_id AS opponent_id, team_A_score AS points_for, team_B_score AS points_against,
+    season, week, matchup_length, playoffs
+    FROM game
+    UNION ALL
+    SELECT game_id, team_B_id, team_A_id, team_B_score, team_A_score,
+    season, week, matchup_length, playoffs
+    FROM game
+)
+ORDER BY game_id;
+
+CREATE TRIGGER IF NOT EXISTS team_game_insert
+AFTER INSERT ON game
+BEGIN
+    INSERT INTO team_game
+    (game_id, member_id, opponent_id, points_for, points_against, result, season, week, matchup_length, playoffs)
+    VALUES
+    (NEW.game_id, NEW.team_A_id, NEW.team_B_id, NEW.team_A_score, NEW.team_B_score,
+     CASE WHEN NEW.team_A_score > NEW.team_B_score THEN 'W' WHEN NEW.team_A_score < NEW.team_B_score THEN 'L' ELSE 'T' END,
+     NEW.season, NEW.week, NEW.matchup_length, NEW.playoffs),
+    (NEW.game_id, NEW.team_B_id, NEW.team_A_id, NEW.team_B_score, NEW.team_A_score,
+     CASE WHEN NEW.team_B_score > NEW.team_A_score THEN 'W' WHEN NEW.team_B_score < NEW.team_A_score THEN 'L' ELSE 'T' END,
+     NEW.season, NEW.week, NEW.matchup_length, NEW.playoffs);
+END;
+
+CREATE TRIGGER IF NOT EXISTS team_game_update
+AFTER UPDATE ON game
+BEGIN
+    DELETE FROM team_game WHERE game_id = OLD.game_id;
+    INSERT INTO team_game
+    (game_id, member_id, opponent_id, points_for, points_against, result, season, week, matchup_length, playoffs)
+    VALUES
+    (NEW.game_id, NEW.team_A_id, NEW.team_B_id, NEW.team_A_score, NEW.team_B_score,
+     CASE WHEN NEW.team_A_score > NEW.team_B_score THEN 'W' WHEN NEW.team_A_score < NEW.team_B_score THEN 'L' ELSE 'T' END,
+     NEW.season, NEW.week, NEW.matchup_length, NEW.playoffs),
+    (NEW.game_id, NEW.team_B_id, NEW.team_A_id, NEW.team_B_score, NEW.team_A_score,
+     CASE WHEN NEW.team_B_score > NEW.team_A_score THEN 'W' WHEN NEW.team_B_score < NEW.team_A_score THEN 'L' ELSE 'T' END,
+     NEW.season, NEW.week, NEW.matchup_length, NEW.playoffs);
+END;
+
+CREATE TRIGGER IF NOT EXISTS team_game_delete
+AFTER DELETE ON game
+BEGIN
+    DELETE FROM team_game WHERE game_id = OLD.game_id;
+END;
@@ -0,0 +1,28 @@
+-- Change counters for data cached in memory by each worker process. A process
+-- compares the stored value with the one its cache was built from and reloads
+-- when they differ, so a write in one worker invalidates the others.
+CREATE TABLE IF NOT EXISTS generation
+(
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO generation (name, value) VALUES ('member', 0);
+
+CREATE TRIGGER IF NOT EXISTS member_generation_insert
+AFTER INSERT ON member
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'member';
+END;
+
+CREATE TRIGGER IF NOT EXISTS member_generation_update
+AFTER UPDATE ON member
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'member';
+END;
+
+CREATE TRIGGER IF NOT EXISTS member_generation_delete
+AFTER DELETE ON member
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'member';
+END;
@@ -0,0 +1,46 @@
+-- Each member's record, points and playoff result for every season they played,
+-- so a member page reads one index range instead of rebuilding every season's
+-- standings. Rows are rebuilt by season_summaries.refresh_member_season_summaries
+-- after every write to game, so pages only ever read them.
+CREATE TABLE IF NOT EXISTS member_season_summary
+(
+    member_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    tpf FLOAT NOT NULL,
+    tpa FLOAT NOT NULL,
+    playoffs INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    finish TEXT,
+    playoffs_done INTEGER NOT NULL,
+    PRIMARY KEY (member_id, season)
+) WITHOUT ROWID;
+
+-- Seasons whose summaries need rebuilding. Any change to a season's games marks
+-- it. Seasons already archived aren't in game, apply_migrations marks those.
+CREATE TABLE IF NOT EXISTS member_season_summary_stale
+(
+    season INTEGER PRIMARY KEY
+);
+
+INSERT OR IGNORE INTO member_season_summary_stale (season)
+SELECT DISTINCT season FROM game;
+
+CREATE TRIGGER IF NOT EXISTS member_season_summary_insert
+AFTER INSERT ON game
+BEGIN
+    INSERT OR IGNORE INTO member_season_summary_stale (season) VALUES (NEW.season);
+END;
+
+CREATE TRIGGER IF NOT EXISTS member_season_summary_update
+AFTER UPDATE ON game
+BEGIN
+    INSERT OR IGNORE INTO member_season_summary_stale (season) VALUES (OLD.season), (NEW.season);
+END;
+
+CREATE TRIGGER IF NOT EXISTS member_season_summary_delete
+AFTER DELETE ON game
+BEGIN
+    INSERT OR IGNORE INTO member_season_summary_stale (season) VALUES (OLD.season);
+END;
@@ -0,0 +1,40 @@
+-- Bumped by any write to game or member, whichever route, command or restore
+-- made it. Rendered fragments are cached against this value, so a write makes
+-- every cached fragment built before it unreachable.
+INSERT OR IGNORE INTO generation (name, value) VALUES ('data', 0);
+
+CREATE TRIGGER IF NOT EXISTS data_generation_game_insert
+AFTER INSERT ON game
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'data';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_game_update
+AFTER UPDATE ON game
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'data';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_game_delete
+AFTER DELETE ON game
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'data';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_member_insert
+AFTER INSERT ON member
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'data';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_member_update
+AFTER UPDATE ON member
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'data';
+END;
+
+CREATE TRIGGER IF NOT EXISTS data_generation_member_delete
+AFTER DELETE ON member
+BEGIN
+    UPDATE generation SET value = value + 1 WHERE name = 'data';
+END;
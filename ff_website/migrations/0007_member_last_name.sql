@@ -0,0 +1,3 @@
+-- /apis/all_members?active=2 lists every member by last name
+CREATE INDEX IF NOT EXISTS member_last_name
+ON member (last_name);
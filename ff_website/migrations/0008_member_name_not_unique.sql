@@ -0,0 +1,6 @@
+-- 0002 made member_name unique, which databases that already applied it still
+-- have. Two members can share a name, the analytics key on member_id.
+DROP INDEX IF EXISTS member_name;
+
+CREATE INDEX IF NOT EXISTS member_name
+ON member (first_name, last_name);
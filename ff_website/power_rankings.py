@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+
+from ff_website.constants import *
+from ff_website.helper_functions import parse_rankings_filename
+
+"""
+An in-memory index of the weekly power rankings and the archived season settings,
+both stored as JSON files under data/. A season's rankings are reloaded whenever
+its directory's mtime changes, which any worker adding or removing a week causes,
+and the routes that write them also invalidate the season straight away.
+"""
+
+
+POWER_RANKING_COLORS = ["lightCoral", "crimson", "hotPink", "orange", "gold", "indigo",
+                        "slateBlue", "greenYellow", "darkGreen", "dodgerBlue", "silver", "black"]
+
+
+class SeasonRankings(object):
+    """
+    Every weekly power ranking of one season, with the rank changes and the chart
+    series the power rankings page shows already worked out
+    """
+
+    def __init__(self, season, version, reports):
+        self.season = season
+        self.version = version
+        # week -> filename and week -> OrderedDict(member -> {"rank", "change"})
+        self.filenames = {}
+        self.infos = {}
+        self.weeks = []
+
+        graph_data = {}
+        previous = None
+        for filename, rankings in sorted(reports, key=lambda report: int(parse_rankings_filename(report[0]))):
+            week = int(parse_rankings_filename(filename))
+            info = OrderedDict()
+            for index, member in enumerate(rankings):
+                # Compared with the previous ranking, however many weeks ago it was
+                change = 0
+                if previous and member in previous:
+                    change = previous[member]["rank"] - (index + 1)
+                info[member] = {"rank": index + 1, "change": change}
+                graph_data.setdefault(member, []).append((week, index + 1))
+
+            self.weeks.append(week)
+            self.filenames[week] = filename
+            self.infos[week] = info
+            previous = info
+
+        self.chart = []
+        for color_index, (member_name, data) in enumerate(graph_data.items()):
+            self.chart.append(
+                {
+                    "title": '"' + member_name + '"',
+                    "key": "".join(member_name.split()),
+                    "xvalues": [x[0] for x in data],
+                    "yvalues": [y[1] for y in data],
+                    "color": '"' + POWER_RANKING_COLORS[color_index % len(POWER_RANKING_COLORS)] + '"'
+                }
+            )
+        self.chart.sort(key=lambda x: x["title"].split(" ")[1][0])
+
+    def __len__(self):
+        return len(self.weeks)
+
+    def __contains__(self, week):
+        return week in self.infos
+
+    def latest_week(self):
+        return self.weeks[-1] if self.weeks else None
+
+    def info(self, week):
+        return self.infos[week]
+
+
+class PowerRankingsStore(object):
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._seasons = {}
+        self._settings = {}
+        self._lock = threading.Lock()
+
+    def season_dir(self, season):
+        return os.path.join(self.data_dir, "power_rankings", str(season))
+
+    def season(self, season):
+        """
+        Return the SeasonRankings of a season, reading its files again only if
+        the directory has changed since they were last read
+        """
+
+        directory = self.season_dir(season)
+        try:
+            version = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            version = None
+
+        rankings = self._seasons.get(season)
+        if rankings is None or rankings.version != version:
+            with self._lock:
+                rankings = self._seasons.get(season)
+                if rankings is None or rankings.version != version:
+                    rankings = SeasonRankings(season, version, self.read_season(directory, version))
+                    self._seasons[season] = rankings
+        return rankings
+
+    def read_season(self, directory, version):
+        if version is None:
+            return []
+
+        reports = []
+        for filename in os.listdir(directory):
+            with open(os.path.join(directory, filename), "r") as f:
+                reports.append((filename, json.load(f)["rankings"]))
+        return reports
+
+    def invalidate(self, season=None):
+        with self._lock:
+            if season is None:
+                self._seasons.clear()
+            else:
+                self._seasons.pop(season, None)
+
+    def season_settings(self, year):
+        """
+        Return the archived league settings of a season, re-read if the file changes,
+        or None if the season has none
+        """
+
+        path = os.path.join(self.data_dir, "season_settings_archives", f"{int(year)}_season_settings.json")
+        try:
+            version = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        cached = self._settings.get(path)
+        if cached is None or cached[0] != version:
+            with open(path, "r") as f:
+                cached = (version, json.load(f))
+            with self._lock:
+                self._settings[path] = cached
+        return cached[1]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_power_rankings_store():
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PowerRankingsStore(os.path.join(current_app.root_path, "data"))
+    return _store
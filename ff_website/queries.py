@@ -0,0 +1,380 @@
+import threading
+import time
+from operator import itemgetter
+
+from ff_website.constants import *
+
+"""
+Named, parameterized queries shared by the routes. Every statement is built once at
+import time, so the SQL text is identical on every call and sqlite3's per-connection
+statement cache reuses the prepared statement instead of re-parsing it.
+"""
+
+
+def result_type(name, columns):
+    """
+    Build a typed, tuple backed result class for the given columns. Values can be
+    read by attribute (row.season) or by column name (row[SEASON]) like sqlite3.Row.
+    """
+
+    positions = {column: index for index, column in enumerate(columns)}
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            return tuple.__getitem__(self, positions[key])
+        return tuple.__getitem__(self, key)
+
+    def __repr__(self):
+        values = ", ".join(f"{column}={value!r}" for column, value in zip(columns, self))
+        return f"{name}({values})"
+
+    attributes = {
+        "__slots__": (),
+        "_fields": tuple(columns),
+        "__getitem__": __getitem__,
+        "__repr__": __repr__,
+        "keys": lambda self: list(columns)
+    }
+    for column, index in positions.items():
+        attributes[column] = property(itemgetter(index))
+
+    return type(name, (tuple,), attributes)
+
+
+_timing_hooks = []
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def add_timing_hook(hook):
+    """
+    Register a callable that is called as hook(query_name, seconds, num_rows)
+    after every named query runs
+    """
+
+    _timing_hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    _timing_hooks.remove(hook)
+
+
+def record_query_stats(name, seconds, num_rows):
+    with _stats_lock:
+        stats = _stats.setdefault(name, {"calls": 0, "total_time": 0.0, "rows": 0})
+        stats["calls"] += 1
+        stats["total_time"] += seconds
+        stats["rows"] += num_rows
+
+
+def query_stats():
+    with _stats_lock:
+        return {
+            name: {
+                "calls": stats["calls"],
+                "rows": stats["rows"],
+                "total_time": round(stats["total_time"], 6),
+                "mean_time": round(stats["total_time"] / stats["calls"], 6)
+            }
+            for name, stats in _stats.items()
+        }
+
+
+add_timing_hook(record_query_stats)
+
+
+# Every named query, by name
+REGISTRY = {}
+
+
+class Query(object):
+    def __init__(self, name, sql, columns, example_params=(), row_type=None):
+        self.name = name
+        self.sql = sql
+        self.columns = columns
+        self.row_type = row_type or result_type(
+            "".join(part.capitalize() for part in name.split("_")) + "Row", columns)
+
+        # Used by check-query-plans to EXPLAIN the statement
+        self.example_params = example_params
+
+        REGISTRY[name] = self
+
+    def __repr__(self):
+        return f"Query({self.name})"
+
+    def _run(self, db, params, fetch):
+        start = time.perf_counter()
+        cursor = db.cursor()
+        cursor.row_factory = None
+        cursor.execute(self.sql, params)
+        rows = fetch(cursor)
+        elapsed = time.perf_counter() - start
+
+        for hook in _timing_hooks:
+            hook(self.name, elapsed, len(rows))
+        return rows
+
+    def fetchall(self, db, *params):
+        row_type = self.row_type
+        return [row_type(row) for row in self._run(db, params, lambda c: c.fetchall())]
+
+    def fetchone(self, db, *params):
+        rows = self._run(db, params, lambda c: c.fetchmany(1))
+        return self.row_type(rows[0]) if rows else None
+
+
+GAME_COLUMNS = [GAME_ID, TEAM_A_ID, TEAM_B_ID, TEAM_A_SCORE, TEAM_B_SCORE, SEASON, WEEK,
+                MATCHUP_LENGTH, PLAYOFFS, "team_A_first_name", "team_A_last_name",
+                "team_B_first_name", "team_B_last_name"]
+
+
+class Game(object):
+    """
+    One row of a game query. The analytics helpers read hundreds of thousands of
+    fields per page, so the values live in slots and are read as plain attributes
+    (game.team_A_score). game["team_A_score"] and game[3] still work for the
+    routes and templates, but are slower.
+    """
+
+    __slots__ = tuple(GAME_COLUMNS)
+    _fields = tuple(GAME_COLUMNS)
+
+    def __init__(self, values):
+        (self.game_id, self.team_A_id, self.team_B_id, self.team_A_score, self.team_B_score,
+         self.season, self.week, self.matchup_length, self.playoffs,
+         self.team_A_first_name, self.team_A_last_name,
+         self.team_B_first_name, self.team_B_last_name) = values
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            return getattr(self, key)
+        return getattr(self, GAME_COLUMNS[key])
+
+    def __iter__(self):
+        return (getattr(self, column) for column in GAME_COLUMNS)
+
+    def __len__(self):
+        return len(GAME_COLUMNS)
+
+    def __eq__(self, other):
+        return isinstance(other, Game) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        values = ", ".join(f"{column}={getattr(self, column)!r}" for column in GAME_COLUMNS)
+        return f"Game({values})"
+
+    def keys(self):
+        return list(GAME_COLUMNS)
+
+
+def game_query(name, where="", example_params=()):
+    """
+    The game/member join every analytics page reads, with both member names attached.
+    Reads all_games so frozen seasons in the archive database are included.
+    Games within a week stay in the order they were entered.
+    """
+
+    sql = f"""
+        SELECT game_id, team_A_id, team_B_id, team_A_score, team_B_score, season, week, matchup_length, playoffs,
+        t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
+        FROM all_games
+        INNER JOIN member t2
+        ON t2.member_id = team_A_id
+        INNER JOIN member t3
+        ON t3.member_id = team_B_id
+        {where}
+        ORDER BY
+        {SEASON} ASC,
+        {WEEK} ASC,
+        {GAME_ID} ASC
+        """
+    return Query(name, sql, GAME_COLUMNS, example_params, row_type=Game)
+
+
+LEAGUE_GAMES = game_query("league_games")
+
+SEASON_GAMES = game_query(
+    "season_games",
+    f"WHERE {SEASON}=?",
+    (CURRENT_SEASON,))
+
+SEASON_GAMES_BY_FORMAT = game_query(
+    "season_games_by_format",
+    f"WHERE {SEASON}=? AND {PLAYOFFS}=?",
+    (CURRENT_SEASON, 0))
+
+MEMBER_GAMES = game_query(
+    "member_games",
+    f"WHERE {TEAM_A_ID}=? OR {TEAM_B_ID}=?",
+    (1, 1))
+
+MEMBER_SEASON_SUMMARIES = Query(
+    "member_season_summaries",
+    f"""
+    SELECT {SEASON}, wins, losses, tpf, tpa, playoffs, seed, finish, playoffs_done
+    FROM member_season_summary
+    WHERE {MEMBER_ID}=?
+    ORDER BY
+    {SEASON} ASC
+    """,
+    [SEASON, "wins", "losses", "tpf", "tpa", PLAYOFFS, "seed", "finish", "playoffs_done"],
+    (1,))
+
+ACTIVE_MEMBER_NAMES = Query(
+    "active_member_names",
+    f"""
+    SELECT {FIRST_NAME}, {LAST_NAME}
+    FROM member
+    WHERE {ACTIVE}=?
+    ORDER BY
+    {LAST_NAME} ASC
+    """,
+    [FIRST_NAME, LAST_NAME],
+    (1,))
+
+MEMBER_COLUMNS = [MEMBER_ID, FIRST_NAME, LAST_NAME, YEAR_JOINED, ACTIVE, IMG_FILEPATH]
+
+MEMBERS_BY_ACTIVE = Query(
+    "members_by_active",
+    f"""
+    SELECT {", ".join(MEMBER_COLUMNS)}
+    FROM member
+    WHERE {ACTIVE}=?
+    ORDER BY
+    {LAST_NAME} ASC
+    """,
+    MEMBER_COLUMNS,
+    (1,))
+
+ALL_MEMBERS = Query(
+    "all_members",
+    f"""
+    SELECT {", ".join(MEMBER_COLUMNS)}
+    FROM member
+    ORDER BY
+    {LAST_NAME} ASC
+    """,
+    MEMBER_COLUMNS)
+
+# Pass member_id=None unless an existing member is being renamed
+MEMBER_BY_NAME = Query(
+    "member_by_name",
+    f"""
+    SELECT {MEMBER_ID}
+    FROM member
+    WHERE {FIRST_NAME}=? AND {LAST_NAME}=? AND {MEMBER_ID} IS NOT ?
+    """,
+    [MEMBER_ID],
+    ("Garrett", "Folbe", None))
+
+USER_COLUMNS = [USER_ID, USERNAME, EMAIL, PASSWORD, ADMIN_PRIVILEGES, ANNOUNCEMENT_PRIVILEGES]
+
+USER_BY_LOGIN = Query(
+    "user_by_login",
+    f"""
+    SELECT {", ".join(USER_COLUMNS)}
+    FROM user
+    WHERE {USERNAME}=? OR {EMAIL}=?
+    """,
+    USER_COLUMNS,
+    ("admin", "admin"))
+
+REPORT_BY_WEEK = Query(
+    "report_by_week",
+    f"""
+    SELECT report_id
+    FROM report
+    WHERE {SEASON}=? AND {WEEK}=?
+    """,
+    ["report_id"],
+    (CURRENT_SEASON, 1))
+
+# Matches the game_season_week_pair index, whichever member is team A. Pass
+# game_id=None unless an existing game is being moved.
+SEASON_WEEK_PAIR_GAME = Query(
+    "season_week_pair_game",
+    f"""
+    SELECT {GAME_ID}, {TEAM_A_ID}, {TEAM_B_ID}, {TEAM_A_SCORE}, {TEAM_B_SCORE}
+    FROM all_games
+    WHERE {SEASON}=? AND {WEEK}=?
+    AND min({TEAM_A_ID}, {TEAM_B_ID})=? AND max({TEAM_A_ID}, {TEAM_B_ID})=?
+    AND {GAME_ID} IS NOT ?
+    """,
+    [GAME_ID, TEAM_A_ID, TEAM_B_ID, TEAM_A_SCORE, TEAM_B_SCORE],
+    (CURRENT_SEASON, 1, 1, 2, None))
+
+HEAD_TO_HEAD_COLUMNS = [TEAM_A_SCORE, TEAM_B_SCORE, SEASON, WEEK, MATCHUP_LENGTH, PLAYOFFS,
+                        "team_A_first_name", "team_A_last_name", "team_A_img_filepath", "member_A_id",
+                        "team_B_first_name", "team_B_last_name", "team_B_img_filepath", "member_B_id"]
+
+HEAD_TO_HEAD_GAMES = Query(
+    "head_to_head_games",
+    f"""
+    SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs,
+    t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t2.img_filepath as team_A_img_filepath, t2.member_id as member_A_id,
+    t3.first_name as team_B_first_name, t3.last_name as team_B_last_name, t3.img_filepath as team_B_img_filepath, t3.member_id as member_B_id
+    FROM all_games
+    INNER JOIN member t2
+    ON t2.member_id = team_A_id
+    INNER JOIN member t3
+    ON t3.member_id = team_B_id
+    WHERE team_A_id = ? AND team_B_id = ? OR team_A_id = ? AND team_B_id = ?
+    ORDER BY
+    {SEASON} ASC,
+    {WEEK} ASC
+    """,
+    HEAD_TO_HEAD_COLUMNS,
+    (1, 2, 2, 1))
+
+
+def game_quality_query(name, value, order):
+    """
+    The game qualities ranking of whole games, by value (total_score or margin).
+    Takes the number of results as its parameter.
+    """
+
+    expressions = {
+        "total_score": "team_A_score+team_B_score",
+        "margin": "abs(team_A_score-team_B_score)"
+    }
+    sql = f"""
+        SELECT team_A_score, team_B_score, season, week, matchup_length, playoffs, {expressions[value]} as {value},
+        t2.first_name as team_A_first_name, t2.last_name as team_A_last_name, t3.first_name as team_B_first_name, t3.last_name as team_B_last_name
+        FROM all_games
+        INNER JOIN member t2
+        ON t2.member_id = team_A_id
+        INNER JOIN member t3
+        ON t3.member_id = team_B_id
+        ORDER BY {value} {order} LIMIT ?
+        """
+    columns = [TEAM_A_SCORE, TEAM_B_SCORE, SEASON, WEEK, MATCHUP_LENGTH, PLAYOFFS, value,
+               "team_A_first_name", "team_A_last_name", "team_B_first_name", "team_B_last_name"]
+    return Query(name, sql, columns, (10,))
+
+
+def team_game_quality_query(name, order):
+    """
+    The game qualities ranking of individual scores. Takes the number of results.
+    """
+
+    sql = f"""
+        SELECT points_for as points, season, week, matchup_length, playoffs, team_game.member_id as team_id, first_name, last_name
+        FROM all_team_games team_game
+        INNER JOIN member
+        ON member.member_id = team_game.member_id
+        ORDER BY points {order} LIMIT ?
+        """
+    columns = ["points", SEASON, WEEK, MATCHUP_LENGTH, PLAYOFFS, "team_id", FIRST_NAME, LAST_NAME]
+    return Query(name, sql, columns, (10,))
+
+
+FEWEST_COMBINED_POINTS = game_quality_query("fewest_combined_points", "total_score", "ASC")
+MOST_COMBINED_POINTS = game_quality_query("most_combined_points", "total_score", "DESC")
+LARGEST_MARGIN = game_quality_query("largest_margin", "margin", "DESC")
+SMALLEST_MARGIN = game_quality_query("smallest_margin", "margin", "ASC")
+FEWEST_INDIVIDUAL_POINTS = team_game_quality_query("fewest_individual_points", "ASC")
+MOST_INDIVIDUAL_POINTS = team_game_quality_query("most_individual_points", "DESC")
@@ -0,0 +1,383 @@
+import threading
+from collections import OrderedDict
+from operator import attrgetter
+
+import numpy as np
+import pandas as pd
+
+from ff_website.constants import *
+
+"""
+Columnar view of a list of games for the analytics in helper_functions. The rows are
+converted to NumPy arrays once, with every team replaced by an integer code, so the
+per-season aggregates become a handful of vectorised calls instead of a Python loop
+with a DataFrame write per game.
+"""
+
+
+# SeasonFrames built recently, keyed on the list of rows they were built from. The
+# helpers pass the same list around (get_playoffs, get_roto, ... all call
+# get_standings), so each list is only converted once.
+FRAME_CACHE_SIZE = 64
+_frames = OrderedDict()
+_frames_lock = threading.Lock()
+
+
+def interleave(a, b):
+    """
+    Return [a[0], b[0], a[1], b[1], ...]. Sums taken over the result add each
+    team's values in game order, exactly like the row-at-a-time loop did.
+    """
+
+    out = np.empty(len(a) + len(b), dtype=np.result_type(a, b))
+    out[0::2] = a
+    out[1::2] = b
+    return out
+
+
+def roto_ranks(scores):
+    """
+    Rank every row of a weeks x teams score matrix: the lowest score in a week gets
+    0 roto points and the highest gets teams - 1. Teams tied on a score share the
+    lower of the ranks they span.
+    """
+
+    ordinal = np.argsort(np.argsort(scores, axis=1, kind="stable"), axis=1, kind="stable")
+
+    ordered = np.sort(scores, axis=1)
+    starts = np.ones(ordered.shape, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    lowest = np.maximum.accumulate(
+        np.where(starts, np.arange(scores.shape[1]), 0), axis=1)
+
+    return np.take_along_axis(lowest, ordinal, axis=1)
+
+
+class SeasonFrame(object):
+    """
+    Games as parallel NumPy arrays. Teams are coded 0..n-1 in alphabetical order of
+    their names, the same order get_league_members returns them in. index maps a
+    member_id to its code, names are only needed to label the results.
+    """
+
+    def __init__(self, query):
+        self.query = query
+        self.num_games = len(query)
+
+        def column(name, dtype):
+            return np.array(list(map(attrgetter(name), query)), dtype=dtype)
+
+        team_A_ids = column(TEAM_A_ID, np.int64)
+        team_B_ids = column(TEAM_B_ID, np.int64)
+
+        # Only build a name string once per team, not once per game
+        member_ids, first = np.unique(
+            np.concatenate((team_A_ids, team_B_ids)), return_index=True)
+        names = []
+        for index in first.tolist():
+            if index < self.num_games:
+                row = query[index]
+                names.append(f"{row.team_A_first_name} {row.team_A_last_name}")
+            else:
+                row = query[index - self.num_games]
+                names.append(f"{row.team_B_first_name} {row.team_B_last_name}")
+
+        order = sorted(range(len(names)), key=names.__getitem__)
+        codes = np.empty(len(names), dtype=np.int64)
+        codes[order] = np.arange(len(names))
+
+        self.names = [names[i] for i in order]
+        self.codes = {name: code for code, name in enumerate(self.names)}
+        self.member_ids = member_ids[order]
+        self.index = {member_id: code for code, member_id in enumerate(self.member_ids.tolist())}
+        self.num_teams = len(self.names)
+
+        self.team_A = codes[np.searchsorted(member_ids, team_A_ids)]
+        self.team_B = codes[np.searchsorted(member_ids, team_B_ids)]
+        self.team_A_score = column(TEAM_A_SCORE, np.float64)
+        self.team_B_score = column(TEAM_B_SCORE, np.float64)
+        self.season = column(SEASON, np.int64)
+        self.week = column(WEEK, np.int64)
+        self.matchup_length = column(MATCHUP_LENGTH, np.int64)
+        self.playoffs = column(PLAYOFFS, bool)
+
+        # Derived matrices, built on first use
+        self._memo = {}
+
+    def __repr__(self):
+        return f"SeasonFrame({self.num_games} games, {self.num_teams} teams)"
+
+    @classmethod
+    def of(cls, query):
+        """
+        Return the SeasonFrame for a list of rows, reusing the one built for the
+        same list object if there is one
+        """
+
+        if isinstance(query, cls):
+            return query
+
+        key = id(query)
+        with _frames_lock:
+            frame = _frames.get(key)
+            if frame is not None and frame.query is query and frame.num_games == len(query):
+                _frames.move_to_end(key)
+                return frame
+
+        frame = cls(query)
+        with _frames_lock:
+            _frames[key] = frame
+            while len(_frames) > FRAME_CACHE_SIZE:
+                _frames.popitem(last=False)
+        return frame
+
+    def games(self, include_playoffs=False):
+        """
+        Return a boolean mask of the games that count towards the standings
+        """
+
+        if include_playoffs:
+            return np.ones(self.num_games, dtype=bool)
+        return ~self.playoffs
+
+    def score_matrix(self):
+        """
+        Return (weeks, scores): the regular season weeks in the order they were
+        played, and a weeks x teams matrix of each team's score, 0.0 if it did not play.
+        A week is a (season, week) pair, so a frame can span several seasons.
+        """
+
+        if "scores" not in self._memo:
+            mask = ~self.playoffs
+            key = self.season[mask] * 100 + self.week[mask]
+            keys, first = np.unique(key, return_index=True)
+            order = np.argsort(first, kind="stable")
+            rows = np.empty(len(keys), dtype=np.int64)
+            rows[order] = np.arange(len(keys))
+            week_rows = rows[np.searchsorted(keys, key)]
+            rows = interleave(week_rows, week_rows)
+            teams = interleave(self.team_A[mask], self.team_B[mask])
+
+            # Interleaved so a later game overwrites an earlier one, as it did row by row
+            scores = np.zeros((len(keys), self.num_teams))
+            scores[rows, teams] = interleave(self.team_A_score[mask], self.team_B_score[mask])
+            played = np.zeros((len(keys), self.num_teams), dtype=bool)
+            played[rows, teams] = True
+            won = np.zeros((len(keys), self.num_teams), dtype=bool)
+            won[rows, teams] = interleave(self.team_A_score[mask] > self.team_B_score[mask],
+                                          self.team_B_score[mask] > self.team_A_score[mask])
+            opponents = np.full((len(keys), self.num_teams), -1, dtype=np.int64)
+            opponents[rows, teams] = interleave(self.team_B[mask], self.team_A[mask])
+
+            self._memo["scores"] = (keys[order] % 100, scores)
+            self._memo["played"] = played
+            self._memo["won"] = won
+            self._memo["opponents"] = opponents
+        return self._memo["scores"]
+
+    def played_matrix(self):
+        """
+        Return the weeks x teams matrix of which teams played in each week of
+        score_matrix
+        """
+
+        self.score_matrix()
+        return self._memo["played"]
+
+    def won_matrix(self):
+        """
+        Return the weeks x teams matrix of which teams won their game in each week
+        of score_matrix. Nobody wins a tied game.
+        """
+
+        self.score_matrix()
+        return self._memo["won"]
+
+    def opponent_matrix(self):
+        """
+        Return the weeks x teams matrix of each team's opponent code in each week
+        of score_matrix, -1 if it did not play
+        """
+
+        self.score_matrix()
+        return self._memo["opponents"]
+
+    def weekly_ranks(self):
+        """
+        Return (ranks, sizes): roto points among only the teams that played each
+        week (-1 for teams that did not), and how many teams played each week
+        """
+
+        if "weekly_ranks" not in self._memo:
+            _, scores = self.score_matrix()
+            played = self.played_matrix()
+            missing = (~played).sum(axis=1, keepdims=True)
+
+            # Teams that did not play sort below everyone and share the lowest rank
+            ranks = roto_ranks(np.where(played, scores, -np.inf)) - missing
+            self._memo["weekly_ranks"] = (np.where(played, ranks, -1), played.sum(axis=1))
+        return self._memo["weekly_ranks"]
+
+    def tier_records(self, num_tiers):
+        """
+        Return (wins, losses): teams x tiers counts of results by how a team's score
+        ranked that week. Tier 0 holds the lowest scorers. Each week is split into
+        num_tiers equal bands of however many teams played, so seasons with
+        different league sizes can be combined.
+        """
+
+        ranks, sizes = self.weekly_ranks()
+        played = self.played_matrix()
+        won = self.won_matrix()
+
+        tiers = (ranks * num_tiers) // np.maximum(sizes, 1)[:, None]
+        cells = np.arange(self.num_teams) * num_tiers + tiers
+
+        size = self.num_teams * num_tiers
+        wins = np.bincount(cells[played & won], minlength=size)
+        losses = np.bincount(cells[played & ~won], minlength=size)
+        return wins.reshape(self.num_teams, num_tiers), losses.reshape(self.num_teams, num_tiers)
+
+    def league_size(self):
+        """
+        Return the number of teams that usually played in a week
+        """
+
+        _, sizes = self.weekly_ranks()
+        return int(np.bincount(sizes).argmax()) if len(sizes) else self.num_teams
+
+    def all_play(self):
+        """
+        Return (wins, games): teams x teams matrices of how often each team
+        outscored each other team, and how many weeks they both played. The record
+        of team a against team b is wins[a, b]-(games[a, b] - wins[a, b]).
+        """
+
+        if "all_play" not in self._memo:
+            _, scores = self.score_matrix()
+            played = self.played_matrix()
+            both = played[:, :, None] & played[:, None, :]
+            wins = ((scores[:, :, None] > scores[:, None, :]) & both).sum(axis=0)
+            self._memo["all_play"] = (wins, both.sum(axis=0))
+        return self._memo["all_play"]
+
+    def roto_matrix(self):
+        """
+        Return (weeks, roto): the weeks x teams matrix of roto points
+        """
+
+        if "roto" not in self._memo:
+            weeks, scores = self.score_matrix()
+            self._memo["roto"] = (weeks, roto_ranks(scores))
+        return self._memo["roto"]
+
+    def totals(self, mask):
+        """
+        Return per-team (wins, losses, points for, points against) over the masked
+        games. A tied game goes to team B, as it always has.
+        """
+
+        team_A, team_B = self.team_A[mask], self.team_B[mask]
+        team_A_score, team_B_score = self.team_A_score[mask], self.team_B_score[mask]
+
+        teams = interleave(team_A, team_B)
+        points_for = np.bincount(teams, weights=interleave(team_A_score, team_B_score),
+                                 minlength=self.num_teams)
+        points_against = np.bincount(teams, weights=interleave(team_B_score, team_A_score),
+                                     minlength=self.num_teams)
+
+        team_A_won = team_A_score > team_B_score
+        wins = np.bincount(np.where(team_A_won, team_A, team_B), minlength=self.num_teams)
+        losses = np.bincount(np.where(team_A_won, team_B, team_A), minlength=self.num_teams)
+
+        return wins, losses, points_for, points_against
+
+    def cumulative_totals(self, include_playoffs=False):
+        """
+        Return (keys, wins, losses, points for, points against): the season*100+week
+        of every week with a game, in order, and weeks x teams matrices of each
+        team's totals after that week. Built in one pass, as the running sum of
+        each week's results, instead of a set of standings per week.
+        """
+
+        memo_key = ("cumulative", include_playoffs)
+        if memo_key not in self._memo:
+            mask = self.games(include_playoffs)
+            team_A, team_B = self.team_A[mask], self.team_B[mask]
+            team_A_score, team_B_score = self.team_A_score[mask], self.team_B_score[mask]
+
+            keys, rows = np.unique(self.season[mask] * 100 + self.week[mask], return_inverse=True)
+            shape = (len(keys), self.num_teams)
+            size = shape[0] * shape[1]
+
+            cells = interleave(rows, rows) * self.num_teams + interleave(team_A, team_B)
+            points_for = np.bincount(cells, weights=interleave(team_A_score, team_B_score),
+                                     minlength=size)
+            points_against = np.bincount(cells, weights=interleave(team_B_score, team_A_score),
+                                         minlength=size)
+
+            team_A_won = team_A_score > team_B_score
+            rows = rows * self.num_teams
+            wins = np.bincount(rows + np.where(team_A_won, team_A, team_B), minlength=size)
+            losses = np.bincount(rows + np.where(team_A_won, team_B, team_A), minlength=size)
+
+            self._memo[memo_key] = (keys,) + tuple(
+                np.cumsum(delta.reshape(shape), axis=0)
+                for delta in (wins, losses, points_for, points_against))
+        return self._memo[memo_key]
+
+    def totals_as_of(self, season, week, include_playoffs=False):
+        """
+        Return per-team (wins, losses, points for, points against) counting every
+        game up to and including the given week
+        """
+
+        keys, *totals = self.cumulative_totals(include_playoffs)
+        index = np.searchsorted(keys, season * 100 + week, side="right") - 1
+        if index < 0:
+            return tuple(np.zeros(self.num_teams, dtype=total.dtype) for total in totals)
+        return tuple(total[index] for total in totals)
+
+    def name(self, member_id):
+        return self.names[self.index[member_id]]
+
+    def seeds(self, include_playoffs=False):
+        """
+        Return every team's place in the standings, 1 for first, by team code
+        """
+
+        wins, _, points_for, _ = self.totals(self.games(include_playoffs))
+        seeds = np.empty(self.num_teams, dtype=np.int64)
+        seeds[np.lexsort((-points_for, -wins))] = np.arange(1, self.num_teams + 1)
+        return seeds
+
+    def standings(self, include_playoffs=False):
+        """
+        Return (standings, ranks) in the shape get_standings has always returned:
+        a DataFrame of Wins, Losses, PF and PA sorted by wins then points for, and
+        {name: rank}
+        """
+
+        return self.rank(*self.totals(self.games(include_playoffs)))
+
+    def standings_as_of(self, season, week, include_playoffs=False):
+        """
+        Return (standings, ranks) as they stood after the given week
+        """
+
+        return self.rank(*self.totals_as_of(season, week, include_playoffs))
+
+    def rank(self, wins, losses, points_for, points_against):
+        # lexsort is stable, so teams level on wins and points stay alphabetical
+        order = np.lexsort((-points_for, -wins))
+        names = [self.names[i] for i in order.tolist()]
+
+        df = pd.DataFrame({
+            "Wins": wins[order].astype("int64"),
+            "Losses": losses[order].astype("int64"),
+            "PF": points_for[order],
+            "PA": points_against[order]
+        }, index=pd.Index(names, dtype=object))
+
+        ranks = {name: rank for rank, name in enumerate(names, 1)}
+        return df, ranks
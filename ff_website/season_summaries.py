@@ -0,0 +1,119 @@
+from ff_website.constants import *
+from ff_website.helper_functions import (TableBuilder, get_playoff_finish, get_playoffs,
+                                         ordinal)
+from ff_website.queries import MEMBER_SEASON_SUMMARIES, SEASON_GAMES
+from ff_website.season_frame import SeasonFrame
+
+"""
+Per member, per season summaries for the member pages, kept in the
+member_season_summary table. The triggers on game mark a season stale whenever one
+of its games changes, and whatever wrote the games then rebuilds just those seasons,
+so a member page only ever reads the table.
+"""
+
+
+def get_season_summaries(query):
+    """
+    Return a (member_id, season, wins, losses, tpf, tpa, playoffs, seed, finish,
+    playoffs_done) row for every member who played in a season's games
+    """
+
+    if not query:
+        return []
+
+    season = query[0].season
+    frame = SeasonFrame.of(query)
+    wins, losses, points_for, points_against = frame.totals(frame.games())
+    seeds = frame.seeds()
+    playoffs = get_playoffs(query)
+
+    rows = []
+    for code, member_id in enumerate(frame.member_ids.tolist()):
+        _, finish, playoffs_done = get_playoff_finish(playoffs, int(seeds[code]), member_id)
+        rows.append((
+            member_id,
+            season,
+            int(wins[code]),
+            int(losses[code]),
+            float(points_for[code]),
+            float(points_against[code]),
+            finish != "DNQ",
+            int(seeds[code]),
+            None if finish == "DNQ" else finish,
+            playoffs_done
+        ))
+    return rows
+
+
+def mark_unsummarized_seasons(db):
+    """
+    Mark every season with games but no summaries stale, such as seasons archived
+    before the summaries existed, whose games the triggers never saw
+    """
+
+    db.execute(
+        """
+        INSERT OR IGNORE INTO member_season_summary_stale (season)
+        SELECT DISTINCT season FROM all_games
+        WHERE season NOT IN (SELECT season FROM member_season_summary)
+        """
+    )
+    db.commit()
+
+
+def refresh_member_season_summaries(db):
+    """
+    Rebuild the summaries of every stale season. Returns the seasons rebuilt.
+    """
+
+    if not db.execute("SELECT 1 FROM member_season_summary_stale LIMIT 1").fetchone():
+        return []
+
+    # Hold the write lock while reading the games, so a game saved meanwhile
+    # marks its season stale again instead of being lost
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        seasons = [row[0] for row in db.execute(
+            "SELECT season FROM member_season_summary_stale ORDER BY season")]
+        for season in seasons:
+            db.execute("DELETE FROM member_season_summary WHERE season=?", (season,))
+            db.executemany(
+                """
+                INSERT INTO member_season_summary
+                (member_id, season, wins, losses, tpf, tpa, playoffs, seed, finish, playoffs_done)
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, get_season_summaries(SEASON_GAMES.fetchall(db, season))
+            )
+            db.execute("DELETE FROM member_season_summary_stale WHERE season=?", (season,))
+        # The game write already bumped the data generation, so a member page
+        # rendered since then was cached with the old summaries
+        db.execute("UPDATE generation SET value = value + 1 WHERE name = 'data'")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return seasons
+
+
+def get_member_summaries(db, member_id):
+    """
+    Return the season by season summary table shown on a member's page
+    """
+
+    table = TableBuilder(["Record", "TPF", "TPA", "Playoffs", "Overall Finish"])
+    seasons = []
+
+    for row in MEMBER_SEASON_SUMMARIES.fetchall(db, member_id):
+        if row.season == CURRENT_SEASON and not row["playoffs_done"]:
+            playoffs, over_finish = "--", "--"
+        elif row["finish"] is None:
+            playoffs, over_finish = "No", ordinal(row["seed"])
+        else:
+            playoffs, over_finish = "Yes", row["finish"]
+
+        seasons.append(row.season)
+        table.append([f"{row['wins']}-{row['losses']}", row["tpf"], row["tpa"],
+                      playoffs, over_finish])
+
+    return table.frame(index=seasons)
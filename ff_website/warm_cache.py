@@ -0,0 +1,130 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+import requests
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ff_website.constants import *
+from ff_website.db import get_db
+from ff_website.season_summaries import refresh_member_season_summaries
+
+"""
+Warms the views that are slowest on a cold process, so the next visitor finds the
+fragment cache, member directory and member_season_summary table already built.
+
+The fragment cache lives in each server process. A server started with
+WARM_CACHE_ON_START=1 warms its own cache in a background thread, requesting each
+page through the app's test client. Other flask commands load the app without
+serving it and skip that. `flask warm-cache` requests the pages over HTTP from a
+running server instead, so the workers that answer are the ones warmed, and
+reports how long each page took.
+"""
+
+
+WARM_CACHE_WORKERS = 2
+WARM_CACHE_URL = "http://127.0.0.1:5000"
+WARM_CACHE_TIMEOUT = 60
+
+
+def warm_pages(db):
+    """
+    Return the pages to warm, most visited first: the Hall of Fame and the current
+    season, then season summaries newest first, then active and inactive members
+    """
+
+    pages = ["/hall_of_fame", "/current_season/season_info", "/current_season/analytics"]
+    pages += [f"/archives/season_summary?year={row[0]}" for row in db.execute(
+        "SELECT DISTINCT season FROM all_games ORDER BY season DESC")]
+    pages += [f"/member/{row[0]}" for row in db.execute(
+        f"SELECT {MEMBER_ID} FROM member ORDER BY {ACTIVE} DESC, {MEMBER_ID}")]
+    return pages
+
+
+def warm_page(app, page, base_url=None):
+    """
+    Request page from this process, or from the server at base_url. The status
+    is None if the server couldn't be reached.
+    """
+
+    start = time.perf_counter()
+    if base_url is None:
+        status = app.test_client(use_cookies=False).get(page).status_code
+    else:
+        try:
+            status = requests.get(base_url.rstrip("/") + page, timeout=WARM_CACHE_TIMEOUT).status_code
+        except requests.RequestException:
+            status = None
+    return page, status, time.perf_counter() - start
+
+
+def warm_cache(app, workers=WARM_CACHE_WORKERS, on_page=None, base_url=None):
+    """
+    Request every warm_pages() page on a pool of workers, from this process or
+    from the server at base_url. Returns a (page, status, seconds) tuple per
+    page, in priority order.
+    """
+
+    with app.app_context():
+        db = get_db()
+        refresh_member_season_summaries(db)
+        pages = warm_pages(db)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # map hands out pages in order, so the most visited ones are warmed first
+        for result in executor.map(lambda page: warm_page(app, page, base_url), pages):
+            results.append(result)
+            if on_page:
+                on_page(*result)
+    return results
+
+
+def start_background_warm(app, workers=WARM_CACHE_WORKERS):
+    """
+    Warm the cache on a daemon thread, so the first requests are served straight
+    away (cold, as before) instead of waiting for the warm to finish
+    """
+
+    def run():
+        start = time.perf_counter()
+        try:
+            results = warm_cache(app, workers)
+        except Exception:
+            app.logger.exception("Warming the cache failed")
+            return
+        app.logger.info("Warmed %d pages in %.2fs", len(results), time.perf_counter() - start)
+
+    thread = threading.Thread(target=run, name="warm-cache", daemon=True)
+    thread.start()
+    return thread
+
+
+@click.command("warm-cache")
+@click.option("--url", default=WARM_CACHE_URL, help="Address of the running server to warm")
+@click.option("--workers", default=WARM_CACHE_WORKERS, help="Pages requested at once")
+@with_appcontext
+def warm_cache_command(url, workers):
+    def on_page(page, status, seconds):
+        click.echo(f"{page:<42} {str(status):>4} {seconds * 1000:10.2f}ms")
+
+    start = time.perf_counter()
+    results = warm_cache(current_app._get_current_object(), workers, on_page, url)
+    click.echo(f"Warmed {len(results)} pages in {time.perf_counter() - start:.2f}s")
+
+    failed = [page for page, status, _ in results if status != 200]
+    if results and all(status is None for _, status, _ in results):
+        raise click.ClickException(f"Could not reach the server at {url}")
+    if failed:
+        raise click.ClickException(f"{len(failed)} pages failed: {', '.join(failed)}")
+
+
+def init_app(app):
+    app.cli.add_command(warm_cache_command)
+
+    # Every flask command loads the app, but only `flask run` goes on to serve it
+    ctx = click.get_current_context(silent=True)
+    if app.config.get("WARM_CACHE_ON_START") and (ctx is None or ctx.command.name == "run"):
+        start_background_warm(app)